@@ -0,0 +1,254 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Value, When
+
+from oscar.core.loading import get_model
+
+logger = logging.getLogger('oscar.analytics')
+
+
+class AnalyticsBuffer(object):
+    """
+    Collects analytics events in memory and writes them to the database in
+    bulk.
+
+    Counter increments are aggregated per product and per user, so that a
+    flush only costs a few queries however many events were collected:
+    the records are updated with a single ``UPDATE`` per batch, and the
+    missing ones are created with ``bulk_create``.
+
+    If ``OSCAR_ANALYTICS_BUFFERED`` is ``False`` (the default), the events
+    are written as soon as they are recorded. Otherwise they are written
+    once ``OSCAR_ANALYTICS_FLUSH_SIZE`` events have been collected, when the
+    oldest one is older than ``OSCAR_ANALYTICS_FLUSH_INTERVAL`` seconds, or
+    when the process exits.
+    """
+    # Number of records updated or created per query
+    batch_size = 100
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.product_counts = defaultdict(Counter)
+        self.user_counts = defaultdict(Counter)
+        self.user_values = defaultdict(dict)
+        self.product_views = []
+        self.searches = []
+        self.num_events = 0
+        self.last_flush = time.time()
+
+    # Recording
+
+    def add_product_view(self, product, user=None):
+        UserProductView = get_model('analytics', 'UserProductView')
+        with self.lock:
+            self.product_counts[product.pk]['num_views'] += 1
+            if self.is_recorded(user):
+                self.user_counts[user.pk]['num_product_views'] += 1
+                self.product_views.append(
+                    UserProductView(product_id=product.pk, user_id=user.pk))
+            self.num_events += 1
+        self.maybe_flush()
+
+    def add_basket_addition(self, product, user=None):
+        with self.lock:
+            self.product_counts[product.pk]['num_basket_additions'] += 1
+            if self.is_recorded(user):
+                self.user_counts[user.pk]['num_basket_additions'] += 1
+            self.num_events += 1
+        self.maybe_flush()
+
+    def add_search(self, query, user=None):
+        if not self.is_recorded(user):
+            return
+        UserSearch = get_model('analytics', 'UserSearch')
+        with self.lock:
+            self.searches.append(UserSearch(user_id=user.pk, query=query))
+            self.num_events += 1
+        self.maybe_flush()
+
+    def add_order(self, order, user=None):
+        # Load the lines once, rather than once per product and once for
+        # each of the order's line and item counts.
+        lines = list(order.lines.all())
+        with self.lock:
+            for line in lines:
+                if line.product_id:
+                    self.product_counts[line.product_id]['num_purchases'] += (
+                        line.quantity)
+            if self.is_recorded(user):
+                counts = self.user_counts[user.pk]
+                counts['num_orders'] += 1
+                counts['num_order_lines'] += len(lines)
+                counts['num_order_items'] += sum(
+                    line.quantity for line in lines)
+                counts['total_spent'] += order.total_incl_tax
+                last_order = self.user_values[user.pk].get('date_last_order')
+                if last_order is None or last_order < order.date_placed:
+                    self.user_values[user.pk]['date_last_order'] = (
+                        order.date_placed)
+            self.num_events += 1
+        self.maybe_flush()
+
+    def is_recorded(self, user):
+        return bool(user and user.is_authenticated)
+
+    # Writing
+
+    def maybe_flush(self):
+        if not settings.OSCAR_ANALYTICS_BUFFERED:
+            self.flush()
+        elif self.num_events >= settings.OSCAR_ANALYTICS_FLUSH_SIZE:
+            self.flush()
+        elif (time.time() - self.last_flush
+                >= settings.OSCAR_ANALYTICS_FLUSH_INTERVAL):
+            self.flush()
+
+    def flush(self):
+        """
+        Write all collected events to the database
+        """
+        with self.lock:
+            if not self.num_events:
+                self.last_flush = time.time()
+                return
+            product_counts = self.product_counts
+            user_counts = self.user_counts
+            user_values = self.user_values
+            product_views = self.product_views
+            searches = self.searches
+            self.reset()
+
+        ProductRecord = get_model('analytics', 'ProductRecord')
+        UserRecord = get_model('analytics', 'UserRecord')
+        UserProductView = get_model('analytics', 'UserProductView')
+        UserSearch = get_model('analytics', 'UserSearch')
+        self.write_counts(ProductRecord, 'product_id', product_counts)
+        self.write_counts(UserRecord, 'user_id', user_counts, user_values)
+        self.write_rows(UserProductView, product_views)
+        self.write_rows(UserSearch, searches)
+
+    def write_counts(self, model, key, counts, values=None):
+        """
+        Add the passed counts to the records of the model, creating the
+        records that don't exist yet.
+
+        :param key: The name of the field identifying a record
+        :param counts: A dict of increments per field, keyed by record
+        :param values: A dict of values to set per field, keyed by record
+        """
+        if not counts:
+            return
+        values = values or {}
+        # A record created concurrently by another process makes the
+        # bulk insert fail, in which case the (rolled back) update is tried
+        # again and will now include that record. The counts of objects
+        # deleted since they were collected can't be written at all, so they
+        # are dropped before trying again.
+        for attempt in range(3):
+            try:
+                with transaction.atomic():
+                    self._write_counts(model, key, counts, values)
+                return
+            except IntegrityError:
+                missing = self.get_missing_keys(model, key, counts)
+                if not missing:
+                    continue
+                logger.warning(
+                    "Dropping analytics counters of %d deleted objects for %s",
+                    len(missing), model)
+                counts = dict((pk, record_counts)
+                              for pk, record_counts in counts.items()
+                              if pk not in missing)
+                if not counts:
+                    return
+        logger.error(
+            "IntegrityError when updating analytics counters for %s", model)
+
+    def get_missing_keys(self, model, key, counts):
+        """
+        Return the keys of the passed counts whose related object doesn't
+        exist (anymore).
+        """
+        related_model = model._meta.get_field(key).remote_field.model
+        keys = list(counts)
+        existing = set()
+        for offset in range(0, len(keys), self.batch_size):
+            existing.update(related_model._default_manager.filter(
+                pk__in=keys[offset:offset + self.batch_size]).values_list(
+                    'pk', flat=True))
+        return set(keys) - existing
+
+    def _write_counts(self, model, key, counts, values):
+        manager = model._default_manager
+        keys = list(counts)
+        num_updated = 0
+        for offset in range(0, len(keys), self.batch_size):
+            batch = keys[offset:offset + self.batch_size]
+            num_updated += manager.filter(**{'%s__in' % key: batch}).update(
+                **self.get_updates(model, key, batch, counts, values))
+        if num_updated == len(keys):
+            return
+        existing = set(manager.filter(
+            **{'%s__in' % key: keys}).values_list(key, flat=True))
+        records = []
+        for pk in keys:
+            if pk in existing:
+                continue
+            fields = dict(counts[pk])
+            fields.update(values.get(pk, {}))
+            fields[key] = pk
+            records.append(model(**fields))
+        manager.bulk_create(records, batch_size=self.batch_size)
+
+    def get_updates(self, model, key, keys, counts, values):
+        """
+        Return the expressions adding the counts of each record to its
+        current values, in a single ``UPDATE`` statement.
+        """
+        updates = {}
+        fields = set()
+        for pk in keys:
+            fields.update(counts[pk])
+        for field in fields:
+            whens = [When(**{key: pk, 'then': Value(counts[pk][field])})
+                     for pk in keys if counts[pk][field]]
+            updates[field] = F(field) + Case(
+                *whens, default=Value(0),
+                output_field=model._meta.get_field(field))
+        fields = set()
+        for pk in keys:
+            fields.update(values.get(pk, {}))
+        for field in fields:
+            whens = [When(**{key: pk, 'then': Value(values[pk][field])})
+                     for pk in keys if field in values.get(pk, {})]
+            updates[field] = Case(
+                *whens, default=F(field),
+                output_field=model._meta.get_field(field))
+        return updates
+
+    def write_rows(self, model, rows):
+        if not rows:
+            return
+        try:
+            with transaction.atomic():
+                model._default_manager.bulk_create(
+                    rows, batch_size=self.batch_size)
+        except IntegrityError:
+            logger.error(
+                "IntegrityError when recording analytics for %s", model)
+
+
+analytics_buffer = AnalyticsBuffer()
+
+# Don't lose the events collected since the last flush when the process
+# exits cleanly.
+atexit.register(analytics_buffer.flush)
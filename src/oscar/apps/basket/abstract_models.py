@@ -4,7 +4,7 @@ from decimal import Decimal as D
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 from django.db import models
-from django.db.models import Sum
+from django.db.models import Prefetch, Sum
 from django.utils.encoding import python_2_unicode_compatible, smart_text
 from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
@@ -18,6 +18,8 @@ from oscar.templatetags.currency_filters import currency
 OfferApplications = get_class('offer.results', 'OfferApplications')
 Unavailable = get_class('partner.availability', 'Unavailable')
 LineOfferConsumer = get_class('basket.utils', 'LineOfferConsumer')
+ProductAttributesContainer = get_class(
+    'catalogue.product_attributes', 'ProductAttributesContainer')
 OpenBasketManager, SavedBasketManager = get_classes('basket.managers', ['OpenBasketManager', 'SavedBasketManager'])
 
 
@@ -84,6 +86,10 @@ class AbstractBasket(models.Model):
         # information.
         self._lines = None
         self.offer_applications = OfferApplications()
+        # Record of the last pass of the offer applicator, which allows offers
+        # to be re-applied incrementally after lines have changed.  It is kept
+        # when the offer applications are reset.
+        self.offer_application_trace = None
 
     def __str__(self):
         return _(
@@ -131,7 +137,11 @@ class AbstractBasket(models.Model):
                 self.lines
                 .select_related('product', 'stockrecord')
                 .prefetch_related(
-                    'attributes', 'product__images')
+                    'attributes',
+                    Prefetch('product__cached_primary_image',
+                             to_attr='_primary_image'),
+                    ProductAttributesContainer.get_prefetch(
+                        'product__attribute_values'))
                 .order_by(self._meta.pk.name))
         return self._lines
 
@@ -718,6 +728,42 @@ class AbstractLine(models.Model):
         """
         self.consumer.consume(quantity, offer=offer)
 
+    def get_offer_state(self):
+        """
+        Return a copy of the discounts and consumptions applied to this line
+        """
+        return (self._discount_excl_tax, self._discount_incl_tax,
+                self.consumer.copy(self))
+
+    def set_offer_state(self, state):
+        """
+        Restore discounts and consumptions returned by ``get_offer_state``
+        """
+        discount_excl_tax, discount_incl_tax, consumer = state
+        self._discount_excl_tax = discount_excl_tax
+        self._discount_incl_tax = discount_incl_tax
+        self.consumer = consumer.copy(self)
+
+    def get_offer_data(self):
+        """
+        Return the discounts and consumptions applied to this line as plain
+        data that can be stored outside of the request
+        """
+        return (self._discount_excl_tax, self._discount_incl_tax,
+                self.consumer.get_state())
+
+    def set_offer_data(self, data, offers):
+        """
+        Restore discounts and consumptions returned by ``get_offer_data``
+
+        :offers: A dict mapping offer ids to the offers being applied
+        """
+        discount_excl_tax, discount_incl_tax, consumer_state = data
+        self.clear_discount()
+        self._discount_excl_tax = discount_excl_tax
+        self._discount_incl_tax = discount_incl_tax
+        self.consumer.set_state(consumer_state, offers)
+
     def get_price_breakdown(self):
         """
         Return a breakdown of line prices after discounts have been applied.
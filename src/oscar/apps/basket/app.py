@@ -1,17 +1,16 @@
 from django.conf.urls import url
 from django.contrib.auth.decorators import login_required
 
-from oscar.core.application import Application
-from oscar.core.loading import get_class
+from oscar.core.application import Application, LazyView
 
 
 class BasketApplication(Application):
     name = 'basket'
-    summary_view = get_class('basket.views', 'BasketView')
-    saved_view = get_class('basket.views', 'SavedView')
-    add_view = get_class('basket.views', 'BasketAddView')
-    add_voucher_view = get_class('basket.views', 'VoucherAddView')
-    remove_voucher_view = get_class('basket.views', 'VoucherRemoveView')
+    summary_view = LazyView('basket.views', 'BasketView')
+    saved_view = LazyView('basket.views', 'SavedView')
+    add_view = LazyView('basket.views', 'BasketAddView')
+    add_voucher_view = LazyView('basket.views', 'VoucherAddView')
+    remove_voucher_view = LazyView('basket.views', 'VoucherRemoveView')
 
     def get_urls(self):
         urls = [
@@ -0,0 +1,94 @@
+from collections import namedtuple
+from decimal import Decimal as D
+
+from django.conf import settings
+from django.core.cache import cache
+
+from oscar.core.loading import get_class
+
+site_offer_cache = get_class('offer.cache', 'site_offer_cache')
+
+
+class BasketSummary(namedtuple('BasketSummary', [
+        'id', 'num_lines', 'num_items', 'is_tax_known', 'total_excl_tax',
+        'total_incl_tax', 'currency'])):
+    """
+    The few figures about a basket needed to render the mini-basket, which
+    can be cached and used without loading the basket's lines.
+    """
+
+    @classmethod
+    def for_basket(cls, basket):
+        """
+        Return the summary of a basket (which should have had offers applied
+        to it)
+        """
+        if basket.id is None or basket.is_empty:
+            return cls.empty(basket.id)
+        is_tax_known = basket.is_tax_known
+        return cls(
+            id=basket.id,
+            num_lines=basket.num_lines,
+            num_items=sum(line.quantity for line in basket.all_lines()),
+            is_tax_known=is_tax_known,
+            total_excl_tax=basket.total_excl_tax,
+            total_incl_tax=basket.total_incl_tax if is_tax_known else None,
+            currency=basket.currency)
+
+    @classmethod
+    def empty(cls, basket_id=None):
+        return cls(
+            id=basket_id, num_lines=0, num_items=0, is_tax_known=True,
+            total_excl_tax=D('0.00'), total_incl_tax=D('0.00'), currency=None)
+
+    @property
+    def is_empty(self):
+        return self.num_lines == 0
+
+
+class BasketSummaryCache(object):
+    """
+    Stores the summary of open baskets in Django's cache, keyed by basket id
+    for baskets tied to a cookie and by owner id for the baskets of signed-in
+    users.
+
+    The summaries are dropped when a basket, its lines or its vouchers change
+    (see ``basket.receivers``), and ignored once the site offers have changed.
+    """
+    basket_key = 'oscar_basket_summary_%s'
+    owner_key = 'oscar_basket_summary_owner_%s'
+
+    def get_key(self, basket_id=None, owner_id=None):
+        if owner_id is not None:
+            return self.owner_key % owner_id
+        return self.basket_key % basket_id
+
+    def get(self, basket_id=None, owner_id=None):
+        """
+        Return the stored summary, or ``None``
+        """
+        key = self.get_key(basket_id, owner_id)
+        data = cache.get_many([key, site_offer_cache.version_key])
+        if key not in data:
+            return None
+        offers_version, summary = data[key]
+        if offers_version != data.get(site_offer_cache.version_key):
+            return None
+        return summary
+
+    def set(self, summary, basket_id=None, owner_id=None):
+        cache.set(
+            self.get_key(basket_id, owner_id),
+            (site_offer_cache.get_version(), summary),
+            settings.OSCAR_BASKET_SUMMARY_CACHE_TIMEOUT)
+
+    def invalidate(self, basket_id=None, owner_id=None):
+        keys = []
+        if basket_id is not None:
+            keys.append(self.basket_key % basket_id)
+        if owner_id is not None:
+            keys.append(self.owner_key % owner_id)
+        cache.delete_many(keys)
+
+
+basket_summary_cache = BasketSummaryCache()
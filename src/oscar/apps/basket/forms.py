@@ -3,12 +3,14 @@ from django.conf import settings
 from django.db.models import Sum
 from django.utils.translation import ugettext_lazy as _
 
-from oscar.core.loading import get_model
+from oscar.core.loading import get_class, get_model
 from oscar.forms import widgets
 
 Line = get_model('basket', 'line')
 Basket = get_model('basket', 'basket')
 Product = get_model('catalogue', 'product')
+ProductAttributesContainer = get_class(
+    'catalogue.product_attributes', 'ProductAttributesContainer')
 
 
 class BasketLineForm(forms.ModelForm):
@@ -131,7 +133,9 @@ class AddToBasketForm(forms.Form):
         """
         choices = []
         disabled_values = []
-        for child in product.children.all():
+        children = list(product.children.all())
+        ProductAttributesContainer.load_for_products(children)
+        for child in children:
             # Build a description of the child, including any pertinent
             # attributes
             attr_summary = child.attribute_summary
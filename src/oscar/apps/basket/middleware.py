@@ -4,11 +4,13 @@ from django.core.signing import BadSignature, Signer
 from django.utils.functional import SimpleLazyObject, empty
 from django.utils.translation import ugettext_lazy as _
 
-from oscar.core.loading import get_class, get_model
+from oscar.core.loading import get_class, get_classes, get_model
 
 Applicator = get_class('offer.applicator', 'Applicator')
 Basket = get_model('basket', 'basket')
 Selector = get_class('partner.strategy', 'Selector')
+BasketSummary, basket_summary_cache = get_classes(
+    'basket.cache', ['BasketSummary', 'basket_summary_cache'])
 
 selector = Selector()
 
@@ -53,10 +55,18 @@ class BasketMiddleware:
             if basket.id:
                 return self.get_basket_hash(basket.id)
 
+        def load_basket_summary():
+            """
+            Return the summary of the basket (eg for the mini-basket), which
+            may not require loading the basket.
+            """
+            return self.get_basket_summary(request)
+
         # Use Django's SimpleLazyObject to only perform the loading work
         # when the attribute is accessed.
         request.basket = SimpleLazyObject(load_full_basket)
         request.basket_hash = SimpleLazyObject(load_basket_hash)
+        request.basket_summary = SimpleLazyObject(load_basket_summary)
 
         response = self.get_response(request)
         return self.process_response(request, response)
@@ -202,6 +212,63 @@ class BasketMiddleware:
                 request.cookies_to_delete.append(cookie_key)
         return basket
 
+    def get_basket_summary(self, request):
+        """
+        Return a ``BasketSummary`` for the request's basket.
+
+        If ``OSCAR_BASKET_SUMMARY_CACHE_ENABLED`` is set, the summary is taken
+        from the cache when possible, in which case the basket isn't loaded.
+        Signed-in users without a basket don't get one created.
+        """
+        if (not settings.OSCAR_BASKET_SUMMARY_CACHE_ENABLED
+                or request._basket_cache is not None):
+            return self.load_basket_summary(request)
+
+        cookie_key = self.get_cookie_key(request)
+        basket_id = self.get_cookie_basket_id(cookie_key, request)
+        if hasattr(request, 'user') and request.user.is_authenticated:
+            if basket_id is not None:
+                # The cookie basket needs to be merged into the user's basket
+                return self.load_basket_summary(request)
+            summary = basket_summary_cache.get(owner_id=request.user.id)
+            if summary is None:
+                if Basket.open.filter(owner=request.user).exists():
+                    return self.load_basket_summary(request)
+                summary = BasketSummary.empty()
+                basket_summary_cache.set(summary, owner_id=request.user.id)
+            return summary
+        elif basket_id is not None:
+            summary = basket_summary_cache.get(basket_id=basket_id)
+            if summary is None:
+                summary = self.load_basket_summary(request)
+            return summary
+        return BasketSummary.empty()
+
+    def load_basket_summary(self, request):
+        """
+        Load the full basket and return its summary, storing it in the cache
+        """
+        basket = request.basket
+        summary = BasketSummary.for_basket(basket)
+        if settings.OSCAR_BASKET_SUMMARY_CACHE_ENABLED and basket.id:
+            if request.user.is_authenticated:
+                basket_summary_cache.set(summary, owner_id=request.user.id)
+            else:
+                basket_summary_cache.set(summary, basket_id=basket.id)
+        return summary
+
+    def get_cookie_basket_id(self, cookie_key, request):
+        """
+        Return the id of the basket referenced by a cookie, without checking
+        that it exists.
+        """
+        if cookie_key in request.COOKIES:
+            try:
+                return int(Signer().unsign(request.COOKIES[cookie_key]))
+            except (BadSignature, ValueError):
+                pass
+        return None
+
     def apply_offers_to_basket(self, request, basket):
         if not basket.is_empty:
             Applicator().apply(basket, request.user, request)
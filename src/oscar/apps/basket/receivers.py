@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from oscar.core.loading import get_class, get_model
+
+Basket = get_model('basket', 'Basket')
+Line = get_model('basket', 'Line')
+basket_summary_cache = get_class('basket.cache', 'basket_summary_cache')
+
+
+@receiver(post_save, sender=Basket)
+@receiver(post_delete, sender=Basket)
+def invalidate_basket_summary(sender, instance, **kwargs):
+    if settings.OSCAR_BASKET_SUMMARY_CACHE_ENABLED:
+        basket_summary_cache.invalidate(
+            basket_id=instance.id, owner_id=instance.owner_id)
+
+
+@receiver(post_save, sender=Line)
+@receiver(post_delete, sender=Line)
+def invalidate_basket_summary_for_line(sender, instance, **kwargs):
+    if settings.OSCAR_BASKET_SUMMARY_CACHE_ENABLED:
+        invalidate_basket_summary(Basket, instance.basket)
+
+
+@receiver(m2m_changed, sender=Basket.vouchers.through)
+def invalidate_basket_summary_for_vouchers(
+        sender, instance, action, reverse, pk_set, **kwargs):
+    if not settings.OSCAR_BASKET_SUMMARY_CACHE_ENABLED:
+        return
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        invalidate_basket_summary(Basket, instance)
+    elif pk_set:
+        for basket in Basket.objects.filter(pk__in=pk_set):
+            invalidate_basket_summary(Basket, basket)
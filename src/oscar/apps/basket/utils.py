@@ -95,6 +95,40 @@ class LineOfferConsumer(object):
         self.__affected_quantity += min(available, quantity)
 
     # public
+    def copy(self, line):
+        """
+        return a copy of this consumer for the passed line
+
+        the copy keeps track of the same consumptions, but further
+        consumptions don't affect this consumer.
+        """
+        consumer = self.__class__(line)
+        consumer.__offers = dict(self.__offers)
+        consumer.__affected_quantity = self.__affected_quantity
+        consumer.__consumptions = self.__consumptions.copy()
+        return consumer
+
+    def get_state(self):
+        """
+        return the consumptions of this consumer as plain data
+
+        offers are referenced by their ids, so the state can be stored
+        and restored with ``set_state``.
+        """
+        return (self.__affected_quantity, dict(self.__consumptions),
+                list(self.__offers))
+
+    def set_state(self, state, offers):
+        """
+        restore consumptions returned by ``get_state``
+
+        :param offers: a dict mapping offer ids to offers
+        """
+        affected_quantity, consumptions, offer_ids = state
+        self.__affected_quantity = affected_quantity
+        self.__consumptions = defaultdict(int, consumptions)
+        self.__offers = dict((pk, offers[pk]) for pk in offer_ids)
+
     def consume(self, quantity, offer=None):
         """
         mark a basket line as consumed by an offer
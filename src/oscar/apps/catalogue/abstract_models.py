@@ -11,7 +11,7 @@ from django.core.exceptions import ImproperlyConfigured, ValidationError
 from django.core.files.base import File
 from django.core.validators import RegexValidator
 from django.db import models
-from django.db.models import Count, Sum
+from django.db.models import Count, Prefetch, Sum, prefetch_related_objects
 from django.urls import reverse
 from django.utils import six
 from django.utils.encoding import python_2_unicode_compatible
@@ -22,6 +22,7 @@ from django.utils.translation import ugettext_lazy as _
 from django.utils.translation import get_language, pgettext_lazy
 from treebeard.mp_tree import MP_Node
 
+from oscar.apps.catalogue.signals import category_moved
 from oscar.core.loading import get_class, get_classes, get_model
 from oscar.core.utils import slugify
 from oscar.core.validators import non_python_keyword
@@ -33,6 +34,7 @@ ProductManager, BrowsableProductManager = get_classes(
 ProductAttributesContainer = get_class(
     'catalogue.product_attributes', 'ProductAttributesContainer')
 Selector = get_class('partner.strategy', 'Selector')
+category_tree_cache = get_class('catalogue.cache', 'category_tree_cache')
 
 
 @python_2_unicode_compatible
@@ -170,12 +172,32 @@ class AbstractCategory(MP_Node):
             # update the slug and save again if necessary.
             self.ensure_slug_uniqueness()
 
+    def move(self, target, pos=None):
+        super(AbstractCategory, self).move(target, pos)
+        # Treebeard moves nodes with queryset updates, which don't send any
+        # model signals
+        category_moved.send(
+            sender=self.__class__, instance=self, target=target, pos=pos)
+
+    def get_tree_snapshot(self):
+        """
+        Return the cached snapshot of the category tree if it's enabled and
+        knows about this category, or ``None``.
+        """
+        tree = category_tree_cache.get_tree()
+        if tree is not None and self.pk and tree.contains(self):
+            return tree
+        return None
+
     def get_ancestors_and_self(self):
         """
         Gets ancestors and includes itself. Use treebeard's get_ancestors
         if you don't want to include the category itself. It's a separate
         function as it's commonly used in templates.
         """
+        tree = self.get_tree_snapshot()
+        if tree is not None:
+            return tree.get_ancestors(self) + [self]
         return list(self.get_ancestors()) + [self]
 
     def get_descendants_and_self(self):
@@ -184,6 +206,9 @@ class AbstractCategory(MP_Node):
         if you don't want to include the category itself. It's a separate
         function as it's commonly used in templates.
         """
+        tree = self.get_tree_snapshot()
+        if tree is not None:
+            return tree.get_descendants(self) + [self]
         return list(self.get_descendants()) + [self]
 
     def get_url_cache_key(self):
@@ -200,6 +225,9 @@ class AbstractCategory(MP_Node):
         you change that logic, you'll have to reconsider the caching
         approach.
         """
+        tree = self.get_tree_snapshot()
+        if tree is not None:
+            return tree.get_url(self)
         cache_key = self.get_url_cache_key()
         url = cache.get(cache_key)
         if not url:
@@ -220,6 +248,9 @@ class AbstractCategory(MP_Node):
         return self.get_num_children() > 0
 
     def get_num_children(self):
+        tree = self.get_tree_snapshot()
+        if tree is not None:
+            return tree.get_num_children(self)
         return self.get_children().count()
 
 
@@ -333,6 +364,14 @@ class AbstractProduct(models.Model):
     # Product has no ratings if rating is None
     rating = models.FloatField(_('Rating'), null=True, editable=False)
 
+    # Denormalised primary image - the first of the product's images or, for
+    # child products without images, of its parent's. Kept up to date by
+    # catalogue.receivers.
+    cached_primary_image = models.ForeignKey(
+        'catalogue.ProductImage', null=True, blank=True, editable=False,
+        on_delete=models.SET_NULL, related_name='+',
+        verbose_name=_("Primary image"))
+
     date_created = models.DateTimeField(_("Date created"), auto_now_add=True)
 
     # This field is used by Haystack to reindex search
@@ -366,6 +405,10 @@ class AbstractProduct(models.Model):
     def __init__(self, *args, **kwargs):
         super(AbstractProduct, self).__init__(*args, **kwargs)
         self.attr = ProductAttributesContainer(product=self)
+        # The parent the product was loaded with, so moving a child product to
+        # another parent can be detected when it's saved. Deferred fields
+        # aren't loaded for this.
+        self._loaded_parent_id = self.__dict__.get('parent_id')
 
     def __str__(self):
         if self.title:
@@ -501,8 +544,13 @@ class AbstractProduct(models.Model):
 
     @cached_property
     def has_options(self):
-        # Extracting annotated value with number of product class options
-        # from product list queryset.
+        # Extracting annotated flags telling whether the product and its
+        # product class have options from product list queryset.
+        has_product_class_options = getattr(self, 'has_product_class_options', None)
+        has_product_options = getattr(self, 'has_product_options', None)
+        if has_product_class_options is not None and has_product_options is not None:
+            return has_product_class_options or has_product_options
+        # Extracting annotated option counts (see ProductQuerySet.base_queryset)
         num_product_class_options = getattr(self, 'num_product_class_options', None)
         num_product_options = getattr(self, 'num_product_options', None)
         if num_product_class_options is not None and num_product_options is not None:
@@ -529,9 +577,7 @@ class AbstractProduct(models.Model):
         """
         Return a string of all of a product's attributes
         """
-        attributes = self.attribute_values.all()
-        pairs = [attribute.summary() for attribute in attributes]
-        return ", ".join(pairs)
+        return self.attr.get_summary()
 
     def get_title(self):
         """
@@ -593,6 +639,12 @@ class AbstractProduct(models.Model):
         Returns the primary image for a product. Usually used when one can
         only display one product image, e.g. in a list of products.
         """
+        # Use the image loaded by ProductQuerySet.prefetch_primary_image or
+        # load_primary_images
+        if '_primary_image' in self.__dict__:
+            if self._primary_image is None:
+                return self.get_missing_image_dict()
+            return self._primary_image
         images = self.get_all_images()
         ordering = self.images.model.Meta.ordering
         if not ordering or ordering[0] != 'display_order':
@@ -603,16 +655,59 @@ class AbstractProduct(models.Model):
         try:
             return images[0]
         except IndexError:
-            # We return a dict with fields that mirror the key properties of
-            # the ProductImage class so this missing image can be used
-            # interchangeably in templates.  Strategy pattern ftw!
-            return {
-                'original': self.get_missing_image(),
-                'caption': '',
-                'is_missing': True}
+            return self.get_missing_image_dict()
+
+    def get_missing_image_dict(self):
+        # We return a dict with fields that mirror the key properties of
+        # the ProductImage class so this missing image can be used
+        # interchangeably in templates.  Strategy pattern ftw!
+        return {
+            'original': self.get_missing_image(),
+            'caption': '',
+            'is_missing': True}
+
+    @classmethod
+    def load_primary_images(cls, products):
+        """
+        Load the primary images of all the passed products with a single
+        query, using the denormalised ``cached_primary_image``
+        """
+        prefetch_related_objects(
+            [product for product in products if product.pk],
+            Prefetch('cached_primary_image', to_attr='_primary_image'))
+
+    def find_primary_image(self):
+        """
+        Return the image that should be stored as the product's
+        ``cached_primary_image``, or ``None``
+        """
+        image = self.images.order_by('display_order', 'pk').first()
+        if image is None and self.is_child:
+            image = self.parent.images.order_by('display_order', 'pk').first()
+        return image
 
     # Updating methods
 
+    def update_primary_image(self):
+        """
+        Recalculate the denormalised primary image of the product, and of its
+        children without images of their own.
+        """
+        image = self.find_primary_image()
+        image_id = image.pk if image else None
+        if image_id == self.cached_primary_image_id:
+            return
+        self.cached_primary_image = image
+        self.__dict__.pop('_primary_image', None)
+        # Update the column only, to avoid sending signals and changing the
+        # date_updated field
+        self.__class__._default_manager.filter(pk=self.pk).update(
+            cached_primary_image=image)
+        if self.is_parent:
+            self.children.filter(images__isnull=True).update(
+                cached_primary_image=image)
+    update_primary_image.alters_data = True
+
     def update_rating(self):
         """
         Recalculate rating field
@@ -1145,12 +1240,18 @@ class MissingProductImage(object):
     be raised when sorl-thumbnail tries to access it.
     """
 
+    # The paths already checked (and symlinked if needed), so that the file
+    # system is only hit once per process rather than for every missing image
+    _checked_paths = set()
+
     def __init__(self, name=None):
         self.name = name if name else settings.OSCAR_MISSING_IMAGE_URL
         media_file_path = os.path.join(settings.MEDIA_ROOT, self.name)
         # don't try to symlink if MEDIA_ROOT is not set (e.g. running tests)
-        if settings.MEDIA_ROOT and not os.path.exists(media_file_path):
-            self.symlink_missing_image(media_file_path)
+        if settings.MEDIA_ROOT and media_file_path not in self._checked_paths:
+            if not os.path.exists(media_file_path):
+                self.symlink_missing_image(media_file_path)
+            self._checked_paths.add(media_file_path)
 
     def symlink_missing_image(self, media_file_path):
         static_file_path = find('oscar/img/%s' % self.name)
@@ -1224,3 +1325,33 @@ class AbstractProductImage(models.Model):
         for idx, image in enumerate(self.product.images.all()):
             image.display_order = idx
             image.save()
+
+
+@python_2_unicode_compatible
+class AbstractProductFacetValue(models.Model):
+    """
+    A denormalised facet value of a browsable product, used to filter and
+    facet product lists without a search backend (see ``catalogue.facets``).
+
+    A product has a row per value of each of its facet fields; numeric
+    values (e.g. prices) are also stored as numbers for range queries.
+    """
+    product = models.ForeignKey(
+        'catalogue.Product',
+        on_delete=models.CASCADE,
+        related_name='facet_values',
+        verbose_name=_("Product"))
+    field = models.CharField(_("Field"), max_length=128)
+    value = models.CharField(_("Value"), max_length=255)
+    number = models.DecimalField(
+        _("Number"), decimal_places=2, max_digits=12, null=True, blank=True)
+
+    class Meta:
+        abstract = True
+        app_label = 'catalogue'
+        index_together = [('field', 'value'), ('field', 'number')]
+        verbose_name = _('Product facet value')
+        verbose_name_plural = _('Product facet values')
+
+    def __str__(self):
+        return u"%s: %s" % (self.field, self.value)
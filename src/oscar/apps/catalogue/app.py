@@ -1,15 +1,15 @@
 from django.conf.urls import url
 
-from oscar.core.application import Application
+from oscar.core.application import Application, LazyView
 from oscar.core.loading import get_class
 
 
 class BaseCatalogueApplication(Application):
     name = 'catalogue'
-    detail_view = get_class('catalogue.views', 'ProductDetailView')
-    catalogue_view = get_class('catalogue.views', 'CatalogueView')
-    category_view = get_class('catalogue.views', 'ProductCategoryView')
-    range_view = get_class('offer.views', 'RangeDetailView')
+    detail_view = LazyView('catalogue.views', 'ProductDetailView')
+    catalogue_view = LazyView('catalogue.views', 'CatalogueView')
+    category_view = LazyView('catalogue.views', 'ProductCategoryView')
+    range_view = LazyView('offer.views', 'RangeDetailView')
 
     def get_urls(self):
         urlpatterns = super(BaseCatalogueApplication, self).get_urls()
@@ -0,0 +1,188 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.crypto import get_random_string
+from django.utils.translation import get_language
+
+from oscar.core.loading import get_model
+
+
+class CategoryTree(object):
+    """
+    A snapshot of the whole category tree.
+
+    Holds the categories in tree order, and answers the questions templates
+    usually ask about a category (ancestors, descendants, children, full
+    slug and URL) without querying the database.
+    """
+
+    def __init__(self, categories):
+        self.categories = list(categories)
+        self.by_id = {}
+        self.by_path = {}
+        self.positions = {}
+        self.num_children = {}
+        for position, category in enumerate(self.categories):
+            self.by_id[category.pk] = category
+            self.by_path[category.path] = category
+            self.positions[category.pk] = position
+            self.num_children[category.pk] = 0
+            parent = self.by_path.get(category.path[:-category.steplen])
+            if parent is not None:
+                self.num_children[parent.pk] += 1
+        self._urls = {}
+        self._annotated_lists = {}
+
+    def contains(self, category):
+        """
+        Test whether the snapshot knows about the category at its current
+        place in the tree
+        """
+        known = self.by_id.get(category.pk)
+        return known is not None and known.path == category.path
+
+    def get_ancestors(self, category):
+        steplen = category.steplen
+        return [self.by_path[category.path[:end]]
+                for end in range(steplen, len(category.path), steplen)]
+
+    def get_descendants(self, category):
+        descendants = []
+        for node in self.categories[self.positions[category.pk] + 1:]:
+            if not node.path.startswith(category.path):
+                break
+            descendants.append(node)
+        return descendants
+
+    def get_num_children(self, category):
+        return self.num_children[category.pk]
+
+    def get_full_name(self, category):
+        names = [node.name for node in self.get_ancestors(category)]
+        names.append(category.name)
+        return category._full_name_separator.join(names)
+
+    def get_full_slug(self, category):
+        slugs = [node.slug for node in self.get_ancestors(category)]
+        slugs.append(category.slug)
+        return category._slug_separator.join(slugs)
+
+    def get_url(self, category):
+        key = (get_language(), category.pk)
+        if key not in self._urls:
+            self._urls[key] = reverse(
+                'catalogue:category', kwargs={
+                    'category_slug': self.get_full_slug(category),
+                    'pk': category.pk})
+        return self._urls[key]
+
+    def get_annotated_list(self, key, build):
+        """
+        Return the annotated list (see the ``category_tree`` template tag)
+        stored under the passed key, calling ``build`` to compute it if
+        needed.
+        """
+        if key not in self._annotated_lists:
+            self._annotated_lists[key] = build()
+        return self._annotated_lists[key]
+
+
+class CategoryTreeCache(object):
+    """
+    Keeps a ``CategoryTree`` snapshot in memory for the current process.
+
+    The snapshot is tagged with a version stored in Django's cache, which is
+    changed whenever a category is saved, deleted or moved (see
+    ``catalogue.receivers``), making every process rebuild its snapshot on
+    the next lookup.
+    """
+    version_key = 'oscar_category_tree_version'
+    tree_key = 'oscar_category_tree_%s'
+
+    def __init__(self):
+        self._state = (None, None)
+
+    def get_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            version = self.invalidate()
+        return version
+
+    def invalidate(self):
+        version = get_random_string(12)
+        cache.set(self.version_key, version, None)
+        return version
+
+    def get_tree(self):
+        """
+        Return the current snapshot, or ``None`` if
+        ``OSCAR_CATEGORY_TREE_CACHE_ENABLED`` isn't set.
+        """
+        if not settings.OSCAR_CATEGORY_TREE_CACHE_ENABLED:
+            return None
+        version = self.get_version()
+        local_version, tree = self._state
+        if version != local_version:
+            tree = CategoryTree(self.load(version))
+            self._state = (version, tree)
+        return tree
+
+    def load(self, version):
+        key = self.tree_key % version
+        categories = cache.get(key)
+        if categories is None:
+            Category = get_model('catalogue', 'Category')
+            categories = list(Category.get_tree())
+            cache.set(key, categories,
+                      settings.OSCAR_CATEGORY_TREE_CACHE_TIMEOUT)
+        return categories
+
+
+category_tree_cache = CategoryTreeCache()
+
+
+class ProductAttributesCache(object):
+    """
+    Stores the attribute values of products (see
+    ``ProductAttributesContainer.get_data``) in Django's cache.
+
+    The values of a product are dropped when one of them is saved or deleted,
+    and those of all products when an attribute or attribute option changes
+    (see ``catalogue.receivers``).
+    """
+    version_key = 'oscar_product_attributes_version'
+    data_key = 'oscar_product_attribute_data_%s_%s'
+
+    def get_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            version = self.invalidate_all()
+        return version
+
+    def invalidate_all(self):
+        version = get_random_string(12)
+        cache.set(self.version_key, version, None)
+        return version
+
+    def invalidate(self, product_id):
+        cache.delete(self.data_key % (self.get_version(), product_id))
+
+    def get_many(self, products):
+        """
+        Return a dict of the stored data, keyed by product id
+        """
+        version = self.get_version()
+        keys = dict((self.data_key % (version, product.pk), product.pk)
+                    for product in products)
+        return dict((keys[key], data)
+                    for key, data in cache.get_many(list(keys)).items())
+
+    def set_many(self, data):
+        version = self.get_version()
+        cache.set_many(
+            dict((self.data_key % (version, product_id), product_data)
+                 for product_id, product_data in data.items()),
+            settings.OSCAR_PRODUCT_ATTRIBUTES_CACHE_TIMEOUT)
+
+
+product_attributes_cache = ProductAttributesCache()
@@ -0,0 +1,295 @@
+import operator
+import re
+import threading
+from collections import defaultdict
+from decimal import Decimal as D
+from decimal import InvalidOperation
+from functools import reduce
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, Q, Sum, Value, When
+from django.utils import six
+
+from oscar.core.loading import get_class, get_model
+
+Selector = get_class('partner.strategy', 'Selector')
+
+# The range queries of OSCAR_SEARCH_FACETS, e.g. '[20 TO 40]' or '[60 TO *]'
+RANGE_QUERY = re.compile(r'^\[\s*(\S+)\s+TO\s+(\S+)\s*\]$')
+
+
+class ProductFacets(object):
+    """
+    Filters and facets product lists using the database rather than a search
+    backend, for the facets configured in ``OSCAR_SEARCH_FACETS``.
+
+    The facet values of browsable products are denormalised into the
+    ``ProductFacetValue`` table, which is updated when a product, its
+    stockrecords, categories or attributes change (see
+    ``catalogue.receivers`` and ``partner.receivers``). Field facets get
+    their values from a ``get_<field>_values`` method, or else from the
+    product attribute with the same code; query facets must be ranges over
+    numeric values, such as the default price ranges.
+    """
+
+    def __init__(self):
+        self._pending = threading.local()
+
+    def get_facet_fields(self):
+        fields = [facet['field'] for facet
+                  in settings.OSCAR_SEARCH_FACETS['fields'].values()]
+        fields.extend(facet['field'] for facet
+                      in settings.OSCAR_SEARCH_FACETS['queries'].values())
+        return fields
+
+    # Maintaining the facet values
+
+    def get_strategy(self):
+        return Selector().strategy()
+
+    def get_values(self, product, field):
+        """
+        Return the facet values of a browsable product for a field
+        """
+        method = getattr(self, 'get_%s_values' % field, None)
+        if method is not None:
+            return method(product)
+        return self.get_attribute_values(product, field)
+
+    def get_product_class_values(self, product):
+        return [product.get_product_class().name]
+
+    def get_category_values(self, product):
+        return [category.full_name for category in product.categories.all()]
+
+    def get_rating_values(self, product):
+        if product.rating is not None:
+            return [int(product.rating)]
+        return []
+
+    def get_price_values(self, product):
+        strategy = self.get_strategy()
+        if product.is_parent:
+            info = strategy.fetch_for_parent(product)
+        else:
+            info = strategy.fetch_for_product(product)
+        if not product.is_parent and info.stockrecord is None:
+            return []
+        price = info.price
+        if not price.exists:
+            return []
+        return [price.incl_tax if price.is_tax_known else price.excl_tax]
+
+    def get_attribute_values(self, product, code):
+        # The attributes of parent products include those of their children,
+        # e.g. the sizes they come in.
+        values = []
+        for item in [product] + list(product.children.all()):
+            value = getattr(item.attr, code, None)
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple)) or hasattr(value, 'all'):
+                values.extend(value.all() if hasattr(value, 'all') else value)
+            else:
+                values.append(value)
+        return values
+
+    def get_rows(self, product):
+        """
+        Return the (unsaved) facet values of a browsable product
+        """
+        ProductFacetValue = get_model('catalogue', 'ProductFacetValue')
+        rows = []
+        for field in self.get_facet_fields():
+            seen = set()
+            for value in self.get_values(product, field):
+                text = six.text_type(value)[:255]
+                if text in seen:
+                    continue
+                seen.add(text)
+                rows.append(ProductFacetValue(
+                    product=product, field=field, value=text,
+                    number=self.get_number(value)))
+        return rows
+
+    def get_number(self, value):
+        if isinstance(value, bool):
+            return None
+        try:
+            number = D(six.text_type(value))
+        except (InvalidOperation, ValueError):
+            return None
+        # Keep within the precision of ProductFacetValue.number
+        if not number.is_finite() or abs(number) >= 10 ** 10:
+            return None
+        return number.quantize(D('0.01'))
+
+    def update_products(self, products):
+        """
+        Recompute the facet values of the passed browsable products
+        """
+        ProductFacetValue = get_model('catalogue', 'ProductFacetValue')
+        products = [product for product in products
+                    if product.pk and not product.is_child]
+        if not products:
+            return
+        rows = []
+        for product in products:
+            rows.extend(self.get_rows(product))
+        with transaction.atomic():
+            ProductFacetValue.objects.filter(product__in=products).delete()
+            ProductFacetValue.objects.bulk_create(rows)
+
+    def update_product_ids(self, product_ids):
+        """
+        Recompute the facet values of the browsable products with the passed
+        ids, or of their parents for child products
+        """
+        Product = get_model('catalogue', 'Product')
+        products = list(Product.objects.filter(pk__in=product_ids))
+        parent_ids = set(product.parent_id for product in products
+                         if product.is_child)
+        products = [product for product in products if not product.is_child]
+        products.extend(Product.objects.filter(pk__in=parent_ids))
+        self.update_products(products)
+
+    def schedule_update(self, product_id):
+        """
+        Recompute the facet values of a product (or of its parent) once the
+        current transaction is committed. Changes to several parts of the
+        same product within a transaction only trigger one update.
+        """
+        connection = transaction.get_connection()
+        if not connection.in_atomic_block:
+            self.update_product_ids([product_id])
+            return
+        # Each change registers its own callback, as those of a rolled back
+        # transaction are dropped. The first one to run updates all the
+        # products changed so far, and the others find nothing left to do.
+        pending = self.get_pending_product_ids()
+        pending.add(product_id)
+        transaction.on_commit(lambda: self.run_pending_update(product_id))
+
+    def get_pending_product_ids(self):
+        if not hasattr(self._pending, 'product_ids'):
+            self._pending.product_ids = set()
+        return self._pending.product_ids
+
+    def run_pending_update(self, product_id):
+        pending = self.get_pending_product_ids()
+        if product_id not in pending:
+            return
+        product_ids = set(pending)
+        pending.clear()
+        self.update_product_ids(product_ids)
+
+    # Filtering and counting
+
+    def get_selected_facets(self, selected_facets):
+        """
+        Parse the 'selected_facets' request parameters (e.g.
+        'product_class_exact:Books') into a dict of the selected values per
+        field, ignoring the values of unknown fields.
+        """
+        fields = set(self.get_facet_fields())
+        selected = defaultdict(list)
+        for facet in selected_facets:
+            if ':' not in facet:
+                continue
+            field_name, value = facet.split(':', 1)
+            if field_name.endswith('_exact') and field_name[:-6] in fields:
+                selected[field_name].append(value)
+        return selected
+
+    def parse_range(self, query):
+        """
+        Return the (lower, upper) bounds of a range query, either of which
+        can be ``None``
+        """
+        match = RANGE_QUERY.match(query)
+        if match is None:
+            raise ValueError("Unsupported facet query %r" % query)
+        bounds = []
+        for bound in match.groups():
+            try:
+                bounds.append(None if bound == '*' else D(bound))
+            except InvalidOperation:
+                raise ValueError("Unsupported facet query %r" % query)
+        return tuple(bounds)
+
+    def get_range_filter(self, query):
+        lower, upper = self.parse_range(query)
+        kwargs = {}
+        if lower is not None:
+            kwargs['number__gte'] = lower
+        if upper is not None:
+            kwargs['number__lte'] = upper
+        if not kwargs:
+            kwargs['number__isnull'] = False
+        return kwargs
+
+    def filter(self, queryset, selected_multi_facets):
+        """
+        Restrict the products of the queryset to those with the selected
+        facet values. Values of the same field are alternatives.
+        """
+        ProductFacetValue = get_model('catalogue', 'ProductFacetValue')
+        query_fields = set(
+            facet['field'] for facet
+            in settings.OSCAR_SEARCH_FACETS['queries'].values())
+        for field_name, values in selected_multi_facets.items():
+            if not values:
+                continue
+            field = field_name[:-len('_exact')]
+            rows = ProductFacetValue.objects.filter(field=field)
+            if field in query_fields:
+                ranges = []
+                for query in values:
+                    try:
+                        ranges.append(Q(**self.get_range_filter(query)))
+                    except ValueError:
+                        continue
+                if not ranges:
+                    continue
+                rows = rows.filter(reduce(operator.or_, ranges))
+            else:
+                rows = rows.filter(value__in=values)
+            queryset = queryset.filter(
+                pk__in=rows.values('product_id'))
+        return queryset
+
+    def get_facet_counts(self, queryset):
+        """
+        Return the facet counts of the products of the queryset, in the same
+        format as Haystack's ``facet_counts``
+        """
+        ProductFacetValue = get_model('catalogue', 'ProductFacetValue')
+        rows = ProductFacetValue.objects.filter(
+            product__in=queryset.order_by().values('pk'))
+        counts = {'fields': {}, 'queries': {}, 'dates': {}}
+        for key, facet in settings.OSCAR_SEARCH_FACETS['fields'].items():
+            values = rows.filter(field=facet['field']).values(
+                'value').annotate(count=Count('product')).order_by(
+                '-count', 'value')
+            counts['fields'][key] = [
+                (item['value'], item['count']) for item in values]
+        for facet in settings.OSCAR_SEARCH_FACETS['queries'].values():
+            field = facet['field']
+            queries = [query for __, query in facet['queries']
+                       if RANGE_QUERY.match(query)]
+            if not queries:
+                continue
+            aggregates = dict(
+                ('query_%d' % i, Sum(Case(
+                    When(then=Value(1), **self.get_range_filter(query)),
+                    default=Value(0), output_field=IntegerField())))
+                for i, query in enumerate(queries))
+            totals = rows.filter(field=field).aggregate(**aggregates)
+            for i, query in enumerate(queries):
+                counts['queries']['%s_exact:%s' % (field, query)] = (
+                    totals['query_%d' % i] or 0)
+        return counts
+
+
+product_facets = ProductFacets()
@@ -1,5 +1,7 @@
 from django.db import models
-from django.db.models import Count
+from django.db.models import Count, Exists, OuterRef, Prefetch, Subquery
+
+from oscar.core.loading import get_model
 
 
 class ProductQuerySet(models.query.QuerySet):
@@ -20,6 +22,89 @@ class ProductQuerySet(models.query.QuerySet):
         """
         return self.filter(parent=None)
 
+    # Prefetch profiles
+
+    def with_profile(self, name):
+        """
+        Applies the select_related, prefetch_related and annotations needed
+        in a given context, e.g. ``'listing'`` or ``'detail'``. Each profile
+        is implemented by a ``<name>_profile`` method, so profiles can be
+        changed or added by overriding this class.
+        """
+        method = getattr(self, '%s_profile' % name, None)
+        if method is None:
+            raise ValueError("Unknown product prefetch profile %r" % name)
+        return method()
+
+    def listing_profile(self):
+        """
+        For lists of products: only the primary image and first stockrecord
+        of each product are loaded.
+        """
+        return self.select_related('product_class')\
+            .prefetch_primary_image()\
+            .prefetch_first_stockrecord()\
+            .with_option_flags()
+
+    def detail_profile(self):
+        return self.select_related('product_class', 'parent__product_class')\
+            .prefetch_related(
+                'children', 'product_options', 'product_class__options',
+                'stockrecords', 'images', 'attribute_values__attribute')
+
+    def basket_profile(self):
+        return self.select_related('product_class', 'parent__product_class')\
+            .prefetch_related('stockrecords')\
+            .prefetch_primary_image()
+
+    def index_profile(self):
+        return self.select_related('product_class')\
+            .prefetch_related('categories', 'stockrecords',
+                              'children__stockrecords')
+
+    def export_profile(self):
+        return self.select_related('product_class', 'parent')\
+            .prefetch_related('categories', 'stockrecords__partner',
+                              'images', 'attribute_values__attribute')
+
+    def with_option_flags(self):
+        """
+        Annotates whether the product and its product class have options,
+        which is used by ``Product.has_options``. Uses ``EXISTS`` subqueries
+        rather than counts, which would group by all the product columns.
+        """
+        Option = get_model('catalogue', 'Option')
+        product_class_options = Option.objects.filter(
+            productclass=OuterRef('product_class'))
+        product_options = Option.objects.filter(product=OuterRef('pk'))
+        return self.annotate(
+            has_product_class_options=Exists(product_class_options),
+            has_product_options=Exists(product_options))
+
+    def prefetch_primary_image(self):
+        """
+        Prefetches the primary image of each product (using the denormalised
+        ``cached_primary_image``), see ``Product.primary_image``
+        """
+        return self.prefetch_related(
+            Prefetch('cached_primary_image', to_attr='_primary_image'))
+
+    def prefetch_first_stockrecord(self):
+        """
+        Prefetches the first stockrecord of each product (and nothing else)
+        into ``first_stockrecords``, which is used by the
+        ``UseFirstStockRecord`` strategy mixin
+        """
+        StockRecord = get_model('partner', 'StockRecord')
+        first_record = StockRecord.objects.filter(
+            product=OuterRef('product')).order_by('pk')
+        records = StockRecord.objects.annotate(
+            first_record=Subquery(first_record.values('pk')[:1])).filter(
+            pk=models.F('first_record'))
+        return self.prefetch_related(
+            Prefetch('stockrecords', queryset=records,
+                     to_attr='first_stockrecords'))
+
 
 class ProductManager(models.Manager):
     """
@@ -38,6 +123,9 @@ class ProductManager(models.Manager):
     def base_queryset(self):
         return self.get_queryset().base_queryset()
 
+    def with_profile(self, name):
+        return self.get_queryset().with_profile(name)
+
 
 class BrowsableProductManager(ProductManager):
     """
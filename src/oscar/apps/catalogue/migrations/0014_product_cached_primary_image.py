@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_primary_images(apps, schema_editor):
+    Product = apps.get_model('catalogue', 'Product')
+    ProductImage = apps.get_model('catalogue', 'ProductImage')
+    primary_images = {}
+    images = ProductImage.objects.order_by(
+        'product_id', 'display_order', 'pk').values_list('product_id', 'pk')
+    for product_id, image_id in images.iterator():
+        primary_images.setdefault(product_id, image_id)
+    children = Product.objects.filter(
+        structure='child').values_list('pk', 'parent_id')
+    for child_id, parent_id in children.iterator():
+        if child_id not in primary_images and parent_id in primary_images:
+            primary_images[child_id] = primary_images[parent_id]
+    for product_id, image_id in primary_images.items():
+        Product.objects.filter(pk=product_id).update(
+            cached_primary_image_id=image_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0013_auto_20170821_1548'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='cached_primary_image',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='catalogue.ProductImage', verbose_name='Primary image'),
+        ),
+        migrations.RunPython(populate_primary_images, migrations.RunPython.noop),
+    ]
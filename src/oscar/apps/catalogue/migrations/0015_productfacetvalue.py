@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0014_product_cached_primary_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductFacetValue',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=128, verbose_name='Field')),
+                ('value', models.CharField(max_length=255, verbose_name='Value')),
+                ('number', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True, verbose_name='Number')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='facet_values', to='catalogue.Product', verbose_name='Product')),
+            ],
+            options={
+                'verbose_name': 'Product facet value',
+                'verbose_name_plural': 'Product facet values',
+                'abstract': False,
+            },
+        ),
+        migrations.AlterIndexTogether(
+            name='productfacetvalue',
+            index_together=set([('field', 'value'), ('field', 'number')]),
+        ),
+    ]
@@ -82,3 +82,10 @@ if not is_model_registered('catalogue', 'ProductImage'):
         pass
 
     __all__.append('ProductImage')
+
+
+if not is_model_registered('catalogue', 'ProductFacetValue'):
+    class ProductFacetValue(AbstractProductFacetValue):
+        pass
+
+    __all__.append('ProductFacetValue')
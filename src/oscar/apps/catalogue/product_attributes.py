@@ -1,6 +1,13 @@
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.db.models import Prefetch, prefetch_related_objects
 from django.utils.translation import ugettext_lazy as _
 
+from oscar.core.loading import get_class, get_model
+
+product_attributes_cache = get_class(
+    'catalogue.cache', 'product_attributes_cache')
+
 
 class ProductAttributesContainer(object):
     """
@@ -13,18 +20,182 @@ class ProductAttributesContainer(object):
 
     def __setstate__(self, state):
         self.__dict__ = state
+        self.__dict__.pop('_summary', None)
         self.initialised = False
 
     def __init__(self, product):
         self.product = product
         self.initialised = False
 
+    @classmethod
+    def load_for_products(cls, products):
+        """
+        Load the attributes of all the passed products at once, rather than
+        with a query per product the first time one of their attributes is
+        used.
+
+        The attribute values (and attributes) are fetched with a single
+        query, or taken from Django's cache if
+        ``OSCAR_PRODUCT_ATTRIBUTES_CACHE_ENABLED`` is set.
+        """
+        products = [product for product in products
+                    if product.pk and not product.attr.initialised]
+        cache_enabled = settings.OSCAR_PRODUCT_ATTRIBUTES_CACHE_ENABLED
+        if products and cache_enabled:
+            products = cls.load_cached(products)
+        if not products:
+            return
+        prefetch_related_objects(products, cls.get_prefetch())
+        for product in products:
+            product.attr.initiate_attributes()
+        if cache_enabled:
+            cls.cache_loaded(products)
+
+    @classmethod
+    def load_cached(cls, products):
+        """
+        Set the attribute values of the passed products that are in Django's
+        cache, and return the other products
+        """
+        cached = product_attributes_cache.get_many(products)
+        options = cls.load_options(cached.values())
+        missing = []
+        for product in products:
+            if product.pk in cached:
+                product.attr.load_data(cached[product.pk], options)
+            else:
+                missing.append(product)
+        return missing
+
+    @classmethod
+    def cache_loaded(cls, products):
+        """
+        Store the attribute values of the passed products, which have been
+        loaded from the database, in Django's cache
+        """
+        multi_option_values = [
+            value for product in products
+            for value in product.attr.get_values()
+            if value.attribute.is_multi_option]
+        if multi_option_values:
+            prefetch_related_objects(multi_option_values, 'value_multi_option')
+        data = {}
+        for product in products:
+            product_data = product.attr.get_data()
+            if product_data is not None:
+                data[product.pk] = product_data
+        product_attributes_cache.set_many(data)
+
+    @classmethod
+    def get_prefetch(cls, lookup='attribute_values'):
+        """
+        Return a ``Prefetch`` of the attribute values (and their attributes)
+        of products, which the containers of the products then use. Pass the
+        lookup to prefetch them for related products, eg
+        ``'product__attribute_values'`` for basket lines.
+        """
+        ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
+        return Prefetch(
+            lookup, queryset=ProductAttributeValue.objects.select_related(
+                'attribute'))
+
+    @classmethod
+    def load_options(cls, data):
+        """
+        Return a dict of the attribute options used by the passed cached data
+        of products (see ``get_data``), keyed by id
+        """
+        option_ids = set()
+        for product_data in data:
+            for code, type, value in product_data['values']:
+                if type == 'option' and value is not None:
+                    option_ids.add(value)
+                elif type == 'multi_option':
+                    option_ids.update(value)
+        if not option_ids:
+            return {}
+        AttributeOption = get_model('catalogue', 'AttributeOption')
+        return AttributeOption.objects.in_bulk(option_ids)
+
     def initiate_attributes(self):
-        values = self.get_values().select_related('attribute')
+        values = self.get_values()
+        if not self.values_prefetched():
+            values = values.select_related('attribute')
         for v in values:
             setattr(self, v.attribute.code, v.value)
         self.initialised = True
 
+    def values_prefetched(self):
+        """
+        Test whether the attribute values of the product have been loaded
+        with ``prefetch_related``
+        """
+        prefetched = getattr(self.product, '_prefetched_objects_cache', {})
+        return 'attribute_values' in prefetched
+
+    def get_data(self):
+        """
+        Return the attribute values of the product and their summary in a
+        form that can be cached, see ``load_data``, or ``None`` if the
+        product has entity values, which aren't cached.
+
+        Values which are model instances are stored as ids (options) or file
+        names (files and images).
+        """
+        values = []
+        for value in self.get_values():
+            attribute = value.attribute
+            if attribute.type == attribute.ENTITY:
+                return None
+            elif attribute.is_option:
+                data = value.value_option_id
+            elif attribute.is_multi_option:
+                data = [option.pk for option in value.value_multi_option.all()]
+            elif attribute.is_file:
+                data = value.value.name if value.value else None
+            else:
+                data = value.value
+            values.append((attribute.code, attribute.type, data))
+        return {'values': values, 'summary': self.get_summary()}
+
+    def load_data(self, data, options=None):
+        """
+        Set the attribute values stored by ``get_data``. The options used by
+        the values can be passed, as loaded by ``load_options``.
+        """
+        if options is None:
+            options = self.load_options([data])
+        ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
+        AttributeOption = get_model('catalogue', 'AttributeOption')
+        for code, type, value in data['values']:
+            if type == 'option':
+                value = options.get(value)
+            elif type == 'multi_option':
+                # Build the queryset ProductAttributeValue.value returns, with
+                # the options already loaded as if they had been prefetched
+                option_ids = value
+                value = AttributeOption.objects.filter(pk__in=option_ids)
+                value._result_cache = [
+                    options[pk] for pk in option_ids if pk in options]
+                value._prefetch_done = True
+            elif type in ('file', 'image') and value:
+                field = 'value_%s' % type
+                value = getattr(ProductAttributeValue(**{field: value}), field)
+            setattr(self, code, value)
+        self._summary = data['summary']
+        self.initialised = True
+
+    def get_summary(self):
+        """
+        Return a string of all of the product's attributes
+        """
+        if '_summary' in self.__dict__:
+            return self._summary
+        values = self.get_values()
+        if not self.values_prefetched():
+            values = values.select_related('attribute')
+        return ", ".join(value.summary() for value in values)
+
     def __getattr__(self, name):
         if not name.startswith('_') and not self.initialised:
             self.initiate_attributes()
@@ -65,6 +236,7 @@ class ProductAttributesContainer(object):
         return iter(self.get_values())
 
     def save(self):
+        self.__dict__.pop('_summary', None)
         for attribute in self.get_all_attributes():
             if hasattr(self, attribute.code):
                 value = getattr(self, attribute.code)
@@ -1,20 +1,30 @@
 # -*- coding: utf-8 -*-
 
 from django.conf import settings
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 
-if settings.OSCAR_DELETE_IMAGE_FILES:
+from oscar.apps.catalogue.signals import category_moved
+from oscar.core.loading import get_class, get_classes, get_model
+
+category_tree_cache, product_attributes_cache = get_classes(
+    'catalogue.cache', ['category_tree_cache', 'product_attributes_cache'])
+product_facets = get_class('catalogue.facets', 'product_facets')
+Category = get_model('catalogue', 'Category')
+Product = get_model('catalogue', 'Product')
+ProductAttribute = get_model('catalogue', 'ProductAttribute')
+ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
+AttributeOption = get_model('catalogue', 'AttributeOption')
+ProductImage = get_model('catalogue', 'ProductImage')
+ProductCategory = get_model('catalogue', 'ProductCategory')
 
-    from oscar.core.loading import get_model
 
-    from django.db import models
-    from django.db.models.signals import post_delete
+if settings.OSCAR_DELETE_IMAGE_FILES:
 
     from sorl import thumbnail
     from sorl.thumbnail.helpers import ThumbnailError
 
-    ProductImage = get_model('catalogue', 'ProductImage')
-    Category = get_model('catalogue', 'Category')
-
     def delete_image_files(sender, instance, **kwargs):
         """
         Deletes the original image, created thumbnails, and any entries
@@ -34,3 +44,81 @@ if settings.OSCAR_DELETE_IMAGE_FILES:
     models_with_images = [ProductImage, Category]
     for sender in models_with_images:
         post_delete.connect(delete_image_files, sender=sender)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(category_moved, sender=Category)
+def invalidate_category_tree(**kwargs):
+    # Drop the snapshot straight away so the current process doesn't use
+    # stale data, and again after the commit in case another process rebuilt
+    # it from the old data in the meantime.
+    category_tree_cache.invalidate()
+    transaction.on_commit(category_tree_cache.invalidate)
+
+
+@receiver(post_save, sender=ProductAttributeValue)
+@receiver(post_delete, sender=ProductAttributeValue)
+@receiver(m2m_changed, sender=ProductAttributeValue.value_multi_option.through)
+def invalidate_product_attributes(sender, instance, **kwargs):
+    if isinstance(instance, ProductAttributeValue):
+        product_id = instance.product_id
+        product_attributes_cache.invalidate(product_id)
+        transaction.on_commit(
+            lambda: product_attributes_cache.invalidate(product_id))
+    else:
+        # The options of a multi option attribute were changed from the side
+        # of the option
+        invalidate_all_product_attributes()
+
+
+@receiver(post_save, sender=ProductAttribute)
+@receiver(post_delete, sender=ProductAttribute)
+@receiver(post_save, sender=AttributeOption)
+@receiver(post_delete, sender=AttributeOption)
+def invalidate_all_product_attributes(**kwargs):
+    product_attributes_cache.invalidate_all()
+    transaction.on_commit(product_attributes_cache.invalidate_all)
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+def update_primary_image_on_image_change(sender, instance, **kwargs):
+    if kwargs.get('raw'):
+        return
+    try:
+        product = instance.product
+    except Product.DoesNotExist:
+        # The product is being deleted
+        return
+    product.update_primary_image()
+
+
+@receiver(post_save, sender=Product)
+def update_primary_image_on_product_change(sender, instance, created,
+                                           **kwargs):
+    # Changes to the images are picked up by the receiver above; a product
+    # only needs its primary image recalculated when it's a new child, which
+    # falls back to the image of its parent, or when it's moved to another
+    # parent.
+    if kwargs.get('raw'):
+        return
+    if created:
+        moved = instance.is_child
+    else:
+        moved = instance.parent_id != instance._loaded_parent_id
+    instance._loaded_parent_id = instance.parent_id
+    if moved:
+        instance.update_primary_image()
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=ProductCategory)
+@receiver(post_delete, sender=ProductCategory)
+@receiver(post_save, sender=ProductAttributeValue)
+@receiver(post_delete, sender=ProductAttributeValue)
+def update_product_facets(sender, instance, **kwargs):
+    if not settings.OSCAR_PRODUCT_FACETS_ENABLED or kwargs.get('raw'):
+        return
+    product_id = instance.pk if sender is Product else instance.product_id
+    product_facets.schedule_update(product_id)
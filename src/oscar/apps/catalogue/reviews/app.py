@@ -1,18 +1,17 @@
 from django.conf.urls import url
 from django.contrib.auth.decorators import login_required
 
-from oscar.core.application import Application
-from oscar.core.loading import get_class
+from oscar.core.application import Application, LazyView
 
 
 class ProductReviewsApplication(Application):
     name = None
     hidable_feature_name = "reviews"
 
-    detail_view = get_class('catalogue.reviews.views', 'ProductReviewDetail')
-    create_view = get_class('catalogue.reviews.views', 'CreateProductReview')
-    vote_view = get_class('catalogue.reviews.views', 'AddVoteView')
-    list_view = get_class('catalogue.reviews.views', 'ProductReviewList')
+    detail_view = LazyView('catalogue.reviews.views', 'ProductReviewDetail')
+    create_view = LazyView('catalogue.reviews.views', 'CreateProductReview')
+    vote_view = LazyView('catalogue.reviews.views', 'AddVoteView')
+    list_view = LazyView('catalogue.reviews.views', 'ProductReviewList')
 
     def get_urls(self):
         urls = [
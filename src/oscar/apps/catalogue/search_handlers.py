@@ -8,7 +8,10 @@ BrowseCategoryForm = get_class('search.forms', 'BrowseCategoryForm')
 SearchHandler = get_class('search.search_handlers', 'SearchHandler')
 is_solr_supported = get_class('search.features', 'is_solr_supported')
 is_elasticsearch_supported = get_class('search.features', 'is_elasticsearch_supported')
+FacetMunger = get_class('search.facets', 'FacetMunger')
+product_facets = get_class('catalogue.facets', 'product_facets')
 Product = get_model('catalogue', 'Product')
+ProductCategory = get_model('catalogue', 'ProductCategory')
 
 
 def get_product_search_handler_class():
@@ -79,9 +82,9 @@ class ESProductSearchHandler(SearchHandler):
 
 class SimpleProductSearchHandler(MultipleObjectMixin):
     """
-    A basic implementation of the full-featured SearchHandler that has no
-    faceting support, but doesn't require a Haystack backend. It only
-    supports category browsing.
+    A basic implementation of the full-featured SearchHandler that doesn't
+    require a Haystack backend. It supports category browsing, and faceting
+    on the database if ``OSCAR_PRODUCT_FACETS_ENABLED`` is set.
 
     Note that is meant as a replacement search handler and not as a view
     mixin; the mixin just does most of what we need it to do.
@@ -89,20 +92,45 @@ class SimpleProductSearchHandler(MultipleObjectMixin):
     paginate_by = settings.OSCAR_PRODUCTS_PER_PAGE
 
     def __init__(self, request_data, full_path, categories=None):
+        self.request_data = request_data
+        self.full_path = full_path
         self.categories = categories
         self.kwargs = {'page': request_data.get('page', 1)}
+        self.selected_multi_facets = {}
+        if settings.OSCAR_PRODUCT_FACETS_ENABLED:
+            self.selected_multi_facets = product_facets.get_selected_facets(
+                request_data.getlist('selected_facets'))
         self.object_list = self.get_queryset()
 
     def get_queryset(self):
-        qs = Product.browsable.base_queryset()
+        qs = Product.browsable.with_profile('listing')
         if self.categories:
-            qs = qs.filter(categories__in=self.categories).distinct()
+            # A subquery rather than a join, which would need a DISTINCT over
+            # all the product columns.
+            qs = qs.filter(pk__in=ProductCategory.objects.filter(
+                category__in=self.categories).values('product_id'))
+        if self.selected_multi_facets:
+            qs = product_facets.filter(qs, self.selected_multi_facets)
         return qs
 
+    def get_facet_munger(self):
+        # Like the search backends, the counts are those of the products
+        # matching the selected facets
+        return FacetMunger(
+            self.full_path, self.selected_multi_facets,
+            product_facets.get_facet_counts(self.object_list))
+
     def get_search_context_data(self, context_object_name):
         # Set the context_object_name instance property as it's needed
         # internally by MultipleObjectMixin
         self.context_object_name = context_object_name
         context = self.get_context_data(object_list=self.object_list)
         context[context_object_name] = context['page_obj'].object_list
+        if settings.OSCAR_PRODUCT_FACETS_ENABLED:
+            facet_data = self.get_facet_munger().facet_data()
+            context['facet_data'] = facet_data
+            context['has_facets'] = any(
+                data['results'] for data in facet_data.values())
+            context['selected_facets'] = self.request_data.getlist(
+                'selected_facets')
         return context
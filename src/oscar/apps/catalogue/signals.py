@@ -2,3 +2,6 @@ import django.dispatch
 
 product_viewed = django.dispatch.Signal(
     providing_args=["product", "user", "request", "response"])
+
+category_moved = django.dispatch.Signal(
+    providing_args=["instance", "target", "pos"])
@@ -1,5 +1,6 @@
 import warnings
 
+from django.conf import settings
 from django.contrib import messages
 from django.core.paginator import InvalidPage
 from django.http import Http404, HttpResponsePermanentRedirect
@@ -15,6 +16,8 @@ Product = get_model('catalogue', 'product')
 Category = get_model('catalogue', 'category')
 ProductAlert = get_model('customer', 'ProductAlert')
 ProductAlertForm = get_class('customer.forms', 'ProductAlertForm')
+ProductAttributesContainer = get_class(
+    'catalogue.product_attributes', 'ProductAttributesContainer')
 get_product_search_handler_class = get_class(
     'catalogue.search_handlers', 'get_product_search_handler_class')
 
@@ -110,7 +113,26 @@ class ProductDetailView(DetailView):
             '%s/detail.html' % (self.template_folder)]
 
 
-class CatalogueView(TemplateView):
+class ProductListMixin(object):
+    """
+    Loads the related objects needed to render a page of listed products
+    for all of them at once, rather than once per product
+    """
+
+    def prefetch_products(self, products):
+        products = [product for product in products if product is not None]
+        self.prefetch_purchase_info(products)
+        ProductAttributesContainer.load_for_products(products)
+
+    def prefetch_purchase_info(self, products):
+        # The loaded objects are only reused when the strategy memoises the
+        # purchase info of the products
+        if not settings.OSCAR_PURCHASE_INFO_CACHE_ENABLED:
+            return
+        self.request.strategy.prefetch_for_products(products)
+
+
+class CatalogueView(ProductListMixin, TemplateView):
     """
     Browse all products in the catalogue
     """
@@ -136,10 +158,11 @@ class CatalogueView(TemplateView):
         search_context = self.search_handler.get_search_context_data(
             self.context_object_name)
         ctx.update(search_context)
+        self.prefetch_products(ctx[self.context_object_name])
         return ctx
 
 
-class ProductCategoryView(TemplateView):
+class ProductCategoryView(ProductListMixin, TemplateView):
     """
     Browse products in a given category
     """
@@ -226,4 +249,5 @@ class ProductCategoryView(TemplateView):
         search_context = self.search_handler.get_search_context_data(
             self.context_object_name)
         context.update(search_context)
+        self.prefetch_products(context[self.context_object_name])
         return context
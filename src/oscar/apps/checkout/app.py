@@ -2,23 +2,22 @@ from django.conf import settings
 from django.conf.urls import url
 from django.contrib.auth.decorators import login_required
 
-from oscar.core.application import Application
-from oscar.core.loading import get_class
+from oscar.core.application import Application, LazyView
 
 
 class CheckoutApplication(Application):
     name = 'checkout'
 
-    index_view = get_class('checkout.views', 'IndexView')
-    shipping_address_view = get_class('checkout.views', 'ShippingAddressView')
-    user_address_update_view = get_class('checkout.views',
-                                         'UserAddressUpdateView')
-    user_address_delete_view = get_class('checkout.views',
-                                         'UserAddressDeleteView')
-    shipping_method_view = get_class('checkout.views', 'ShippingMethodView')
-    payment_method_view = get_class('checkout.views', 'PaymentMethodView')
-    payment_details_view = get_class('checkout.views', 'PaymentDetailsView')
-    thankyou_view = get_class('checkout.views', 'ThankYouView')
+    index_view = LazyView('checkout.views', 'IndexView')
+    shipping_address_view = LazyView('checkout.views', 'ShippingAddressView')
+    user_address_update_view = LazyView('checkout.views',
+                                        'UserAddressUpdateView')
+    user_address_delete_view = LazyView('checkout.views',
+                                        'UserAddressDeleteView')
+    shipping_method_view = LazyView('checkout.views', 'ShippingMethodView')
+    payment_method_view = LazyView('checkout.views', 'PaymentMethodView')
+    payment_details_view = LazyView('checkout.views', 'PaymentDetailsView')
+    thankyou_view = LazyView('checkout.views', 'ThankYouView')
 
     def get_urls(self):
         urls = [
@@ -0,0 +1,86 @@
+from decimal import Decimal as D
+
+from django.utils.functional import cached_property
+
+from oscar.core import prices
+
+
+class CheckoutEvaluation(object):
+    """
+    The data derived from the basket and the checkout session for a single
+    checkout request: the availability of the basket lines, the shipping
+    address, method and charge and the order total.
+
+    Each value is calculated the first time it is needed and then shared by
+    the pre-conditions, the skip conditions and ``build_submission`` of the
+    view, rather than being calculated again by each of them. The view
+    methods that return the shipping address and method (and the order
+    totals) are still used, so overriding them keeps working.
+
+    Views that change the checkout session and then carry on with the same
+    request (rather than redirecting) should call ``reset``.
+    """
+
+    def __init__(self, view, basket, request=None):
+        self.view = view
+        self.basket = basket
+        self.request = request if request is not None else view.request
+        # The time in seconds taken by each pre- and skip condition
+        self.timings = []
+
+    def reset(self):
+        for name in ('line_availability', 'shipping_address',
+                     'shipping_method', 'shipping_charge', 'order_total'):
+            self.__dict__.pop(name, None)
+
+    @cached_property
+    def line_availability(self):
+        """
+        A list of (line, is_permitted, reason) tuples for the lines of the
+        basket
+        """
+        strategy = self.request.strategy
+        availability = []
+        for line in self.basket.all_lines():
+            if self.basket.strategy is strategy:
+                # The line keeps the purchase info fetched by the strategy of
+                # the basket, which is the strategy of the request
+                result = line.purchase_info
+            else:
+                result = strategy.fetch_for_line(line)
+            is_permitted, reason = result.availability.is_purchase_permitted(
+                line.quantity)
+            availability.append((line, is_permitted, reason))
+        return availability
+
+    @cached_property
+    def shipping_address(self):
+        return self.view.get_shipping_address(self.basket)
+
+    @cached_property
+    def shipping_method(self):
+        return self.view.get_shipping_method(
+            self.basket, self.shipping_address)
+
+    @cached_property
+    def shipping_charge(self):
+        """
+        The charge of the shipping method, or ``None`` if no (valid) method
+        has been chosen
+        """
+        if not self.shipping_method:
+            return None
+        return self.shipping_method.calculate(self.basket)
+
+    @cached_property
+    def order_total(self):
+        """
+        The order total, assuming a zero shipping charge if no shipping
+        method has been chosen
+        """
+        shipping_charge = self.shipping_charge
+        if shipping_charge is None:
+            shipping_charge = prices.Price(
+                currency=self.basket.currency, excl_tax=D('0.00'),
+                tax=D('0.00'))
+        return self.view.get_order_totals(self.basket, shipping_charge)
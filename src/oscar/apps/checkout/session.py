@@ -1,4 +1,6 @@
+import logging
 from decimal import Decimal as D
+from timeit import default_timer
 
 from django import http
 from django.contrib import messages
@@ -6,7 +8,6 @@ from django.core.exceptions import ImproperlyConfigured
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
 
-from oscar.core import prices
 from oscar.core.loading import get_class, get_model
 
 from . import exceptions
@@ -16,10 +17,14 @@ OrderTotalCalculator = get_class(
     'checkout.calculators', 'OrderTotalCalculator')
 CheckoutSessionData = get_class(
     'checkout.utils', 'CheckoutSessionData')
+CheckoutEvaluation = get_class(
+    'checkout.evaluation', 'CheckoutEvaluation')
 ShippingAddress = get_model('order', 'ShippingAddress')
 BillingAddress = get_model('order', 'BillingAddress')
 UserAddress = get_model('address', 'UserAddress')
 
+logger = logging.getLogger('oscar.checkout')
+
 
 class CheckoutSessionMixin(object):
     """
@@ -76,7 +81,7 @@ class CheckoutSessionMixin(object):
                 raise ImproperlyConfigured(
                     "There is no method '%s' to call as a pre-condition" % (
                         method_name))
-            getattr(self, method_name)(request)
+            self.run_condition(method_name, request)
 
     def get_pre_conditions(self, request):
         """
@@ -93,7 +98,7 @@ class CheckoutSessionMixin(object):
                 raise ImproperlyConfigured(
                     "There is no method '%s' to call as a skip-condition" % (
                         method_name))
-            getattr(self, method_name)(request)
+            self.run_condition(method_name, request)
 
     def get_skip_conditions(self, request):
         """
@@ -103,6 +108,36 @@ class CheckoutSessionMixin(object):
             return []
         return self.skip_conditions
 
+    def run_condition(self, method_name, request):
+        """
+        Run a pre- or skip condition, recording the time it takes on the
+        checkout evaluation
+        """
+        start = default_timer()
+        try:
+            getattr(self, method_name)(request)
+        finally:
+            duration = default_timer() - start
+            self.get_checkout_evaluation(request).timings.append(
+                (method_name, duration))
+            logger.debug("Checkout condition %s took %.2fms",
+                         method_name, duration * 1000)
+
+    def get_checkout_evaluation(self, request=None):
+        """
+        Return the checkout evaluation of the passed request (or of the
+        view's request), which calculates the line availability, shipping
+        charge and order total once for all the conditions and
+        ``build_submission``
+        """
+        if request is None:
+            request = self.request
+        evaluation = getattr(self, '_checkout_evaluation', None)
+        if evaluation is None or evaluation.request is not request:
+            evaluation = self._checkout_evaluation = CheckoutEvaluation(
+                self, request.basket, request)
+        return evaluation
+
     # Re-usable pre-condition validators
 
     def check_basket_is_not_empty(self, request):
@@ -120,11 +155,8 @@ class CheckoutSessionMixin(object):
         stock since it was added to the basket.
         """
         messages = []
-        strategy = request.strategy
-        for line in request.basket.all_lines():
-            result = strategy.fetch_for_line(line)
-            is_permitted, reason = result.availability.is_purchase_permitted(
-                line.quantity)
+        evaluation = self.get_checkout_evaluation(request)
+        for line, is_permitted, reason in evaluation.line_availability:
             if not is_permitted:
                 # Create a more meaningful message to show on the basket page
                 msg = _(
@@ -174,8 +206,7 @@ class CheckoutSessionMixin(object):
             )
 
         # Check that the previously chosen shipping address is still valid
-        shipping_address = self.get_shipping_address(
-            basket=self.request.basket)
+        shipping_address = self.get_checkout_evaluation().shipping_address
         if not shipping_address:
             raise exceptions.FailedPreCondition(
                 url=reverse('checkout:shipping-address'),
@@ -193,11 +224,7 @@ class CheckoutSessionMixin(object):
             )
 
         # Check that a *valid* shipping method has been set
-        shipping_address = self.get_shipping_address(
-            basket=self.request.basket)
-        shipping_method = self.get_shipping_method(
-            basket=self.request.basket,
-            shipping_address=shipping_address)
+        shipping_method = self.get_checkout_evaluation().shipping_method
         if not shipping_method:
             raise exceptions.FailedPreCondition(
                 url=reverse('checkout:shipping-method'),
@@ -225,20 +252,10 @@ class CheckoutSessionMixin(object):
 
     def skip_unless_payment_is_required(self, request):
         # Check to see if payment is actually required for this order.
-        shipping_address = self.get_shipping_address(request.basket)
-        shipping_method = self.get_shipping_method(
-            request.basket, shipping_address)
-        if shipping_method:
-            shipping_charge = shipping_method.calculate(request.basket)
-        else:
-            # It's unusual to get here as a shipping method should be set by
-            # the time this skip-condition is called. In the absence of any
-            # other evidence, we assume the shipping charge is zero.
-            shipping_charge = prices.Price(
-                currency=request.basket.currency, excl_tax=D('0.00'),
-                tax=D('0.00')
-            )
-        total = self.get_order_totals(request.basket, shipping_charge)
+        # It's unusual not to have a shipping method here as it should be set
+        # by the time this skip-condition is called. In the absence of any
+        # other evidence, the evaluation assumes the shipping charge is zero.
+        total = self.get_checkout_evaluation(request).order_total
         if total.excl_tax == D('0.00'):
             raise exceptions.PassedSkipCondition(
                 url=reverse('checkout:preview')
@@ -266,16 +283,23 @@ class CheckoutSessionMixin(object):
         # Pop the basket if there is one, because we pass it as a positional
         # argument to methods below
         basket = kwargs.pop('basket', self.request.basket)
-        shipping_address = self.get_shipping_address(basket)
-        shipping_method = self.get_shipping_method(
-            basket, shipping_address)
+        if basket is self.request.basket:
+            evaluation = self.get_checkout_evaluation()
+        else:
+            evaluation = CheckoutEvaluation(self, basket, self.request)
+        shipping_address = evaluation.shipping_address
+        shipping_method = evaluation.shipping_method
         billing_address = self.get_billing_address(shipping_address)
         if not shipping_method:
             total = shipping_charge = None
         else:
-            shipping_charge = shipping_method.calculate(basket)
-            total = self.get_order_totals(
-                basket, shipping_charge=shipping_charge, **kwargs)
+            shipping_charge = evaluation.shipping_charge
+            if kwargs:
+                # The overrides may change the totals
+                total = self.get_order_totals(
+                    basket, shipping_charge=shipping_charge, **kwargs)
+            else:
+                total = evaluation.order_total
         submission = {
             'user': self.request.user,
             'basket': basket,
@@ -1,10 +1,16 @@
 import logging
+import threading
 import warnings
+from timeit import default_timer
 
+from django.conf import settings
 from django.contrib.sites.models import Site
 from django.core import mail
+from django.db import connections
 from django.db.models import Max
 from django.template import TemplateDoesNotExist, loader
+from django.utils import timezone
+from django.utils.functional import cached_property
 
 from oscar.apps.customer.notifications import services
 from oscar.core.loading import get_class, get_model
@@ -19,16 +25,13 @@ Selector = get_class('partner.strategy', 'Selector')
 logger = logging.getLogger('oscar.alerts')
 
 
-def send_alerts():
+def send_alerts(batch_size=None, concurrency=None):
     """
     Send out product alerts
     """
-    products = Product.objects.filter(
-        productalert__status=ProductAlert.ACTIVE
-    ).distinct()
-    logger.info("Found %d products with active alerts", products.count())
-    for product in products:
-        send_product_alerts(product)
+    sender = ProductAlertSender(batch_size=batch_size, concurrency=concurrency)
+    sender.send_alerts()
+    return sender.stats
 
 
 def send_alert_confirmation(alert):
@@ -73,121 +76,247 @@ def send_alert_confirmation(alert):
         Dispatcher().dispatch_direct_messages(alert.email, messages)
 
 
-def send_product_alerts(product):   # noqa C901 too complex
+def send_product_alerts(product):
     """
     Check for notifications for this product and send email to users
     if the product is back in stock. Add a little 'hurry' note if the
     amount of in-stock items is less then the number of notifications.
     """
-    stockrecords = product.stockrecords.all()
-    num_stockrecords = len(stockrecords)
-    if not num_stockrecords:
-        return
-
-    logger.info("Sending alerts for '%s'", product)
-    alerts = ProductAlert.objects.filter(
-        product_id__in=(product.id, product.parent_id),
-        status=ProductAlert.ACTIVE,
-    )
-
-    # Determine 'hurry mode'
-    if num_stockrecords == 1:
-        num_in_stock = stockrecords[0].num_in_stock
-    else:
-        result = stockrecords.aggregate(max_in_stock=Max('num_in_stock'))
-        num_in_stock = result['max_in_stock']
-
-    # hurry_mode is false if num_in_stock is None
-    hurry_mode = num_in_stock is not None and alerts.count() > num_in_stock
+    ProductAlertSender().send_product_alerts(product)
 
-    # For backwards compability, we check if the old (non-communication-event)
-    # templates exist, and use them if they do.
-    # This will be removed in Oscar 2.0
-    try:
-        email_subject_tpl = loader.get_template('customer/alerts/emails/'
-                                                'alert_subject.txt')
-        email_body_tpl = loader.get_template('customer/alerts/emails/'
-                                             'alert_body.txt')
 
-        use_deprecated_templates = True
-        warnings.warn(
-            "Product alert notifications now use the CommunicationEvent. "
-            "Move '{}' to '{}', and '{}' to '{}'".format(
-                'customer/alerts/emails/alert_subject.txt',
-                'customer/emails/commtype_product_alert_subject.txt',
-                'customer/alerts/emails/alert_body.txt',
-                'customer/emails/commtype_product_alert_body.txt',
-            ),
-            category=RemovedInOscar20Warning, stacklevel=2
+class ProductAlertSender(object):
+    """
+    Sends the alerts of products which are back in stock.
+
+    The alerts of a product are loaded in batches of ``batch_size``. The
+    availability of the product is checked once per strategy class rather
+    than for each alert, the templates and the current site are loaded once,
+    and the alerts of a batch are closed with a single query. The emails are
+    sent by ``concurrency`` threads, each using its own mail connection.
+    """
+
+    def __init__(self, batch_size=None, concurrency=None):
+        self.batch_size = (
+            batch_size or settings.OSCAR_PRODUCT_ALERTS_BATCH_SIZE)
+        self.concurrency = (
+            concurrency or settings.OSCAR_PRODUCT_ALERTS_CONCURRENCY)
+        self.selector = Selector()
+        self.lock = threading.Lock()
+        self.stats = {
+            'products': 0, 'alerts': 0, 'notifications': 0, 'messages': 0,
+            'failed': 0, 'seconds': 0.0}
+
+    def send_alerts(self):
+        products = Product.objects.filter(
+            productalert__status=ProductAlert.ACTIVE
+        ).distinct()
+        logger.info("Found %d products with active alerts", products.count())
+        for product in products.iterator():
+            self.send_product_alerts(product)
+        logger.info(
+            "Sent alerts for %(products)d products: %(alerts)d alerts closed, "
+            "%(notifications)d notifications and %(messages)d messages sent, "
+            "%(failed)d messages failed in %(seconds).1fs", self.stats)
+
+    def send_product_alerts(self, product):
+        stockrecords = product.stockrecords.all()
+        num_stockrecords = len(stockrecords)
+        if not num_stockrecords:
+            return
+
+        logger.info("Sending alerts for '%s'", product)
+        alerts = ProductAlert.objects.filter(
+            product_id__in=(product.id, product.parent_id),
+            status=ProductAlert.ACTIVE,
         )
 
-    except TemplateDoesNotExist:
-        code = 'PRODUCT_ALERT'
-        try:
-            event_type = CommunicationEventType.objects.get(code=code)
-        except CommunicationEventType.DoesNotExist:
-            event_type = CommunicationEventType.objects.model(code=code)
-        use_deprecated_templates = False
-
-    messages_to_send = []
-    user_messages_to_send = []
-    num_notifications = 0
-    selector = Selector()
-    for alert in alerts:
-        # Check if the product is available to this user
-        strategy = selector.strategy(user=alert.user)
-        data = strategy.fetch_for_product(product)
-        if not data.availability.is_available_to_buy:
-            continue
-
-        ctx = {
-            'alert': alert,
-            'site': Site.objects.get_current(),
-            'hurry': hurry_mode,
-        }
-        if alert.user:
-            # Send a site notification
-            num_notifications += 1
-            subj_tpl = loader.get_template('customer/alerts/message_subject.html')
-            message_tpl = loader.get_template('customer/alerts/message.html')
-            services.notify_user(
-                alert.user,
-                subj_tpl.render(ctx).strip(),
-                body=message_tpl.render(ctx).strip()
-            )
+        # Determine 'hurry mode'
+        if num_stockrecords == 1:
+            num_in_stock = stockrecords[0].num_in_stock
+        else:
+            result = stockrecords.aggregate(max_in_stock=Max('num_in_stock'))
+            num_in_stock = result['max_in_stock']
 
-        # Build message and add to list
-        if use_deprecated_templates:
-            messages = {
-                'subject': email_subject_tpl.render(ctx).strip(),
-                'body': email_body_tpl.render(ctx),
+        # hurry_mode is false if num_in_stock is None
+        hurry_mode = num_in_stock is not None and alerts.count() > num_in_stock
+
+        self.stats['products'] += 1
+        availability = {}
+        for batch in self.get_batches(alerts):
+            start = default_timer()
+            self.send_batch(product, batch, hurry_mode, availability)
+            self.stats['seconds'] += default_timer() - start
+            logger.info(
+                "Processed %d alerts for '%s' (%d alerts closed, %d messages "
+                "sent, %d failed so far)", len(batch), product,
+                self.stats['alerts'], self.stats['messages'],
+                self.stats['failed'])
+
+    def get_batches(self, alerts):
+        """
+        Yield the passed alerts in batches, paginating on the primary key so
+        that closing the alerts of a batch doesn't shift the next one
+        """
+        alerts = alerts.select_related('user').order_by('pk')
+        last_pk = None
+        while True:
+            batch = alerts if last_pk is None else alerts.filter(pk__gt=last_pk)
+            batch = list(batch[:self.batch_size])
+            if not batch:
+                return
+            yield batch
+            last_pk = batch[-1].pk
+
+    def is_available(self, product, user, availability):
+        # Strategies of the same class are assumed to agree on availability,
+        # so the product is fetched once per strategy class. Override this
+        # if your strategies take the user into account.
+        strategy = self.selector.strategy(user=user)
+        key = strategy.__class__
+        if key not in availability:
+            data = strategy.fetch_for_product(product)
+            availability[key] = data.availability.is_available_to_buy
+        return availability[key]
+
+    def send_batch(self, product, alerts, hurry_mode, availability):
+        messages_to_send = []
+        user_messages_to_send = []
+        closed = []
+        for alert in alerts:
+            # Check if the product is available to this user
+            if not self.is_available(product, alert.user, availability):
+                continue
+
+            ctx = {
+                'alert': alert,
+                'site': self.site,
+                'hurry': hurry_mode,
+            }
+            if alert.user:
+                # Send a site notification
+                self.stats['notifications'] += 1
+                subj_tpl, message_tpl = self.notification_templates
+                services.notify_user(
+                    alert.user,
+                    subj_tpl.render(ctx).strip(),
+                    body=message_tpl.render(ctx).strip()
+                )
+
+            messages = self.get_messages(ctx)
+            if messages and messages['body']:
+                if alert.user:
+                    user_messages_to_send.append(
+                        (alert.user, messages)
+                    )
+                else:
+                    messages_to_send.append(
+                        (alert.get_email_address(), messages)
+                    )
+            closed.append(alert.pk)
+
+        ProductAlert.objects.filter(pk__in=closed).update(
+            status=ProductAlert.CLOSED, date_closed=timezone.now())
+        self.stats['alerts'] += len(closed)
+        self.dispatch(messages_to_send, user_messages_to_send)
+
+    def get_messages(self, ctx):
+        templates = self.email_templates
+        if templates['deprecated']:
+            return {
+                'subject': templates['subject'].render(ctx).strip(),
+                'body': templates['body'].render(ctx),
                 'html': '',
                 'sms': '',
             }
-        else:
-            messages = event_type.get_messages(ctx)
+        return templates['event_type'].get_messages(
+            ctx, templates=templates['templates'])
 
-        if messages and messages['body']:
-            if alert.user:
-                user_messages_to_send.append(
-                    (alert.user, messages)
-                )
-            else:
-                messages_to_send.append(
-                    (alert.get_email_address(), messages)
-                )
-        alert.close()
+    @cached_property
+    def site(self):
+        return Site.objects.get_current()
+
+    @cached_property
+    def notification_templates(self):
+        return (loader.get_template('customer/alerts/message_subject.html'),
+                loader.get_template('customer/alerts/message.html'))
 
-    # Send all messages using one SMTP connection to avoid opening lots of them
-    if messages_to_send or user_messages_to_send:
+    @cached_property
+    def email_templates(self):
+        # For backwards compability, we check if the old
+        # (non-communication-event) templates exist, and use them if they do.
+        # This will be removed in Oscar 2.0
+        try:
+            email_subject_tpl = loader.get_template('customer/alerts/emails/'
+                                                    'alert_subject.txt')
+            email_body_tpl = loader.get_template('customer/alerts/emails/'
+                                                 'alert_body.txt')
+            warnings.warn(
+                "Product alert notifications now use the CommunicationEvent. "
+                "Move '{}' to '{}', and '{}' to '{}'".format(
+                    'customer/alerts/emails/alert_subject.txt',
+                    'customer/emails/commtype_product_alert_subject.txt',
+                    'customer/alerts/emails/alert_body.txt',
+                    'customer/emails/commtype_product_alert_body.txt',
+                ),
+                category=RemovedInOscar20Warning, stacklevel=2
+            )
+            return {'deprecated': True, 'subject': email_subject_tpl,
+                    'body': email_body_tpl}
+        except TemplateDoesNotExist:
+            code = 'PRODUCT_ALERT'
+            try:
+                event_type = CommunicationEventType.objects.get(code=code)
+            except CommunicationEventType.DoesNotExist:
+                event_type = CommunicationEventType.objects.model(code=code)
+            return {'deprecated': False, 'event_type': event_type,
+                    'templates': event_type.get_templates()}
+
+    def dispatch(self, messages_to_send, user_messages_to_send):
+        """
+        Send the messages of a batch, splitting them between ``concurrency``
+        threads
+        """
+        messages = ([('direct', message) for message in messages_to_send] +
+                    [('user', message) for message in user_messages_to_send])
+        if not messages:
+            return
+        if self.concurrency <= 1:
+            self.dispatch_messages(messages)
+            return
+        threads = [
+            threading.Thread(target=self.dispatch_messages,
+                             args=(messages[i::self.concurrency], True))
+            for i in range(min(self.concurrency, len(messages)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def dispatch_messages(self, messages, in_thread=False):
+        # Send all messages using one SMTP connection to avoid opening lots
+        # of them
         connection = mail.get_connection()
         connection.open()
         disp = Dispatcher(mail_connection=connection)
-        for message in messages_to_send:
-            disp.dispatch_direct_messages(*message)
-        for message in user_messages_to_send:
-            disp.dispatch_user_messages(*message)
-        connection.close()
-
-    logger.info("Sent %d notifications and %d messages", num_notifications,
-                len(messages_to_send) + len(user_messages_to_send))
+        sent = failed = 0
+        try:
+            for kind, message in messages:
+                try:
+                    if kind == 'direct':
+                        disp.dispatch_direct_messages(*message)
+                    else:
+                        disp.dispatch_user_messages(*message)
+                    sent += 1
+                except Exception:
+                    logger.exception("Unable to send alert message to %s",
+                                     message[0])
+                    failed += 1
+        finally:
+            connection.close()
+            if in_thread:
+                # Close the database connections opened by the thread
+                connections.close_all()
+            with self.lock:
+                self.stats['messages'] += sent
+                self.stats['failed'] += failed
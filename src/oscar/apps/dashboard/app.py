@@ -4,6 +4,7 @@ from django.contrib.auth.forms import AuthenticationForm
 
 from oscar.core.application import (
     DashboardApplication as BaseDashboardApplication)
+from oscar.core.application import LazyView
 from oscar.core.loading import get_class
 
 
@@ -13,7 +14,7 @@ class DashboardApplication(BaseDashboardApplication):
         'index': (['is_staff'], ['partner.dashboard_access']),
     }
 
-    index_view = get_class('dashboard.views', 'IndexView')
+    index_view = LazyView('dashboard.views', 'IndexView')
     reports_app = get_class('dashboard.reports.app', 'application')
     orders_app = get_class('dashboard.orders.app', 'application')
     users_app = get_class('dashboard.users.app', 'application')
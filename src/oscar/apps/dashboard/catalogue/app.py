@@ -1,7 +1,6 @@
 from django.conf.urls import url
 
-from oscar.core.application import DashboardApplication
-from oscar.core.loading import get_class
+from oscar.core.application import DashboardApplication, LazyView
 
 
 class CatalogueApplication(DashboardApplication):
@@ -19,48 +18,48 @@ class CatalogueApplication(DashboardApplication):
                                      ['partner.dashboard_access']),
     }
 
-    product_list_view = get_class('dashboard.catalogue.views',
-                                  'ProductListView')
-    product_lookup_view = get_class('dashboard.catalogue.views',
-                                    'ProductLookupView')
-    product_create_redirect_view = get_class('dashboard.catalogue.views',
-                                             'ProductCreateRedirectView')
-    product_createupdate_view = get_class('dashboard.catalogue.views',
-                                          'ProductCreateUpdateView')
-    product_delete_view = get_class('dashboard.catalogue.views',
-                                    'ProductDeleteView')
+    product_list_view = LazyView('dashboard.catalogue.views',
+                                 'ProductListView')
+    product_lookup_view = LazyView('dashboard.catalogue.views',
+                                   'ProductLookupView')
+    product_create_redirect_view = LazyView('dashboard.catalogue.views',
+                                            'ProductCreateRedirectView')
+    product_createupdate_view = LazyView('dashboard.catalogue.views',
+                                         'ProductCreateUpdateView')
+    product_delete_view = LazyView('dashboard.catalogue.views',
+                                   'ProductDeleteView')
 
-    product_class_create_view = get_class('dashboard.catalogue.views',
-                                          'ProductClassCreateView')
-    product_class_update_view = get_class('dashboard.catalogue.views',
-                                          'ProductClassUpdateView')
-    product_class_list_view = get_class('dashboard.catalogue.views',
-                                        'ProductClassListView')
-    product_class_delete_view = get_class('dashboard.catalogue.views',
-                                          'ProductClassDeleteView')
+    product_class_create_view = LazyView('dashboard.catalogue.views',
+                                         'ProductClassCreateView')
+    product_class_update_view = LazyView('dashboard.catalogue.views',
+                                         'ProductClassUpdateView')
+    product_class_list_view = LazyView('dashboard.catalogue.views',
+                                       'ProductClassListView')
+    product_class_delete_view = LazyView('dashboard.catalogue.views',
+                                         'ProductClassDeleteView')
 
-    category_list_view = get_class('dashboard.catalogue.views',
-                                   'CategoryListView')
-    category_detail_list_view = get_class('dashboard.catalogue.views',
-                                          'CategoryDetailListView')
-    category_create_view = get_class('dashboard.catalogue.views',
-                                     'CategoryCreateView')
-    category_update_view = get_class('dashboard.catalogue.views',
-                                     'CategoryUpdateView')
-    category_delete_view = get_class('dashboard.catalogue.views',
-                                     'CategoryDeleteView')
+    category_list_view = LazyView('dashboard.catalogue.views',
+                                  'CategoryListView')
+    category_detail_list_view = LazyView('dashboard.catalogue.views',
+                                         'CategoryDetailListView')
+    category_create_view = LazyView('dashboard.catalogue.views',
+                                    'CategoryCreateView')
+    category_update_view = LazyView('dashboard.catalogue.views',
+                                    'CategoryUpdateView')
+    category_delete_view = LazyView('dashboard.catalogue.views',
+                                    'CategoryDeleteView')
 
-    stock_alert_view = get_class('dashboard.catalogue.views',
-                                 'StockAlertListView')
+    stock_alert_view = LazyView('dashboard.catalogue.views',
+                                'StockAlertListView')
 
-    attribute_option_group_create_view = get_class('dashboard.catalogue.views',
-                                                   'AttributeOptionGroupCreateView')
-    attribute_option_group_list_view = get_class('dashboard.catalogue.views',
-                                                 'AttributeOptionGroupListView')
-    attribute_option_group_update_view = get_class('dashboard.catalogue.views',
-                                                   'AttributeOptionGroupUpdateView')
-    attribute_option_group_delete_view = get_class('dashboard.catalogue.views',
-                                                   'AttributeOptionGroupDeleteView')
+    attribute_option_group_create_view = LazyView('dashboard.catalogue.views',
+                                                  'AttributeOptionGroupCreateView')
+    attribute_option_group_list_view = LazyView('dashboard.catalogue.views',
+                                                'AttributeOptionGroupListView')
+    attribute_option_group_update_view = LazyView('dashboard.catalogue.views',
+                                                  'AttributeOptionGroupUpdateView')
+    attribute_option_group_delete_view = LazyView('dashboard.catalogue.views',
+                                                  'AttributeOptionGroupDeleteView')
 
     def get_urls(self):
         urls = [
@@ -1,15 +1,14 @@
 from django.conf.urls import url
 
-from oscar.core.application import DashboardApplication
-from oscar.core.loading import get_class
+from oscar.core.application import DashboardApplication, LazyView
 
 
 class CommsDashboardApplication(DashboardApplication):
     name = None
     default_permissions = ['is_staff', ]
 
-    list_view = get_class('dashboard.communications.views', 'ListView')
-    update_view = get_class('dashboard.communications.views', 'UpdateView')
+    list_view = LazyView('dashboard.communications.views', 'ListView')
+    update_view = LazyView('dashboard.communications.views', 'UpdateView')
 
     def get_urls(self):
         urls = [
@@ -1,21 +1,20 @@
 from django.conf.urls import url
 
-from oscar.core.application import DashboardApplication
-from oscar.core.loading import get_class
+from oscar.core.application import DashboardApplication, LazyView
 
 
 class OffersDashboardApplication(DashboardApplication):
     name = None
     default_permissions = ['is_staff', ]
 
-    list_view = get_class('dashboard.offers.views', 'OfferListView')
-    metadata_view = get_class('dashboard.offers.views', 'OfferMetaDataView')
-    condition_view = get_class('dashboard.offers.views', 'OfferConditionView')
-    benefit_view = get_class('dashboard.offers.views', 'OfferBenefitView')
-    restrictions_view = get_class('dashboard.offers.views',
-                                  'OfferRestrictionsView')
-    delete_view = get_class('dashboard.offers.views', 'OfferDeleteView')
-    detail_view = get_class('dashboard.offers.views', 'OfferDetailView')
+    list_view = LazyView('dashboard.offers.views', 'OfferListView')
+    metadata_view = LazyView('dashboard.offers.views', 'OfferMetaDataView')
+    condition_view = LazyView('dashboard.offers.views', 'OfferConditionView')
+    benefit_view = LazyView('dashboard.offers.views', 'OfferBenefitView')
+    restrictions_view = LazyView('dashboard.offers.views',
+                                 'OfferRestrictionsView')
+    delete_view = LazyView('dashboard.offers.views', 'OfferDeleteView')
+    detail_view = LazyView('dashboard.offers.views', 'OfferDetailView')
 
     def get_urls(self):
         urls = [
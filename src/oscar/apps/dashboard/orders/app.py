@@ -1,7 +1,6 @@
 from django.conf.urls import url
 
-from oscar.core.application import DashboardApplication
-from oscar.core.loading import get_class
+from oscar.core.application import DashboardApplication, LazyView
 
 
 class OrdersDashboardApplication(DashboardApplication):
@@ -16,12 +15,12 @@ class OrdersDashboardApplication(DashboardApplication):
         'order-shipping-address': (['is_staff'], ['partner.dashboard_access']),
     }
 
-    order_list_view = get_class('dashboard.orders.views', 'OrderListView')
-    order_detail_view = get_class('dashboard.orders.views', 'OrderDetailView')
-    shipping_address_view = get_class('dashboard.orders.views',
-                                      'ShippingAddressUpdateView')
-    line_detail_view = get_class('dashboard.orders.views', 'LineDetailView')
-    order_stats_view = get_class('dashboard.orders.views', 'OrderStatsView')
+    order_list_view = LazyView('dashboard.orders.views', 'OrderListView')
+    order_detail_view = LazyView('dashboard.orders.views', 'OrderDetailView')
+    shipping_address_view = LazyView('dashboard.orders.views',
+                                     'ShippingAddressUpdateView')
+    line_detail_view = LazyView('dashboard.orders.views', 'LineDetailView')
+    order_stats_view = LazyView('dashboard.orders.views', 'OrderStatsView')
 
     def get_urls(self):
         urls = [
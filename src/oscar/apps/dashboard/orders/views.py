@@ -31,6 +31,8 @@ Line = get_model('order', 'Line')
 ShippingEventType = get_model('order', 'ShippingEventType')
 PaymentEventType = get_model('order', 'PaymentEventType')
 EventHandler = get_class('order.processing', 'EventHandler')
+ProductAttributesContainer = get_class(
+    'catalogue.product_attributes', 'ProductAttributesContainer')
 OrderStatsForm = get_class('dashboard.orders.forms', 'OrderStatsForm')
 OrderSearchForm = get_class('dashboard.orders.forms', 'OrderSearchForm')
 OrderNoteForm = get_class('dashboard.orders.forms', 'OrderNoteForm')
@@ -449,7 +451,9 @@ class OrderDetailView(DetailView):
             self.request.user, self.kwargs['number'])
 
     def get_order_lines(self):
-        return self.object.lines.all()
+        return self.object.lines.prefetch_related(
+            ProductAttributesContainer.get_prefetch(
+                'product__attribute_values'))
 
     def post(self, request, *args, **kwargs):
         # For POST requests, we use a dynamic dispatch technique where a
@@ -1,17 +1,16 @@
 from django.conf.urls import url
 
-from oscar.core.application import DashboardApplication
-from oscar.core.loading import get_class
+from oscar.core.application import DashboardApplication, LazyView
 
 
 class FlatPageManagementApplication(DashboardApplication):
     name = None
     default_permissions = ['is_staff', ]
 
-    list_view = get_class('dashboard.pages.views', 'PageListView')
-    create_view = get_class('dashboard.pages.views', 'PageCreateView')
-    update_view = get_class('dashboard.pages.views', 'PageUpdateView')
-    delete_view = get_class('dashboard.pages.views', 'PageDeleteView')
+    list_view = LazyView('dashboard.pages.views', 'PageListView')
+    create_view = LazyView('dashboard.pages.views', 'PageCreateView')
+    update_view = LazyView('dashboard.pages.views', 'PageUpdateView')
+    delete_view = LazyView('dashboard.pages.views', 'PageDeleteView')
 
     def get_urls(self):
         """
@@ -1,28 +1,27 @@
 from django.conf.urls import url
 
-from oscar.core.application import DashboardApplication
-from oscar.core.loading import get_class
+from oscar.core.application import DashboardApplication, LazyView
 
 
 class PartnersDashboardApplication(DashboardApplication):
     name = None
     default_permissions = ['is_staff', ]
 
-    list_view = get_class('dashboard.partners.views', 'PartnerListView')
-    create_view = get_class('dashboard.partners.views', 'PartnerCreateView')
-    manage_view = get_class('dashboard.partners.views', 'PartnerManageView')
-    delete_view = get_class('dashboard.partners.views', 'PartnerDeleteView')
-
-    user_link_view = get_class('dashboard.partners.views',
-                               'PartnerUserLinkView')
-    user_unlink_view = get_class('dashboard.partners.views',
-                                 'PartnerUserUnlinkView')
-    user_create_view = get_class('dashboard.partners.views',
-                                 'PartnerUserCreateView')
-    user_select_view = get_class('dashboard.partners.views',
-                                 'PartnerUserSelectView')
-    user_update_view = get_class('dashboard.partners.views',
-                                 'PartnerUserUpdateView')
+    list_view = LazyView('dashboard.partners.views', 'PartnerListView')
+    create_view = LazyView('dashboard.partners.views', 'PartnerCreateView')
+    manage_view = LazyView('dashboard.partners.views', 'PartnerManageView')
+    delete_view = LazyView('dashboard.partners.views', 'PartnerDeleteView')
+
+    user_link_view = LazyView('dashboard.partners.views',
+                              'PartnerUserLinkView')
+    user_unlink_view = LazyView('dashboard.partners.views',
+                                'PartnerUserUnlinkView')
+    user_create_view = LazyView('dashboard.partners.views',
+                                'PartnerUserCreateView')
+    user_select_view = LazyView('dashboard.partners.views',
+                                'PartnerUserSelectView')
+    user_update_view = LazyView('dashboard.partners.views',
+                                'PartnerUserUpdateView')
 
     def get_urls(self):
         urls = [
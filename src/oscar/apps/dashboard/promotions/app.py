@@ -1,7 +1,7 @@
 from django.conf.urls import url
 
 from oscar.apps.promotions.conf import PROMOTION_CLASSES
-from oscar.core.application import DashboardApplication
+from oscar.core.application import DashboardApplication, LazyView
 from oscar.core.loading import get_class
 
 
@@ -9,16 +9,16 @@ class PromotionsDashboardApplication(DashboardApplication):
     name = None
     default_permissions = ['is_staff', ]
 
-    list_view = get_class('dashboard.promotions.views',
-                          'ListView')
-    page_list = get_class('dashboard.promotions.views',
-                          'PageListView')
-    page_detail = get_class('dashboard.promotions.views',
-                            'PageDetailView')
-    create_redirect_view = get_class('dashboard.promotions.views',
-                                     'CreateRedirectView')
-    delete_page_promotion_view = get_class('dashboard.promotions.views',
-                                           'DeletePagePromotionView')
+    list_view = LazyView('dashboard.promotions.views',
+                         'ListView')
+    page_list = LazyView('dashboard.promotions.views',
+                         'PageListView')
+    page_detail = LazyView('dashboard.promotions.views',
+                           'PageDetailView')
+    create_redirect_view = LazyView('dashboard.promotions.views',
+                                    'CreateRedirectView')
+    delete_page_promotion_view = LazyView('dashboard.promotions.views',
+                                          'DeletePagePromotionView')
 
     # Dynamically set the CRUD views for all promotion classes
     view_names = (
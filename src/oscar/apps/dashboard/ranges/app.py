@@ -1,19 +1,18 @@
 from django.conf.urls import url
 
-from oscar.core.application import DashboardApplication
-from oscar.core.loading import get_class
+from oscar.core.application import DashboardApplication, LazyView
 
 
 class RangeDashboardApplication(DashboardApplication):
     name = None
     default_permissions = ['is_staff', ]
 
-    list_view = get_class('dashboard.ranges.views', 'RangeListView')
-    create_view = get_class('dashboard.ranges.views', 'RangeCreateView')
-    update_view = get_class('dashboard.ranges.views', 'RangeUpdateView')
-    delete_view = get_class('dashboard.ranges.views', 'RangeDeleteView')
-    products_view = get_class('dashboard.ranges.views', 'RangeProductListView')
-    reorder_view = get_class('dashboard.ranges.views', 'RangeReorderView')
+    list_view = LazyView('dashboard.ranges.views', 'RangeListView')
+    create_view = LazyView('dashboard.ranges.views', 'RangeCreateView')
+    update_view = LazyView('dashboard.ranges.views', 'RangeUpdateView')
+    delete_view = LazyView('dashboard.ranges.views', 'RangeDeleteView')
+    products_view = LazyView('dashboard.ranges.views', 'RangeProductListView')
+    reorder_view = LazyView('dashboard.ranges.views', 'RangeReorderView')
 
     def get_urls(self):
         urlpatterns = [
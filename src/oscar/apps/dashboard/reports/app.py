@@ -1,14 +1,13 @@
 from django.conf.urls import url
 
-from oscar.core.application import DashboardApplication
-from oscar.core.loading import get_class
+from oscar.core.application import DashboardApplication, LazyView
 
 
 class ReportsApplication(DashboardApplication):
     name = None
     default_permissions = ['is_staff', ]
 
-    index_view = get_class('dashboard.reports.views', 'IndexView')
+    index_view = LazyView('dashboard.reports.views', 'IndexView')
 
     def get_urls(self):
         urls = [
@@ -1,16 +1,15 @@
 from django.conf.urls import url
 
-from oscar.core.application import DashboardApplication
-from oscar.core.loading import get_class
+from oscar.core.application import DashboardApplication, LazyView
 
 
 class ReviewsApplication(DashboardApplication):
     name = None
     default_permissions = ['is_staff', ]
 
-    list_view = get_class('dashboard.reviews.views', 'ReviewListView')
-    update_view = get_class('dashboard.reviews.views', 'ReviewUpdateView')
-    delete_view = get_class('dashboard.reviews.views', 'ReviewDeleteView')
+    list_view = LazyView('dashboard.reviews.views', 'ReviewListView')
+    update_view = LazyView('dashboard.reviews.views', 'ReviewUpdateView')
+    delete_view = LazyView('dashboard.reviews.views', 'ReviewDeleteView')
 
     def get_urls(self):
         urls = [
@@ -1,27 +1,26 @@
 from django.conf.urls import url
 
-from oscar.core.application import DashboardApplication
-from oscar.core.loading import get_class
+from oscar.core.application import DashboardApplication, LazyView
 
 
 class ShippingDashboardApplication(DashboardApplication):
     name = None
     default_permissions = ['is_staff']
 
-    weight_method_list_view = get_class(
+    weight_method_list_view = LazyView(
         'dashboard.shipping.views', 'WeightBasedListView')
-    weight_method_create_view = get_class(
+    weight_method_create_view = LazyView(
         'dashboard.shipping.views', 'WeightBasedCreateView')
-    weight_method_edit_view = get_class(
+    weight_method_edit_view = LazyView(
         'dashboard.shipping.views', 'WeightBasedUpdateView')
-    weight_method_delete_view = get_class(
+    weight_method_delete_view = LazyView(
         'dashboard.shipping.views', 'WeightBasedDeleteView')
     # This doubles as the weight_band create view
-    weight_method_detail_view = get_class(
+    weight_method_detail_view = LazyView(
         'dashboard.shipping.views', 'WeightBasedDetailView')
-    weight_band_edit_view = get_class(
+    weight_band_edit_view = LazyView(
         'dashboard.shipping.views', 'WeightBandUpdateView')
-    weight_band_delete_view = get_class(
+    weight_band_delete_view = LazyView(
         'dashboard.shipping.views', 'WeightBandDeleteView')
 
     def get_urls(self):
@@ -1,23 +1,22 @@
 from django.conf.urls import url
 
-from oscar.core.application import DashboardApplication
-from oscar.core.loading import get_class
+from oscar.core.application import DashboardApplication, LazyView
 
 
 class UserManagementApplication(DashboardApplication):
     name = None
     default_permissions = ['is_staff', ]
 
-    index_view = get_class('dashboard.users.views', 'IndexView')
-    user_detail_view = get_class('dashboard.users.views', 'UserDetailView')
-    password_reset_view = get_class('dashboard.users.views',
-                                    'PasswordResetView')
-    alert_list_view = get_class('dashboard.users.views',
-                                'ProductAlertListView')
-    alert_update_view = get_class('dashboard.users.views',
-                                  'ProductAlertUpdateView')
-    alert_delete_view = get_class('dashboard.users.views',
-                                  'ProductAlertDeleteView')
+    index_view = LazyView('dashboard.users.views', 'IndexView')
+    user_detail_view = LazyView('dashboard.users.views', 'UserDetailView')
+    password_reset_view = LazyView('dashboard.users.views',
+                                   'PasswordResetView')
+    alert_list_view = LazyView('dashboard.users.views',
+                               'ProductAlertListView')
+    alert_update_view = LazyView('dashboard.users.views',
+                                 'ProductAlertUpdateView')
+    alert_delete_view = LazyView('dashboard.users.views',
+                                 'ProductAlertDeleteView')
 
     def get_urls(self):
         urls = [
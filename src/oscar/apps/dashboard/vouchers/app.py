@@ -1,28 +1,27 @@
 from django.conf.urls import url
 
-from oscar.core.application import DashboardApplication
-from oscar.core.loading import get_class
+from oscar.core.application import DashboardApplication, LazyView
 
 
 class VoucherDashboardApplication(DashboardApplication):
     name = None
     default_permissions = ['is_staff', ]
 
-    list_view = get_class('dashboard.vouchers.views', 'VoucherListView')
-    create_view = get_class('dashboard.vouchers.views', 'VoucherCreateView')
-    update_view = get_class('dashboard.vouchers.views', 'VoucherUpdateView')
-    delete_view = get_class('dashboard.vouchers.views', 'VoucherDeleteView')
-    stats_view = get_class('dashboard.vouchers.views', 'VoucherStatsView')
+    list_view = LazyView('dashboard.vouchers.views', 'VoucherListView')
+    create_view = LazyView('dashboard.vouchers.views', 'VoucherCreateView')
+    update_view = LazyView('dashboard.vouchers.views', 'VoucherUpdateView')
+    delete_view = LazyView('dashboard.vouchers.views', 'VoucherDeleteView')
+    stats_view = LazyView('dashboard.vouchers.views', 'VoucherStatsView')
 
-    set_list_view = get_class(
+    set_list_view = LazyView(
         'dashboard.vouchers.views', 'VoucherSetListView')
-    set_create_view = get_class(
+    set_create_view = LazyView(
         'dashboard.vouchers.views', 'VoucherSetCreateView')
-    set_update_view = get_class(
+    set_update_view = LazyView(
         'dashboard.vouchers.views', 'VoucherSetUpdateView')
-    set_detail_view = get_class(
+    set_detail_view = LazyView(
         'dashboard.vouchers.views', 'VoucherSetDetailView')
-    set_download_view = get_class(
+    set_download_view = LazyView(
         'dashboard.vouchers.views', 'VoucherSetDownloadView')
 
     def get_urls(self):
@@ -4,6 +4,7 @@ import os
 import re
 from decimal import Decimal as D
 from decimal import ROUND_DOWN
+from functools import reduce
 
 from django.conf import settings
 from django.core import exceptions
@@ -25,6 +26,7 @@ ActiveOfferManager, BrowsableRangeManager \
     = get_classes('offer.managers', ['ActiveOfferManager', 'BrowsableRangeManager'])
 ZERO_DISCOUNT = get_class('offer.results', 'ZERO_DISCOUNT')
 load_proxy, unit_price = get_classes('offer.utils', ['load_proxy', 'unit_price'])
+range_product_index = get_class('offer.cache', 'range_product_index')
 
 
 @python_2_unicode_compatible
@@ -817,6 +819,7 @@ class AbstractRange(models.Model):
     __excluded_product_ids = None
     __class_ids = None
     __category_ids = None
+    __product_index = None
 
     objects = models.Manager()
     browsable = BrowsableRangeManager()
@@ -889,6 +892,15 @@ class AbstractRange(models.Model):
         if self.proxy:
             return self.proxy.contains_product(product)
 
+        if self.uses_product_index:
+            product_ids, excluded_product_ids = self._product_index()
+            if product.id in product_ids:
+                return True
+            # Children are part of the range if their parent is
+            return (product.is_child
+                    and product.parent_id in product_ids
+                    and product.id not in excluded_product_ids)
+
         excluded_product_ids = self._excluded_product_ids()
         if product.id in excluded_product_ids:
             return False
@@ -951,21 +963,42 @@ class AbstractRange(models.Model):
 
     def _category_ids(self):
         if self.__category_ids is None:
-            category_ids_list = list(
-                self.included_categories.values_list('pk', flat=True))
-            for category in self.included_categories.all():
-                children_ids = category.get_descendants().values_list(
-                    'pk', flat=True)
-                category_ids_list.extend(list(children_ids))
-
-            self.__category_ids = category_ids_list
+            Category = get_model('catalogue', 'Category')
+            paths = self.included_categories.values_list('path', flat=True)
+            if paths:
+                # Categories are stored as a materialised path, so the
+                # included categories and all their descendants can be fetched
+                # in a single query.
+                query = reduce(operator.or_, (
+                    Q(path__startswith=path) for path in paths))
+                self.__category_ids = list(
+                    Category.objects.filter(query).values_list(
+                        'pk', flat=True))
+            else:
+                self.__category_ids = []
 
         return self.__category_ids
 
+    @property
+    def uses_product_index(self):
+        """
+        Test whether the product ids of this range are looked up in the range
+        product index, rather than queried each time.
+        """
+        return (settings.OSCAR_RANGE_INDEX_ENABLED
+                and bool(self.id)
+                and not self.includes_all_products)
+
+    def _product_index(self):
+        if self.__product_index is None:
+            self.__product_index = range_product_index.get(self)
+        return self.__product_index
+
     def invalidate_cached_ids(self):
         self.__category_ids = None
         self.__included_product_ids = None
         self.__excluded_product_ids = None
+        self.__product_index = None
 
     def num_products(self):
         # Delegate to a proxy class if one is provided
@@ -973,6 +1006,9 @@ class AbstractRange(models.Model):
             return self.proxy.num_products()
         if self.includes_all_products:
             return None
+        if self.uses_product_index:
+            product_ids, __ = self._product_index()
+            return len(product_ids)
         return self.all_products().count()
 
     def all_products(self):
@@ -991,6 +1027,8 @@ class AbstractRange(models.Model):
             # Filter out child products
             return Product.browsable.all()
 
+        # The product index isn't used here, as filtering on the ids of all
+        # the products of a large range would make for huge queries
         return Product.objects.filter(
             Q(id__in=self._included_product_ids()) |
             Q(product_class_id__in=self._class_ids()) |
@@ -1,13 +1,12 @@
 from django.conf.urls import url
 
-from oscar.core.application import Application
-from oscar.core.loading import get_class
+from oscar.core.application import Application, LazyView
 
 
 class OfferApplication(Application):
     name = 'offer'
-    detail_view = get_class('offer.views', 'OfferDetailView')
-    list_view = get_class('offer.views', 'OfferListView')
+    detail_view = LazyView('offer.views', 'OfferDetailView')
+    list_view = LazyView('offer.views', 'OfferListView')
 
     def get_urls(self):
         urls = [
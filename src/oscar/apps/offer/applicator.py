@@ -1,10 +1,16 @@
 import logging
 from itertools import chain
 
-from oscar.core.loading import get_class, get_model
+from django.conf import settings
+
+from oscar.core.loading import get_class, get_classes, get_model
 
 logger = logging.getLogger('oscar.offers')
-OfferApplications = get_class('offer.results', 'OfferApplications')
+OfferApplications, OfferApplicationSnapshot, OfferApplicationTrace \
+    = get_classes('offer.results', ['OfferApplications',
+                                    'OfferApplicationSnapshot',
+                                    'OfferApplicationTrace'])
+site_offer_cache = get_class('offer.cache', 'site_offer_cache')
 
 
 class OfferApplicationError(Exception):
@@ -19,30 +25,143 @@ class Applicator(object):
 
         The request is passed too as sometimes the available offers
         are dependent on the user (eg session-based offers).
+
+        If ``OSCAR_OFFER_APPLICATION_SNAPSHOTS`` is set, the results are
+        stored, and restored instead of applied again for as long as the
+        basket, its prices and the offers stay the same.
         """
         offers = self.get_offers(basket, user, request)
-        self.apply_offers(basket, offers)
+        snapshot = None
+        if settings.OSCAR_OFFER_APPLICATION_SNAPSHOTS and basket.id \
+                and all(offer.id for offer in offers):
+            snapshot = OfferApplicationSnapshot(basket, offers)
+            if snapshot.restore():
+                return
+        if settings.OSCAR_OFFER_INCREMENTAL_APPLICATION:
+            self.apply_offers_incrementally(basket, offers)
+        else:
+            self.apply_offers(basket, offers)
+        if snapshot is not None:
+            snapshot.save()
 
     def apply_offers(self, basket, offers):
         applications = OfferApplications()
         for offer in offers:
-            num_applications = 0
-            # Keep applying the offer until either
-            # (a) We reach the max number of applications for the offer.
-            # (b) The benefit can't be applied successfully.
-            while num_applications < offer.get_max_applications(basket.owner):
-                result = offer.apply_benefit(basket)
-                num_applications += 1
-                if not result.is_successful:
-                    break
+            max_applications = offer.get_max_applications(basket.owner)
+            for result in self.apply_offer(basket, offer, max_applications):
                 applications.add(offer, result)
-                if result.is_final:
-                    break
 
         # Store this list of discounts with the basket so it can be
         # rendered in templates
         basket.offer_applications = applications
 
+    def apply_offer(self, basket, offer, max_applications):
+        """
+        Apply a single offer to the basket and return the list of successful
+        results
+        """
+        results = []
+        # Keep applying the offer until either
+        # (a) We reach the max number of applications for the offer.
+        # (b) The benefit can't be applied successfully.
+        while len(results) < max_applications:
+            result = offer.apply_benefit(basket)
+            if not result.is_successful:
+                break
+            results.append(result)
+            if result.is_final:
+                break
+        return results
+
+    def apply_offers_incrementally(self, basket, offers):
+        """
+        Apply offers to the basket, only re-evaluating the offers affected by
+        changes to the lines since the previous pass over this basket.
+
+        Offers only interact with each other through the lines they consume,
+        so an offer can be replayed from the previous pass as long as none of
+        the lines it can use were changed, either by the customer or by an
+        offer that had to be re-evaluated.  Once the offers don't line up
+        with the previous pass anymore (eg a voucher was added or the
+        priorities changed), all remaining offers are evaluated.
+        """
+        lines = list(basket.all_lines())
+        for line in lines:
+            line.clear_discount()
+        previous = basket.offer_application_trace
+        trace = OfferApplicationTrace(lines)
+        applications = OfferApplications()
+
+        all_line_ids = set(line.id for line in lines)
+        if previous is None:
+            dirty_line_ids = all_line_ids
+            changed_lines = lines
+        else:
+            dirty_line_ids = previous.get_changed_line_ids(trace)
+            changed_lines = [
+                line for line in lines if line.id in dirty_line_ids]
+        can_replay = previous is not None
+
+        for index, offer in enumerate(offers):
+            max_applications = offer.get_max_applications(basket.owner)
+            step = None
+            if can_replay:
+                step = previous.get_step(index, offer, max_applications)
+                can_replay = step is not None
+            if step is not None and not self.is_offer_affected(
+                    offer, step, changed_lines, dirty_line_ids):
+                for line in lines:
+                    if line.id in step['line_states']:
+                        line.set_offer_state(step['line_states'][line.id])
+                results = step['results']
+                trace.steps.append(step)
+            else:
+                results = self.apply_offer(basket, offer, max_applications)
+                line_ids = self.get_offer_line_ids(offer, lines)
+                # Any line the offer could use may have been consumed
+                # differently, so offers using the same lines have to be
+                # re-evaluated too.
+                dirty_line_ids |= all_line_ids if line_ids is None else line_ids
+                trace.add_step(
+                    offer, max_applications, line_ids, results, lines)
+            for result in results:
+                applications.add(offer, result)
+
+        basket.offer_applications = applications
+        basket.offer_application_trace = trace
+
+    def is_offer_affected(self, offer, step, changed_lines, dirty_line_ids):
+        """
+        Test whether an offer has to be re-evaluated rather than replayed
+        from its recorded step
+        """
+        if step['line_ids'] is None:
+            # The offer can depend on any line
+            return bool(dirty_line_ids)
+        if step['line_ids'] & dirty_line_ids:
+            return True
+        # Changed lines may have become usable by the offer
+        line_ids = self.get_offer_line_ids(offer, changed_lines)
+        return line_ids is None or bool(line_ids)
+
+    def get_offer_line_ids(self, offer, lines):
+        """
+        Return the ids of the passed lines which the offer's condition or
+        benefit can use, or None if that can't be determined (eg for custom
+        conditions and benefits, which can look at the whole basket).
+        """
+        condition, benefit = offer.condition, offer.benefit
+        if condition.proxy_class or benefit.proxy_class:
+            return None
+        if condition.range is None:
+            return None
+        ranges = [condition.range]
+        if benefit.range is not None:
+            ranges.append(benefit.range)
+        return set(
+            line.id for line in lines
+            if any(r.contains_product(line.product) for r in ranges))
+
     def get_offers(self, basket, user=None, request=None):
         """
         Return all offers to apply to the basket.
@@ -63,7 +182,12 @@ class Applicator(object):
     def get_site_offers(self):
         """
         Return site offers that are available to all users
+
+        If ``OSCAR_OFFER_CACHE_ENABLED`` is set, the offers are served from
+        an in-memory cache which is invalidated whenever offers change.
         """
+        if settings.OSCAR_OFFER_CACHE_ENABLED:
+            return site_offer_cache.get_offers()
         ConditionalOffer = get_model('offer', 'ConditionalOffer')
         qs = ConditionalOffer.active.filter(offer_type=ConditionalOffer.SITE)
         # Using select_related with the condition/benefit ranges doesn't seem
@@ -0,0 +1,209 @@
+import copy
+from array import array
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils.crypto import get_random_string
+from django.utils.timezone import now
+
+from oscar.core.loading import get_model
+
+
+class SiteOfferCache(object):
+    """
+    Keeps the fully loaded site offers (with their conditions, benefits,
+    ranges and proxy instances) in memory for the current process.
+
+    The loaded offers are tagged with a version stored in Django's cache. The
+    version is changed whenever an offer, condition, benefit or range is
+    modified (see ``offer.signals``), which makes every process reload its
+    offers on the next lookup.  Between changes, fetching the site offers
+    only costs a single cache lookup.
+    """
+    version_key = 'oscar_site_offers_version'
+    offers_key = 'oscar_site_offers_%s'
+
+    def __init__(self):
+        # The version and the offers are stored together so that they can be
+        # swapped atomically when several threads share this instance.
+        self._state = (None, [])
+
+    def get_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            version = self.invalidate()
+        return version
+
+    def invalidate(self):
+        """
+        Change the shared version, forcing all processes to reload offers
+        """
+        version = get_random_string(12)
+        cache.set(self.version_key, version, None)
+        return version
+
+    def get_offers(self, test_date=None):
+        """
+        Return the site offers that are active at the passed date
+        """
+        version = self.get_version()
+        local_version, offers = self._state
+        if version != local_version:
+            offers = self.load(version)
+            self._state = (version, offers)
+        if test_date is None:
+            test_date = now()
+        # The loaded offers are shared by all the threads of the process, and
+        # must not be changed; each caller gets its own copies, which memoise
+        # the product ids of their ranges and record their usage.
+        ranges = {}
+        return [self.copy(offer, ranges) for offer in offers
+                if self.is_active(offer, test_date)]
+
+    def load(self, version):
+        key = self.offers_key % version
+        offers = cache.get(key)
+        if offers is None:
+            offers = [self.hydrate(offer) for offer in self.get_queryset()]
+            cache.set(key, offers, settings.OSCAR_OFFER_CACHE_TIMEOUT)
+        return offers
+
+    def get_queryset(self):
+        """
+        Return the open site offers that haven't expired yet.
+
+        Offers which start in the future are included; the start and end dates
+        are checked again every time the offers are fetched.
+        """
+        ConditionalOffer = get_model('offer', 'ConditionalOffer')
+        return ConditionalOffer.objects.filter(
+            Q(end_datetime__gte=now()) | Q(end_datetime=None),
+            offer_type=ConditionalOffer.SITE,
+            status=ConditionalOffer.OPEN,
+        ).select_related(
+            'condition', 'condition__range', 'benefit', 'benefit__range')
+
+    def hydrate(self, offer):
+        """
+        Replace the condition and benefit of the offer by their proxy
+        instances, keeping hold of the already loaded ranges.
+        """
+        for field in ('condition', 'benefit'):
+            instance = getattr(offer, field)
+            proxy = instance.proxy()
+            if proxy is instance or not isinstance(proxy, type(instance)):
+                continue
+            proxy._state.adding = False
+            proxy._state.db = instance._state.db
+            proxy.range = instance.range
+            setattr(offer, field, proxy)
+        return offer
+
+    def copy(self, offer, ranges):
+        """
+        Return a copy of the offer, its condition, its benefit and their
+        ranges. The copies of the ranges are kept in the passed dict, so
+        offers copied together share them.
+        """
+        offer = copy_instance(offer)
+        for field in ('condition', 'benefit'):
+            instance = copy_instance(getattr(offer, field))
+            range = instance.range
+            if range is not None:
+                if range.pk not in ranges:
+                    ranges[range.pk] = copy_instance(range)
+                instance.range = ranges[range.pk]
+            setattr(offer, field, instance)
+        return offer
+
+    def is_active(self, offer, test_date):
+        if offer.start_datetime and offer.start_datetime > test_date:
+            return False
+        if offer.end_datetime and offer.end_datetime < test_date:
+            return False
+        return True
+
+
+class RangeProductIndex(object):
+    """
+    Stores the ids of the products contained in each range, so that testing
+    whether a product is part of a range doesn't need to query the database.
+
+    The ids of a range are computed once from its included products, product
+    classes and categories (including descendants), and kept in Django's
+    cache.  Changes to a range, and changes to the catalogue which can move
+    products in or out of it, only drop the ids of that range (see
+    ``offer.signals``).
+    """
+    version_key = 'oscar_range_index_version'
+    range_key = 'oscar_range_index_%s_%s'
+
+    def get_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            version = self.invalidate()
+        return version
+
+    def invalidate(self):
+        """
+        Drop the product ids of all ranges
+        """
+        version = get_random_string(12)
+        cache.set(self.version_key, version, None)
+        return version
+
+    def invalidate_range(self, range_id):
+        """
+        Drop the product ids of a single range
+        """
+        cache.delete(self.range_key % (range_id, self.get_version()))
+
+    def get(self, range):
+        """
+        Return a tuple of sets of the product ids contained in the passed
+        range and of the product ids excluded from it.
+        """
+        key = self.range_key % (range.id, self.get_version())
+        data = cache.get(key)
+        if data is None:
+            product_ids, excluded_ids = self.build(range)
+            # Arrays of ints are much more compact than pickled sets
+            data = (array('l', sorted(product_ids)),
+                    array('l', sorted(excluded_ids)))
+            cache.set(key, data, settings.OSCAR_OFFER_CACHE_TIMEOUT)
+        return frozenset(data[0]), frozenset(data[1])
+
+    def build(self, range):
+        """
+        Compute the product ids of a range the same way as
+        ``Range.all_products`` does.
+        """
+        Product = get_model('catalogue', 'Product')
+        product_ids = set(range._included_product_ids())
+        class_ids = list(range._class_ids())
+        category_ids = range._category_ids()
+        if class_ids or category_ids:
+            product_ids.update(Product.objects.filter(
+                Q(product_class_id__in=class_ids) |
+                Q(productcategory__category_id__in=category_ids)
+            ).values_list('pk', flat=True))
+        excluded_ids = set(range._excluded_product_ids())
+        return product_ids - excluded_ids, excluded_ids
+
+
+def copy_instance(instance):
+    """
+    Return a shallow copy of a model instance which doesn't share the cache of
+    its related objects with the original
+    """
+    clone = instance.__class__.__new__(instance.__class__)
+    clone.__dict__.update(instance.__dict__)
+    clone._state = copy.copy(instance._state)
+    if 'fields_cache' in instance._state.__dict__:
+        clone._state.fields_cache = dict(instance._state.fields_cache)
+    return clone
+
+
+site_offer_cache = SiteOfferCache()
+range_product_index = RangeProductIndex()
@@ -1,5 +1,13 @@
+import hashlib
 from decimal import Decimal as D
 
+from django.conf import settings
+from django.core.cache import cache
+
+from oscar.core.loading import get_class
+
+site_offer_cache = get_class('offer.cache', 'site_offer_cache')
+
 
 class OfferApplications(object):
     """
@@ -179,3 +187,145 @@ class PostOrderAction(ApplicationResult):
 
     def __init__(self, description):
         self.description = description
+
+
+class OfferApplicationTrace(object):
+    """
+    A record of a pass of the offer applicator over a basket.
+
+    For every line, it stores what the offers depend on (product, stock
+    record, quantity and price).  For every offer, in the order they were
+    applied, it stores the ids of the lines the offer can use, its results
+    and the state of those lines after the offer was applied.  This allows
+    the applicator to replay offers that aren't affected by a change to the
+    basket instead of applying them again.
+    """
+
+    def __init__(self, lines):
+        self.line_signatures = dict(
+            (line.id, self.get_line_signature(line)) for line in lines)
+        self.steps = []
+
+    def get_line_signature(self, line):
+        return (line.product_id, line.stockrecord_id, line.quantity,
+                line.unit_effective_price)
+
+    def get_changed_line_ids(self, other):
+        """
+        Return the ids of lines that were added, removed or changed between
+        this trace and the passed one
+        """
+        line_ids = set(self.line_signatures) | set(other.line_signatures)
+        return set(
+            line_id for line_id in line_ids
+            if self.line_signatures.get(line_id)
+            != other.line_signatures.get(line_id))
+
+    def add_step(self, offer, max_applications, line_ids, results, lines):
+        """
+        Record the application of an offer.  ``line_ids`` is None if the
+        lines the offer can use are unknown, in which case the offer is
+        assumed to depend on all lines.
+        """
+        line_states = dict(
+            (line.id, line.get_offer_state()) for line in lines
+            if line_ids is None or line.id in line_ids)
+        self.steps.append({
+            'offer_id': offer.id,
+            'max_applications': max_applications,
+            'line_ids': line_ids,
+            'results': results,
+            'line_states': line_states})
+
+    def get_step(self, index, offer, max_applications):
+        """
+        Return the recorded step for the offer at the passed position, or
+        None if a different offer was applied at that position.
+        """
+        if offer.id is None or index >= len(self.steps):
+            return None
+        step = self.steps[index]
+        if (step['offer_id'] != offer.id
+                or step['max_applications'] != max_applications):
+            return None
+        return step
+
+
+class OfferApplicationSnapshot(object):
+    """
+    The result of applying offers to a basket, stored in Django's cache.
+
+    The snapshot is tagged with a fingerprint of everything the offer
+    applications depend on: the basket's owner and lines (including their
+    current prices), the offers being applied along with their vouchers, and
+    the version of the offers, ranges and catalogue.  As long as the
+    fingerprint doesn't change, the snapshot can be restored instead of
+    applying the offers again.
+    """
+    key = 'oscar_basket_offers_%s'
+
+    def __init__(self, basket, offers):
+        self.basket = basket
+        self.offers = offers
+        self.fingerprint = self.get_fingerprint()
+
+    def get_fingerprint(self):
+        lines = [(line.id, line.product_id, line.stockrecord_id,
+                  line.quantity) + self.get_price_signature(line)
+                 for line in self.basket.all_lines()]
+        offers = [(offer.id, getattr(offer.get_voucher(), 'id', None))
+                  for offer in self.offers]
+        parts = (self.basket.owner_id, site_offer_cache.get_version(),
+                 lines, offers)
+        return hashlib.sha1(repr(parts).encode('utf8')).hexdigest()
+
+    def get_price_signature(self, line):
+        price = line.purchase_info.price
+        incl_tax = price.incl_tax if price.is_tax_known else None
+        return (price.currency, price.excl_tax, incl_tax,
+                price.effective_price)
+
+    def get_cache_key(self):
+        return self.key % self.basket.id
+
+    def restore(self):
+        """
+        Restore the offer applications and line discounts onto the basket.
+        Returns False if there is no snapshot or if it is out of date.
+        """
+        data = cache.get(self.get_cache_key())
+        if data is None or data['fingerprint'] != self.fingerprint:
+            return False
+        offers = dict((offer.id, offer) for offer in self.offers)
+        for line in self.basket.all_lines():
+            line.set_offer_data(data['lines'][line.id], offers)
+
+        applications = OfferApplications()
+        for offer_id, application in data['applications']:
+            offer = offers[offer_id]
+            application.update({
+                'offer': offer,
+                'name': offer.name,
+                'voucher': offer.get_voucher()})
+            applications.applications[offer_id] = application
+        self.basket.offer_applications = applications
+        return True
+
+    def save(self):
+        """
+        Store the offer applications and line discounts of the basket
+        """
+        lines = dict((line.id, line.get_offer_data())
+                     for line in self.basket.all_lines())
+        applications = [
+            (offer_id, {'result': application['result'],
+                        'description': application['description'],
+                        'freq': application['freq'],
+                        'discount': application['discount']})
+            for offer_id, application
+            in self.basket.offer_applications.applications.items()]
+        cache.set(self.get_cache_key(), {
+            'fingerprint': self.fingerprint,
+            'lines': lines,
+            'applications': applications,
+        }, settings.OSCAR_OFFER_CACHE_TIMEOUT)
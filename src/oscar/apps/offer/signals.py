@@ -1,11 +1,23 @@
-from django.db.models.signals import post_delete
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_save)
 from django.dispatch import receiver
 
-from oscar.core.loading import get_model
+from oscar.apps.catalogue.signals import category_moved
+from oscar.core.loading import get_classes, get_model
 
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
 Condition = get_model('offer', 'Condition')
 Benefit = get_model('offer', 'Benefit')
+Range = get_model('offer', 'Range')
+RangeProduct = get_model('offer', 'RangeProduct')
+Category = get_model('catalogue', 'Category')
+Product = get_model('catalogue', 'Product')
+ProductCategory = get_model('catalogue', 'ProductCategory')
+site_offer_cache, range_product_index = get_classes(
+    'offer.cache', ['site_offer_cache', 'range_product_index'])
 
 
 @receiver(post_delete, sender=ConditionalOffer)
@@ -25,3 +37,186 @@ def delete_unused_related_conditions_and_benefits(instance, **kwargs):
     benefit_is_not_custom = benefit.proxy_class == ''
     if benefit_is_not_custom and benefit_is_unique:
         benefit.delete()
+
+
+def invalidate_site_offer_cache(**kwargs):
+    # Wait for the transaction to be committed, so that other processes can't
+    # reload the offers before the change is visible to them.
+    transaction.on_commit(site_offer_cache.invalidate)
+
+
+def invalidate_range_product_index(range_id=None):
+    # The ids are dropped straight away so the current process doesn't use
+    # stale data, and again after the commit in case another process rebuilt
+    # them from the old data in the meantime.
+    if range_id is None:
+        invalidate = range_product_index.invalidate
+    else:
+        def invalidate():
+            range_product_index.invalidate_range(range_id)
+    invalidate()
+    transaction.on_commit(invalidate)
+    # Cached site offers hold on to the product ids of their ranges
+    invalidate_site_offer_cache()
+
+
+def invalidate_ranges(range_ids):
+    """
+    Drop the product ids of the ranges with the passed ids. The site offers
+    are only reloaded if there are any.
+    """
+    for range_id in set(range_ids):
+        invalidate_range_product_index(range_id)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_site_offers_on_change(sender, **kwargs):
+    # Conditions and benefits are often saved through their proxy classes,
+    # which are sent as the signal sender, so we can't filter on the sender.
+    if issubclass(sender, (ConditionalOffer, Condition, Benefit)):
+        invalidate_site_offer_cache()
+
+
+@receiver(post_save, sender=Range)
+@receiver(post_delete, sender=Range)
+def invalidate_range_on_change(instance, **kwargs):
+    invalidate_range_product_index(instance.id)
+
+
+@receiver(post_save, sender=RangeProduct)
+@receiver(post_delete, sender=RangeProduct)
+def invalidate_range_on_range_product_change(instance, **kwargs):
+    invalidate_range_product_index(instance.range_id)
+
+
+def invalidate_range_on_m2m_change(instance, action, reverse, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse and kwargs['pk_set'] is None:
+        # Eg product.excludes.clear(); the ranges aren't known, so simply
+        # drop all of them
+        invalidate_range_product_index()
+    elif reverse:
+        # Eg product.excludes.add(range)
+        invalidate_ranges(kwargs['pk_set'])
+    else:
+        invalidate_range_product_index(instance.id)
+
+
+for through in (Range.excluded_products.through, Range.classes.through,
+                Range.included_categories.through):
+    m2m_changed.connect(invalidate_range_on_m2m_change, sender=through)
+
+
+def get_product_range_ids(product_class_ids, product_ids):
+    """
+    Return the ids of the ranges which include or exclude any of the passed
+    products (children are part of the ranges of their parent), or which
+    include any of the passed product classes.
+    """
+    product_ids = [pk for pk in product_ids if pk is not None]
+    product_class_ids = [pk for pk in product_class_ids if pk is not None]
+    ExcludedProduct = Range.excluded_products.through
+    RangeClass = Range.classes.through
+    query = (
+        Q(pk__in=RangeProduct.objects.filter(
+            product_id__in=product_ids).values('range_id'))
+        | Q(pk__in=ExcludedProduct.objects.filter(
+            product_id__in=product_ids).values('range_id'))
+        | Q(pk__in=RangeClass.objects.filter(
+            productclass_id__in=product_class_ids).values('range_id')))
+    return Range.objects.filter(query).values_list('pk', flat=True)
+
+
+def get_category_range_ids(paths):
+    """
+    Return the ids of the ranges which include any of the categories with
+    the passed materialised paths, or any of their ancestors.
+    """
+    ancestor_paths = set()
+    for path in paths:
+        ancestor_paths.update(
+            path[:length] for length
+            in range(Category.steplen, len(path) + 1, Category.steplen))
+    return Range.objects.filter(
+        included_categories__path__in=ancestor_paths).values_list(
+            'pk', flat=True)
+
+
+@receiver(pre_save, sender=Product)
+def record_product_range_fields(instance, **kwargs):
+    if not settings.OSCAR_RANGE_INDEX_ENABLED:
+        return
+    # Keep the fields that decide which ranges the product belongs to, so
+    # the ranges only need to be rebuilt when one of them changes.
+    instance._original_range_fields = None
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and not set(update_fields).intersection(
+            ['product_class', 'product_class_id', 'parent', 'parent_id']):
+        instance._original_range_fields = (
+            instance.product_class_id, instance.parent_id)
+    elif instance.pk:
+        instance._original_range_fields = Product.objects.filter(
+            pk=instance.pk).values_list(
+                'product_class_id', 'parent_id').first()
+
+
+@receiver(post_save, sender=Product)
+def invalidate_ranges_on_product_save(instance, created, **kwargs):
+    if not settings.OSCAR_RANGE_INDEX_ENABLED:
+        return
+    fields = (instance.product_class_id, instance.parent_id)
+    original_fields = getattr(instance, '_original_range_fields', None)
+    if created or original_fields is None:
+        original_fields = fields
+    elif original_fields == fields:
+        return
+    invalidate_ranges(get_product_range_ids(
+        [fields[0], original_fields[0]],
+        [instance.pk, fields[1], original_fields[1]]))
+
+
+@receiver(post_delete, sender=Product)
+def invalidate_ranges_on_product_delete(instance, **kwargs):
+    if not settings.OSCAR_RANGE_INDEX_ENABLED:
+        return
+    # The ranges of the categories of the product are dropped when its
+    # product categories are deleted
+    invalidate_ranges(get_product_range_ids(
+        [instance.product_class_id], [instance.pk, instance.parent_id]))
+
+
+@receiver(pre_save, sender=ProductCategory)
+def record_product_category(instance, **kwargs):
+    if not settings.OSCAR_RANGE_INDEX_ENABLED:
+        return
+    # The category of a product category can be changed in the dashboard
+    instance._original_category_id = None
+    if instance.pk:
+        instance._original_category_id = ProductCategory.objects.filter(
+            pk=instance.pk).values_list('category_id', flat=True).first()
+
+
+@receiver(post_save, sender=ProductCategory)
+@receiver(post_delete, sender=ProductCategory)
+def invalidate_ranges_on_product_category_change(instance, **kwargs):
+    if not settings.OSCAR_RANGE_INDEX_ENABLED:
+        return
+    category_ids = [instance.category_id,
+                    getattr(instance, '_original_category_id', None)]
+    paths = Category.objects.filter(pk__in=category_ids).values_list(
+        'path', flat=True)
+    invalidate_ranges(get_category_range_ids(paths))
+
+
+@receiver(category_moved, sender=Category)
+def invalidate_ranges_on_category_move(instance, **kwargs):
+    if not settings.OSCAR_RANGE_INDEX_ENABLED:
+        return
+    # Treebeard doesn't update the path of the moved instance, so it holds
+    # the path before the move
+    paths = [instance.path]
+    paths.extend(Category.objects.filter(pk=instance.pk).values_list(
+        'path', flat=True))
+    invalidate_ranges(get_category_range_ids(paths))
@@ -1182,3 +1182,23 @@ class AbstractOrderDiscount(models.Model):
         if self.voucher_code:
             return self.voucher_code
         return self.offer_name or u""
+
+
+@python_2_unicode_compatible
+class AbstractOrderNumberSequence(models.Model):
+    """
+    A counter used to reserve blocks of order numbers.
+
+    See ``SequenceOrderNumberGenerator``.
+    """
+    name = models.CharField(_("Name"), max_length=128, unique=True)
+    last_value = models.BigIntegerField(_("Last value"), default=0)
+
+    class Meta:
+        abstract = True
+        app_label = 'order'
+        verbose_name = _("Order number sequence")
+        verbose_name_plural = _("Order number sequences")
+
+    def __str__(self):
+        return "%s (%d)" % (self.name, self.last_value)
@@ -0,0 +1,26 @@
+# Generated by Django 2.1.2 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0010_auto_20190221_0347'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderNumberSequence',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=128, unique=True, verbose_name='Name')),
+                ('last_value', models.BigIntegerField(default=0, verbose_name='Last value')),
+            ],
+            options={
+                'verbose_name': 'Order number sequence',
+                'verbose_name_plural': 'Order number sequences',
+                'abstract': False,
+            },
+        ),
+    ]
@@ -1,18 +1,28 @@
+import threading
 from decimal import Decimal as D
+from functools import partial
 
 from django.conf import settings
 from django.contrib.sites.models import Site
-from django.db import transaction
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_save, pre_save
 from django.utils.translation import ugettext_lazy as _
 
 from oscar.apps.order.signals import order_placed
-from oscar.core.loading import get_model
+from oscar.apps.partner.abstract_models import AbstractStockRecord
+from oscar.core.loading import get_class, get_model
 
 from . import exceptions
 
 Order = get_model('order', 'Order')
 Line = get_model('order', 'Line')
+LinePrice = get_model('order', 'LinePrice')
+LineAttribute = get_model('order', 'LineAttribute')
 OrderDiscount = get_model('order', 'OrderDiscount')
+OrderNumberSequence = get_model('order', 'OrderNumberSequence')
+StockRecord = get_model('partner', 'StockRecord')
 
 
 class OrderNumberGenerator(object):
@@ -30,10 +40,91 @@ class OrderNumberGenerator(object):
         return 100000 + basket.id
 
 
+class SequenceOrderNumberGenerator(OrderNumberGenerator):
+    """
+    Generates order numbers from a counter stored in the database.
+
+    Numbers are reserved in blocks of ``OSCAR_ORDER_NUMBER_BLOCK_SIZE``, and
+    each process hands out the numbers of its current block without querying
+    the database. The numbers are unique across processes and servers, but
+    aren't necessarily consecutive or in the order the orders were placed,
+    and the unused numbers of a block are lost when a process exits.
+
+    When a block is reserved inside a transaction, its first number is used
+    straight away and the rest of the block is only kept once the
+    transaction commits, as rolling it back also gives the block back to
+    other processes. The counter row is locked until the transaction ends.
+
+    To use this generator, fork the order app and subclass it as
+    ``OrderNumberGenerator`` in its ``utils`` module.
+    """
+    sequence_name = 'order'
+
+    # The number of times the counter is read again when another process
+    # creates it at the same time
+    max_attempts = 3
+
+    # Blocks of each sequence reserved by this process, as [next, last] lists
+    _blocks = {}
+    _lock = threading.Lock()
+
+    def order_number(self, basket):
+        return settings.OSCAR_ORDER_NUMBER_FORMAT % self.next_value()
+
+    def next_value(self):
+        using = router.db_for_write(OrderNumberSequence)
+        with self._lock:
+            block = self._blocks.get(self.sequence_name)
+            if block is not None and block[0] <= block[1]:
+                value = block[0]
+                block[0] += 1
+                return value
+            first, last = self.reserve_block(
+                settings.OSCAR_ORDER_NUMBER_BLOCK_SIZE, using)
+        if first < last:
+            # Runs straight away outside of a transaction
+            transaction.on_commit(
+                partial(self.keep_block, first + 1, last), using=using)
+        return first
+
+    def keep_block(self, first, last):
+        with self._lock:
+            self._blocks[self.sequence_name] = [first, last]
+
+    def reserve_block(self, size, using):
+        """
+        Return the first and last number of a newly reserved block
+        """
+        manager = OrderNumberSequence._default_manager.db_manager(using)
+        queryset = manager.filter(name=self.sequence_name)
+        for attempt in range(self.max_attempts):
+            try:
+                with transaction.atomic(using=using):
+                    if not queryset.update(last_value=F('last_value') + size):
+                        manager.create(
+                            name=self.sequence_name,
+                            last_value=(
+                                settings.OSCAR_ORDER_NUMBER_START + size - 1))
+                    last_value = queryset.values_list(
+                        'last_value', flat=True).get()
+            except IntegrityError:
+                # The counter may have been created by another process, in
+                # which case it can be updated on the next attempt
+                if attempt == self.max_attempts - 1:
+                    raise
+                continue
+            return last_value - size + 1, last_value
+
+
 class OrderCreator(object):
     """
     Places the order by writing out the various models
     """
+    # The methods which aren't called when orders are placed in bulk
+    single_item_methods = (
+        'create_line_models', 'create_line_price_models',
+        'create_line_attributes', 'update_stock_records',
+        'create_discount_model')
 
     def place_order(self, basket, total,  # noqa (too complex (12))
                     shipping_method, shipping_charge, user=None,
@@ -46,58 +137,92 @@ class OrderCreator(object):
         if basket.is_empty:
             raise ValueError(_("Empty baskets cannot be submitted"))
         if not order_number:
-            generator = OrderNumberGenerator()
+            generator = get_class('order.utils', 'OrderNumberGenerator')()
             order_number = generator.order_number(basket)
         if not status and hasattr(settings, 'OSCAR_INITIAL_ORDER_STATUS'):
             status = getattr(settings, 'OSCAR_INITIAL_ORDER_STATUS')
 
-        if Order._default_manager.filter(number=order_number).exists():
-            raise ValueError(_("There is already an order with number %s")
-                             % order_number)
-
-        with transaction.atomic():
-
-            # Ok - everything seems to be in order, let's place the order
-            order = self.create_order_model(
-                user, basket, shipping_address, shipping_method, shipping_charge,
-                billing_address, total, order_number, status, request, **kwargs)
-            for line in basket.all_lines():
-                self.create_line_models(order, line)
-                self.update_stock_records(line)
-
-            for voucher in basket.vouchers.select_for_update():
-                available_to_user, msg = voucher.is_available_to_user(user=user)
-                if not voucher.is_active() or not available_to_user:
-                    raise ValueError(msg)
-
-            # Record any discounts associated with this order
-            for application in basket.offer_applications:
-                # Trigger any deferred benefits from offers and capture the
-                # resulting message
-                application['message'] \
-                    = application['offer'].apply_deferred_benefit(basket, order,
-                                                                  application)
-                # Record offer application results
-                if application['result'].affects_shipping:
-                    # Skip zero shipping discounts
-                    shipping_discount = shipping_method.discount(basket)
-                    if shipping_discount <= D('0.00'):
-                        continue
-                    # If a shipping offer, we need to grab the actual discount off
-                    # the shipping method instance, which should be wrapped in an
-                    # OfferDiscount instance.
-                    application['discount'] = shipping_discount
-                self.create_discount_model(order, application)
-                self.record_discount(application)
-
-            for voucher in basket.vouchers.all():
-                self.record_voucher_usage(order, voucher, user)
+        try:
+            with transaction.atomic():
+
+                # Ok - everything seems to be in order, let's place the order
+                order = self.create_order_model(
+                    user, basket, shipping_address, shipping_method,
+                    shipping_charge, billing_address, total, order_number,
+                    status, request, **kwargs)
+                bulk = self.can_place_in_bulk()
+                if bulk:
+                    lines = list(basket.all_lines())
+                    self.create_all_line_models(order, lines)
+                    self.update_all_stock_records(lines)
+                else:
+                    for line in basket.all_lines():
+                        self.create_line_models(order, line)
+                        self.update_stock_records(line)
+
+                for voucher in basket.vouchers.select_for_update():
+                    available_to_user, msg = voucher.is_available_to_user(
+                        user=user)
+                    if not voucher.is_active() or not available_to_user:
+                        raise ValueError(msg)
+
+                # Record any discounts associated with this order
+                discounts = []
+                for application in basket.offer_applications:
+                    # Trigger any deferred benefits from offers and capture the
+                    # resulting message
+                    application['message'] \
+                        = application['offer'].apply_deferred_benefit(
+                            basket, order, application)
+                    # Record offer application results
+                    if application['result'].affects_shipping:
+                        # Skip zero shipping discounts
+                        shipping_discount = shipping_method.discount(basket)
+                        if shipping_discount <= D('0.00'):
+                            continue
+                        # If a shipping offer, we need to grab the actual
+                        # discount off the shipping method instance, which
+                        # should be wrapped in an OfferDiscount instance.
+                        application['discount'] = shipping_discount
+                    if bulk:
+                        discounts.append(
+                            self.get_discount_model(order, application))
+                    else:
+                        self.create_discount_model(order, application)
+                    self.record_discount(application)
+                self.bulk_create(OrderDiscount, discounts)
+
+                for voucher in basket.vouchers.all():
+                    self.record_voucher_usage(order, voucher, user)
+        except IntegrityError:
+            # Rely on the unique constraint of the order number rather than
+            # checking for an existing order before every insert.
+            if Order._default_manager.filter(number=order_number).exists():
+                raise ValueError(_("There is already an order with number %s")
+                                 % order_number)
+            raise
 
         # Send signal for analytics to pick up
         order_placed.send(sender=self, order=order, user=user)
 
         return order
 
+    def can_place_in_bulk(self):
+        """
+        Test whether the lines and discounts of orders can be created in
+        bulk, see ``OSCAR_ORDER_BULK_PLACEMENT``.
+
+        The bulk path doesn't call the methods creating the models of a
+        single line or discount, nor ``StockRecord.allocate``, so orders are
+        placed line by line if any of them is overridden.
+        """
+        if not settings.OSCAR_ORDER_BULK_PLACEMENT:
+            return False
+        for name in self.single_item_methods:
+            if getattr(type(self), name) != getattr(OrderCreator, name):
+                return False
+        return StockRecord.allocate == AbstractStockRecord.allocate
+
     def create_order_model(self, user, basket, shipping_address,
                            shipping_method, shipping_charge, billing_address,
                            total, order_number, status, request=None, **extra_order_fields):
@@ -134,6 +259,50 @@ class OrderCreator(object):
         You can set extra fields by passing a dictionary as the
         extra_line_fields value
         """
+        order_line = self.get_line_model(order, basket_line, extra_line_fields)
+        order_line.save()
+        self.create_line_price_models(order, order_line, basket_line)
+        self.create_line_attributes(order, order_line, basket_line)
+        self.create_additional_line_models(order, order_line, basket_line)
+
+        return order_line
+
+    def create_all_line_models(self, order, basket_lines):
+        """
+        Create the order lines for all basket lines, with their prices and
+        attributes, using as few queries as possible.
+
+        The models are created with ``bulk_create``; the ``pre_save`` and
+        ``post_save`` signals are sent for each of them. On databases which
+        can't return the ids of bulk inserted rows, the lines themselves are
+        saved one by one.
+        """
+        order_lines = [self.get_line_model(order, basket_line)
+                       for basket_line in basket_lines]
+        connection = connections[router.db_for_write(Line)]
+        if connection.features.can_return_ids_from_bulk_insert:
+            self.bulk_create(Line, order_lines)
+        else:
+            for order_line in order_lines:
+                order_line.save()
+
+        prices, attributes = [], []
+        for order_line, basket_line in zip(order_lines, basket_lines):
+            prices.extend(
+                self.get_line_price_models(order, order_line, basket_line))
+            attributes.extend(
+                self.get_line_attribute_models(order, order_line, basket_line))
+        self.bulk_create(LinePrice, prices)
+        self.bulk_create(LineAttribute, attributes)
+
+        for order_line, basket_line in zip(order_lines, basket_lines):
+            self.create_additional_line_models(order, order_line, basket_line)
+        return order_lines
+
+    def get_line_model(self, order, basket_line, extra_line_fields=None):
+        """
+        Return an unsaved order line for the basket line
+        """
         product = basket_line.product
         stockrecord = basket_line.stockrecord
         if not stockrecord:
@@ -178,12 +347,7 @@ class OrderCreator(object):
         if extra_line_fields:
             line_data.update(extra_line_fields)
 
-        order_line = Line._default_manager.create(**line_data)
-        self.create_line_price_models(order, order_line, basket_line)
-        self.create_line_attributes(order, order_line, basket_line)
-        self.create_additional_line_models(order, order_line, basket_line)
-
-        return order_line
+        return Line(**line_data)
 
     def update_stock_records(self, line):
         """
@@ -192,6 +356,51 @@ class OrderCreator(object):
         if line.product.get_product_class().track_stock:
             line.stockrecord.allocate(line.quantity)
 
+    def update_all_stock_records(self, lines):
+        """
+        Allocate the stock for all order lines in a single update.
+
+        The stock records are locked in the order of their ids first, so that
+        concurrent checkouts sharing some stock records can't deadlock.
+        """
+        quantities, stockrecords = {}, {}
+        for line in lines:
+            stockrecord = line.stockrecord
+            if not stockrecord.can_track_allocations:
+                continue
+            quantities[stockrecord.pk] = (
+                quantities.get(stockrecord.pk, 0) + line.quantity)
+            stockrecords.setdefault(stockrecord.pk, []).append(stockrecord)
+        if not quantities:
+            return
+
+        using = router.db_for_write(StockRecord)
+        queryset = StockRecord._default_manager.using(using).filter(
+            pk__in=list(quantities))
+        list(queryset.select_for_update().order_by('pk').values_list(
+            'pk', flat=True))
+        for instances in stockrecords.values():
+            for stockrecord in instances:
+                pre_save.send(
+                    sender=StockRecord, instance=stockrecord, created=False,
+                    raw=False, using=using)
+        queryset.update(num_allocated=(
+            Coalesce(F('num_allocated'), Value(0)) + Case(
+                *[When(pk=pk, then=Value(quantity))
+                  for pk, quantity in quantities.items()],
+                default=Value(0), output_field=IntegerField())))
+
+        # Make sure the basket's stock records are up-to-date
+        for pk, instances in stockrecords.items():
+            for stockrecord in instances:
+                stockrecord.num_allocated = (
+                    stockrecord.num_allocated or 0) + quantities[pk]
+        for instances in stockrecords.values():
+            for stockrecord in instances:
+                post_save.send(
+                    sender=StockRecord, instance=stockrecord, created=False,
+                    raw=False, using=using)
+
     def create_additional_line_models(self, order, order_line, basket_line):
         """
         Empty method designed to be overridden.
@@ -206,23 +415,43 @@ class OrderCreator(object):
         """
         Creates the batch line price models
         """
+        for price in self.get_line_price_models(
+                order, order_line, basket_line):
+            price.save()
+
+    def get_line_price_models(self, order, order_line, basket_line):
+        """
+        Return the unsaved batch line price models
+        """
         breakdown = basket_line.get_price_breakdown()
-        for price_incl_tax, price_excl_tax, quantity in breakdown:
-            order_line.prices.create(
+        return [
+            LinePrice(
                 order=order,
+                line=order_line,
                 quantity=quantity,
                 price_incl_tax=price_incl_tax,
                 price_excl_tax=price_excl_tax)
+            for price_incl_tax, price_excl_tax, quantity in breakdown]
 
     def create_line_attributes(self, order, order_line, basket_line):
         """
         Creates the batch line attributes.
         """
-        for attr in basket_line.attributes.all():
-            order_line.attributes.create(
+        for attribute in self.get_line_attribute_models(
+                order, order_line, basket_line):
+            attribute.save()
+
+    def get_line_attribute_models(self, order, order_line, basket_line):
+        """
+        Return the unsaved batch line attributes
+        """
+        return [
+            LineAttribute(
+                line=order_line,
                 option=attr.option,
                 type=attr.option.code,
                 value=attr.value)
+            for attr in basket_line.attributes.all()]
 
     def create_discount_model(self, order, discount):
 
@@ -230,10 +459,19 @@ class OrderCreator(object):
         Create an order discount model for each offer application attached to
         the basket.
         """
+        order_discount = self.get_discount_model(order, discount)
+        order_discount.save()
+        return order_discount
+
+    def get_discount_model(self, order, discount):
+        """
+        Return an unsaved order discount model for an offer application
+        """
         order_discount = OrderDiscount(
             order=order,
             message=discount['message'] or '',
             offer_id=discount['offer'].id,
+            offer_name=discount['offer'].name,
             frequency=discount['freq'],
             amount=discount['discount'])
         result = discount['result']
@@ -245,7 +483,23 @@ class OrderCreator(object):
         if voucher:
             order_discount.voucher_id = voucher.id
             order_discount.voucher_code = voucher.code
-        order_discount.save()
+        return order_discount
+
+    def bulk_create(self, model, instances):
+        """
+        Insert the instances with a single query, sending the ``pre_save``
+        and ``post_save`` signals as if they had been saved one by one.
+        """
+        if not instances:
+            return
+        using = router.db_for_write(model)
+        for instance in instances:
+            pre_save.send(sender=model, instance=instance, raw=False,
+                          using=using, update_fields=None)
+        model._default_manager.using(using).bulk_create(instances)
+        for instance in instances:
+            post_save.send(sender=model, instance=instance, created=True,
+                           raw=False, using=using, update_fields=None)
 
     def record_discount(self, discount):
         discount['offer'].record_usage(discount)
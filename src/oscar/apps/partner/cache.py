@@ -0,0 +1,95 @@
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.crypto import get_random_string
+
+
+class ChildrenStockCache(object):
+    """
+    Keeps the stockrecords selected for the children of parent products in
+    Django's cache, so that the price and availability of a parent product
+    can be determined without loading all of its children.
+
+    The stockrecords are stored per parent product and strategy class, and
+    tagged with a version per parent product. The version is changed whenever
+    a child product or one of its stockrecords is saved or deleted (see
+    ``partner.receivers``).
+    """
+    version_key = 'oscar_children_stock_version_%s'
+    records_key = 'oscar_children_stock_%s_%s_%s'
+
+    def get_version(self, parent_id):
+        key = self.version_key % parent_id
+        version = cache.get(key)
+        if version is None:
+            version = self.invalidate(parent_id)
+        return version
+
+    def invalidate(self, parent_id):
+        """
+        Drop the stockrecords of the children of a parent product
+        """
+        version = get_random_string(12)
+        cache.set(self.version_key % parent_id, version, None)
+        return version
+
+    def get(self, strategy, product):
+        """
+        Return the list of (child, stockrecord) tuples selected by the
+        strategy for the children of the passed parent product
+        """
+        strategy_class = type(strategy)
+        key = self.records_key % (
+            product.pk, self.get_version(product.pk),
+            '%s.%s' % (strategy_class.__module__, strategy_class.__name__))
+        records = cache.get(key)
+        if records is None:
+            records = strategy.load_children_stockrecords(product)
+            cache.set(key, records, settings.OSCAR_CHILDREN_STOCK_CACHE_TIMEOUT)
+        else:
+            # Point the children at the passed parent instead of the copy that
+            # was stored with them.
+            for child, stockrecord in records:
+                child.parent = product
+        return records
+
+
+children_stock_cache = ChildrenStockCache()
+
+
+class PurchaseInfoCache(object):
+    """
+    Keeps the ``PurchaseInfo`` instances returned by a strategy, so that the
+    price and availability of a product are only determined once.
+
+    At most ``OSCAR_PURCHASE_INFO_CACHE_SIZE`` entries are kept, dropping the
+    oldest ones first. All entries are dropped once a stockrecord has been
+    saved or deleted in this process (see ``partner.receivers``), so that
+    long-lived strategies don't keep returning stale prices or stock levels.
+    """
+    #: Changed whenever a stockrecord is saved or deleted
+    stock_version = 0
+
+    def __init__(self):
+        self.clear()
+
+    def get(self, key, fetch):
+        if self.version != PurchaseInfoCache.stock_version:
+            self.clear()
+        if key not in self.entries:
+            self.entries[key] = fetch()
+            while len(self.entries) > settings.OSCAR_PURCHASE_INFO_CACHE_SIZE:
+                self.entries.popitem(last=False)
+        return self.entries[key]
+
+    def clear(self):
+        self.entries = OrderedDict()
+        self.version = PurchaseInfoCache.stock_version
+
+    @classmethod
+    def invalidate_all(cls):
+        """
+        Drop the entries of all instances
+        """
+        cls.stock_version += 1
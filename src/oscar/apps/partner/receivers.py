@@ -1,10 +1,16 @@
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from oscar.core.loading import get_classes
+from oscar.core.loading import get_class, get_classes, get_model
 
 StockRecord, StockAlert = get_classes('partner.models', ['StockRecord',
                                                          'StockAlert'])
+Product = get_model('catalogue', 'Product')
+children_stock_cache, PurchaseInfoCache = get_classes(
+    'partner.cache', ['children_stock_cache', 'PurchaseInfoCache'])
+product_facets = get_class('catalogue.facets', 'product_facets')
 
 
 @receiver(post_save, sender=StockRecord)
@@ -26,3 +32,46 @@ def update_stock_alerts(sender, instance, created, **kwargs):
                                   threshold=stockrecord.low_stock_threshold)
     elif not stockrecord.is_below_threshold and alert:
         alert.close()
+
+
+def invalidate_children_stock(parent_id):
+    # Drop the stockrecords straight away so the current process doesn't use
+    # stale data, and again after the commit in case another process cached
+    # the old data in the meantime.
+    def invalidate():
+        children_stock_cache.invalidate(parent_id)
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=StockRecord)
+@receiver(post_delete, sender=StockRecord)
+def invalidate_children_stock_for_stockrecord(sender, instance, **kwargs):
+    if not settings.OSCAR_CHILDREN_STOCK_CACHE_ENABLED:
+        return
+    parent_id = Product.objects.filter(
+        pk=instance.product_id).values_list('parent_id', flat=True).first()
+    if parent_id:
+        invalidate_children_stock(parent_id)
+
+
+@receiver(post_save, sender=StockRecord)
+@receiver(post_delete, sender=StockRecord)
+def invalidate_purchase_info(sender, instance, **kwargs):
+    if settings.OSCAR_PURCHASE_INFO_CACHE_ENABLED:
+        PurchaseInfoCache.invalidate_all()
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_children_stock_for_product(sender, instance, **kwargs):
+    if settings.OSCAR_CHILDREN_STOCK_CACHE_ENABLED and instance.parent_id:
+        invalidate_children_stock(instance.parent_id)
+
+
+@receiver(post_save, sender=StockRecord)
+@receiver(post_delete, sender=StockRecord)
+def update_product_facets(sender, instance, **kwargs):
+    # The price facet depends on the stockrecords
+    if settings.OSCAR_PRODUCT_FACETS_ENABLED and not kwargs.get('raw'):
+        product_facets.schedule_update(instance.product_id)
@@ -1,6 +1,9 @@
 from collections import namedtuple
 from decimal import Decimal as D
 
+from django.conf import settings
+from django.db.models import prefetch_related_objects
+
 from oscar.core.loading import get_class
 
 Unavailable = get_class('partner.availability', 'Unavailable')
@@ -9,6 +12,8 @@ StockRequiredAvailability = get_class('partner.availability', 'StockRequired')
 UnavailablePrice = get_class('partner.prices', 'Unavailable')
 FixedPrice = get_class('partner.prices', 'FixedPrice')
 TaxInclusiveFixedPrice = get_class('partner.prices', 'TaxInclusiveFixedPrice')
+children_stock_cache = get_class('partner.cache', 'children_stock_cache')
+PurchaseInfoCache = get_class('partner.cache', 'PurchaseInfoCache')
 
 # A container for policies
 PurchaseInfo = namedtuple(
@@ -60,6 +65,30 @@ class Base(object):
         self.user = None
         if request and request.user.is_authenticated:
             self.user = request.user
+        self._purchase_info_cache = PurchaseInfoCache()
+
+    def get_cached_purchase_info(self, key, fetch):
+        """
+        Return the ``PurchaseInfo`` stored under the passed key, calling
+        ``fetch`` to compute it if it isn't known yet.
+
+        Purchase info is only kept if ``OSCAR_PURCHASE_INFO_CACHE_ENABLED`` is
+        set, for the lifetime of the strategy instance (normally a single
+        request) or until a stockrecord is changed.
+        """
+        if key is None or not settings.OSCAR_PURCHASE_INFO_CACHE_ENABLED:
+            return fetch()
+        # Strategies overriding __init__ might not have set up the cache
+        if '_purchase_info_cache' not in self.__dict__:
+            self._purchase_info_cache = PurchaseInfoCache()
+        return self._purchase_info_cache.get(key, fetch)
+
+    def clear_purchase_info_cache(self):
+        """
+        Forget the purchase info computed so far, eg after stock levels have
+        been changed
+        """
+        self._purchase_info_cache = PurchaseInfoCache()
 
     def fetch_for_product(self, product, stockrecord=None):
         """
@@ -90,6 +119,46 @@ class Base(object):
             "information."
         )
 
+    def fetch_for_products(self, products):
+        """
+        Given a list of products, return a list of ``PurchaseInfo`` instances
+        in the same order, using ``fetch_for_parent`` for parent products.
+
+        The stockrecords of all products (and of the children of parent
+        products) are loaded with a single query per relation, rather than
+        once per product.
+        """
+        products = list(products)
+        self.prefetch_for_products(products)
+        return [self.fetch_for_parent(product) if product.is_parent
+                else self.fetch_for_product(product)
+                for product in products]
+
+    def prefetch_for_products(self, products):
+        """
+        Load the related objects needed to determine the purchase info of the
+        passed products
+        """
+        parents = [product for product in products if product.is_parent]
+        others = [product for product in products if not product.is_parent]
+        children = [product for product in others if product.is_child]
+        standalone = [product for product in others if not product.is_child]
+        # Products loaded with ProductQuerySet.prefetch_first_stockrecord
+        # already have the stockrecord UseFirstStockRecord selects
+        without_records = others
+        if isinstance(self, UseFirstStockRecord):
+            without_records = [product for product in others
+                               if 'first_stockrecords' not in product.__dict__]
+        if without_records:
+            prefetch_related_objects(without_records, 'stockrecords')
+        if standalone:
+            prefetch_related_objects(standalone, 'product_class')
+        if children:
+            prefetch_related_objects(children, 'parent__product_class')
+        if parents:
+            prefetch_related_objects(
+                parents, 'product_class', 'children__stockrecords')
+
     def fetch_for_line(self, line, stockrecord=None):
         """
         Given a basket line instance, fetch a ``PurchaseInfo`` instance.
@@ -121,21 +190,32 @@ class Structured(Base):
 
         This method is not intended to be overridden.
         """
-        if stockrecord is None:
-            stockrecord = self.select_stockrecord(product)
-        return PurchaseInfo(
-            price=self.pricing_policy(product, stockrecord),
-            availability=self.availability_policy(product, stockrecord),
-            stockrecord=stockrecord)
+        def fetch():
+            selected = stockrecord
+            if selected is None:
+                selected = self.select_stockrecord(product)
+            return PurchaseInfo(
+                price=self.pricing_policy(product, selected),
+                availability=self.availability_policy(product, selected),
+                stockrecord=selected)
+        key = None
+        if product.pk is not None:
+            key = (product.pk, stockrecord.pk if stockrecord else None)
+        return self.get_cached_purchase_info(key, fetch)
 
     def fetch_for_parent(self, product):
-        # Select children and associated stockrecords
-        children_stock = self.select_children_stockrecords(product)
-        return PurchaseInfo(
-            price=self.parent_pricing_policy(product, children_stock),
-            availability=self.parent_availability_policy(
-                product, children_stock),
-            stockrecord=None)
+        def fetch():
+            # Select children and associated stockrecords
+            children_stock = self.select_children_stockrecords(product)
+            return PurchaseInfo(
+                price=self.parent_pricing_policy(product, children_stock),
+                availability=self.parent_availability_policy(
+                    product, children_stock),
+                stockrecord=None)
+        key = None
+        if product.pk is not None:
+            key = ('parent', product.pk)
+        return self.get_cached_purchase_info(key, fetch)
 
     def select_stockrecord(self, product):
         """
@@ -149,12 +229,36 @@ class Structured(Base):
         """
         Select appropriate stock record for all children of a product
         """
+        if settings.OSCAR_CHILDREN_STOCK_CACHE_ENABLED and product.pk:
+            return children_stock_cache.get(self, product)
+        return self.load_children_stockrecords(product)
+
+    def load_children_stockrecords(self, product):
+        """
+        Select the stock records of all children of a product, loading the
+        children and their stockrecords with a query each.
+        """
+        if product.pk:
+            prefetch_related_objects([product], 'children__stockrecords')
         records = []
         for child in product.children.all():
             # Use tuples of (child product, stockrecord)
             records.append((child, self.select_stockrecord(child)))
         return records
 
+    def select_parent_stockrecord(self, children_stock):
+        """
+        Return the stockrecord the price of a parent product is based on: the
+        cheapest of its children's stockrecords (ie the "from" price).
+        """
+        stockrecords = [stockrecord for child, stockrecord in children_stock
+                        if stockrecord is not None
+                        and stockrecord.price_excl_tax is not None]
+        if not stockrecords:
+            return None
+        return min(stockrecords, key=lambda stockrecord: (
+            stockrecord.price_excl_tax))
+
     def pricing_policy(self, product, stockrecord):
         """
         Return the appropriate pricing policy
@@ -195,6 +299,11 @@ class UseFirstStockRecord(object):
     """
 
     def select_stockrecord(self, product):
+        # Use the stockrecord loaded by
+        # ProductQuerySet.prefetch_first_stockrecord
+        records = product.__dict__.get('first_stockrecords')
+        if records is not None:
+            return records[0] if records else None
         try:
             return product.stockrecords.all()[0]
         except IndexError:
@@ -243,11 +352,9 @@ class NoTax(object):
             tax=D('0.00'))
 
     def parent_pricing_policy(self, product, children_stock):
-        stockrecords = [x[1] for x in children_stock if x[1] is not None]
-        if not stockrecords:
+        stockrecord = self.select_parent_stockrecord(children_stock)
+        if not stockrecord:
             return UnavailablePrice()
-        # We take price from first record
-        stockrecord = stockrecords[0]
         return FixedPrice(
             currency=stockrecord.price_currency,
             excl_tax=stockrecord.price_excl_tax,
@@ -276,12 +383,10 @@ class FixedRateTax(object):
             tax=tax)
 
     def parent_pricing_policy(self, product, children_stock):
-        stockrecords = [x[1] for x in children_stock if x[1] is not None]
-        if not stockrecords:
+        stockrecord = self.select_parent_stockrecord(children_stock)
+        if not stockrecord:
             return UnavailablePrice()
 
-        # We take price from first record
-        stockrecord = stockrecords[0]
         rate = self.get_rate(product, stockrecord)
         exponent = self.get_exponent(stockrecord)
         tax = (stockrecord.price_excl_tax * rate).quantize(exponent)
@@ -325,13 +430,10 @@ class DeferredTax(object):
             excl_tax=stockrecord.price_excl_tax)
 
     def parent_pricing_policy(self, product, children_stock):
-        stockrecords = [x[1] for x in children_stock if x[1] is not None]
-        if not stockrecords:
+        stockrecord = self.select_parent_stockrecord(children_stock)
+        if not stockrecord:
             return UnavailablePrice()
 
-        # We take price from first record
-        stockrecord = stockrecords[0]
-
         return FixedPrice(
             currency=stockrecord.price_currency,
             excl_tax=stockrecord.price_excl_tax)
@@ -1,7 +1,7 @@
 from django.conf.urls import url
 
-from oscar.core.application import Application
-from oscar.core.loading import get_class, get_model
+from oscar.core.application import Application, LazyView
+from oscar.core.loading import get_model
 
 
 KeywordPromotion = get_model('promotions', 'KeywordPromotion')
@@ -11,8 +11,8 @@ PagePromotion = get_model('promotions', 'PagePromotion')
 class PromotionsApplication(Application):
     name = 'promotions'
 
-    home_view = get_class('promotions.views', 'HomeView')
-    record_click_view = get_class('promotions.views', 'RecordClickView')
+    home_view = LazyView('promotions.views', 'HomeView')
+    record_click_view = LazyView('promotions.views', 'RecordClickView')
 
     def get_urls(self):
         urls = [
@@ -2,13 +2,13 @@ from django.conf.urls import url
 from haystack.views import search_view_factory
 
 from oscar.apps.search import facets
-from oscar.core.application import Application
+from oscar.core.application import Application, LazyView
 from oscar.core.loading import get_class
 
 
 class SearchApplication(Application):
     name = 'search'
-    search_view = get_class('search.views', 'FacetedSearchView')
+    search_view = LazyView('search.views', 'FacetedSearchView')
     search_form = get_class('search.forms', 'SearchForm')
 
     def get_urls(self):
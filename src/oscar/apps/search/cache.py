@@ -0,0 +1,70 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.crypto import get_random_string
+from django.utils.encoding import force_bytes
+
+
+class SearchResultsCache(object):
+    """
+    Stores pages of search results (the identifiers of the results, their
+    total number and the facet counts) in Django's cache, as well as the
+    model instances loaded for them.
+
+    The pages are tagged with a version which is changed whenever products
+    are saved, deleted or re-indexed (see ``search.receivers``). The cached
+    instances are dropped individually when a product or one of its
+    stockrecords changes.
+    """
+    version_key = 'oscar_search_results_version'
+    page_key = 'oscar_search_results_%s_%s'
+    object_key = 'oscar_search_object_%s_%s'
+
+    def get_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            version = self.invalidate()
+        return version
+
+    def invalidate(self):
+        version = get_random_string(12)
+        cache.set(self.version_key, version, None)
+        return version
+
+    def get_page_key(self, params):
+        """
+        Return the key of the page of results identified by the passed
+        parameters, which should be a sequence of strings
+        """
+        digest = hashlib.md5(force_bytes(repr(params))).hexdigest()
+        return self.page_key % (self.get_version(), digest)
+
+    def get_page(self, key):
+        return cache.get(key)
+
+    def set_page(self, key, data):
+        cache.set(key, data, settings.OSCAR_SEARCH_RESULTS_CACHE_TIMEOUT)
+
+    def get_object_key(self, model, pk):
+        return self.object_key % (model._meta.label_lower, pk)
+
+    def get_objects(self, model, pks):
+        """
+        Return a dict of the cached instances of the model, keyed by pk
+        """
+        keys = dict((self.get_object_key(model, pk), pk) for pk in pks)
+        return dict((keys[key], obj)
+                    for key, obj in cache.get_many(list(keys)).items())
+
+    def set_objects(self, model, objects):
+        cache.set_many(
+            dict((self.get_object_key(model, pk), obj)
+                 for pk, obj in objects.items()),
+            settings.OSCAR_SEARCH_RESULTS_CACHE_TIMEOUT)
+
+    def invalidate_objects(self, model, pks):
+        cache.delete_many([self.get_object_key(model, pk) for pk in pks])
+
+
+search_results_cache = SearchResultsCache()
@@ -6,3 +6,6 @@ class SearchConfig(AppConfig):
     label = 'search'
     name = 'oscar.apps.search'
     verbose_name = _('Search')
+
+    def ready(self):
+        from . import receivers  # noqa
@@ -1,9 +1,15 @@
 from collections import OrderedDict
 
 from django.conf import settings
+from django.utils import six
+from django.utils.encoding import force_bytes
+from django.utils.functional import cached_property, lazy
+from django.utils.six.moves.urllib import parse
 from haystack.query import SearchQuerySet
 from purl import URL
 
+from oscar.core.decorators import deprecated
+
 
 def base_sqs():
     """
@@ -19,12 +25,76 @@ def base_sqs():
     return sqs
 
 
+class FacetURLBuilder(object):
+    """
+    Builds the URLs selecting and deselecting facet values, based on the
+    URL of the current search.
+
+    The URL is parsed once, and the query string shared by all the URLs
+    selecting a value of a given field is only built once; pagination is
+    dropped as the results change.
+    """
+
+    def __init__(self, path):
+        parts = parse.urlsplit(path)
+        self.base = parse.urlunsplit(
+            (parts.scheme, parts.netloc, parts.path, '', ''))
+        self.fragment = '#%s' % parts.fragment if parts.fragment else ''
+        self.params = [
+            (key, value) for key, value in parse.parse_qsl(
+                parts.query, keep_blank_values=True)
+            if key != 'page']
+        self.query = self.encode(self.params)
+        self._select_prefixes = {}
+
+    def encode(self, params):
+        return parse.urlencode(
+            [(force_bytes(key), force_bytes(value)) for key, value in params])
+
+    def build(self, query):
+        if query:
+            return '%s?%s%s' % (self.base, query, self.fragment)
+        return self.base + self.fragment
+
+    def select_url(self, field_name, value):
+        prefix = self._select_prefixes.get(field_name)
+        if prefix is None:
+            param = self.encode([('selected_facets', '%s:' % field_name)])
+            prefix = '%s&%s' % (self.query, param) if self.query else param
+            self._select_prefixes[field_name] = prefix
+        return self.build(
+            prefix + parse.quote_plus(force_bytes(value), safe=''))
+
+    def deselect_url(self, field_name, value):
+        selected = ('selected_facets', '%s:%s' % (field_name, value))
+        return self.build(self.encode(
+            [param for param in self.params if param != selected]))
+
+
 class FacetMunger(object):
 
+    url_builder_class = FacetURLBuilder
+
     def __init__(self, path, selected_multi_facets, facet_counts):
-        self.base_url = URL(path)
+        self.path = path
+        self.url_builder = self.url_builder_class(path)
         self.selected_facets = selected_multi_facets
         self.facet_counts = facet_counts
+        # The URLs are only built when they are rendered, as usually only
+        # some of the values of large facets are.
+        self.select_url = lazy(self.url_builder.select_url, six.text_type)
+        self.deselect_url = lazy(self.url_builder.deselect_url, six.text_type)
+
+    @cached_property
+    def base_url(self):
+        # No longer used to build the facet URLs, see FacetURLBuilder
+        return URL(self.path)
+
+    @deprecated
+    def strip_pagination(self, url):
+        if url.has_query_param('page'):
+            url = url.remove_query_param('page')
+        return url.as_string()
 
     def facet_data(self):
         facet_data = OrderedDict()
@@ -43,9 +113,18 @@ class FacetMunger(object):
         clean_data[key] = {
             'name': facet['name'],
             'results': []}
+        field_name = '%s_exact' % facet['field']
+        is_faceted_already = field_name in self.selected_facets
+        selected_values = self.selected_facets.get(field_name, [])
+        # Only keep the first 'max_values' values (as ordered by the search
+        # backend), and those which are selected
+        max_values = facet.get('max_values')
         for field_value, count in self.facet_counts['fields'][key]:
-            field_name = '%s_exact' % facet['field']
-            is_faceted_already = field_name in self.selected_facets
+            is_selected = field_value in selected_values
+            if (max_values is not None and not is_selected
+                    and len(clean_data[key]['results']) >= max_values):
+                clean_data[key]['truncated'] = True
+                continue
             datum = {
                 'name': field_value,
                 'count': count,
@@ -55,19 +134,14 @@ class FacetMunger(object):
                 'disabled': count == 0 and not is_faceted_already,
                 'selected': False
             }
-            if field_value in self.selected_facets.get(field_name, []):
+            if is_selected:
                 # This filter is selected - build the 'deselect' URL
                 datum['selected'] = True
-                url = self.base_url.remove_query_param(
-                    'selected_facets', '%s:%s' % (
-                        field_name, field_value))
-                datum['deselect_url'] = self.strip_pagination(url)
+                datum['deselect_url'] = self.deselect_url(
+                    field_name, field_value)
             else:
                 # This filter is not selected - built the 'select' URL
-                url = self.base_url.append_query_param(
-                    'selected_facets', '%s:%s' % (
-                        field_name, field_value))
-                datum['select_url'] = self.strip_pagination(url)
+                datum['select_url'] = self.select_url(field_name, field_value)
 
             clean_data[key]['results'].append(datum)
 
@@ -107,16 +181,8 @@ class FacetMunger(object):
                     # Selected
                     datum['selected'] = True
                     datum['show_count'] = True
-                    url = self.base_url.remove_query_param(
-                        'selected_facets', match)
-                    datum['deselect_url'] = self.strip_pagination(url)
+                    datum['deselect_url'] = self.deselect_url(
+                        field_name, query)
                 else:
-                    url = self.base_url.append_query_param(
-                        'selected_facets', match)
-                    datum['select_url'] = self.strip_pagination(url)
+                    datum['select_url'] = self.select_url(field_name, query)
             clean_data[key]['results'].append(datum)
-
-    def strip_pagination(self, url):
-        if url.has_query_param('page'):
-            url = url.remove_query_param('page')
-        return url.as_string()
@@ -0,0 +1,112 @@
+import multiprocessing
+
+from django.conf import settings
+from django.db import connections as db_connections
+from django.db.models import Q
+from haystack import connections
+from haystack.constants import DEFAULT_ALIAS
+
+from oscar.core.loading import get_class, get_model
+
+search_results_cache = get_class('search.cache', 'search_results_cache')
+
+
+class ProductIndexer(object):
+    """
+    Updates the search index of products in batches.
+
+    The products of a batch are loaded with their categories, stockrecords
+    and children in a few queries (see the ``index`` prefetch profile), and
+    their prices are determined with a single call to the strategy. Batches
+    can be indexed in parallel by a pool of processes, and an update can be
+    restricted to the products changed since a given date.
+    """
+    batch_size = 1000
+
+    def __init__(self, using=DEFAULT_ALIAS, batch_size=None):
+        self.using = using
+        if batch_size is not None:
+            self.batch_size = batch_size
+
+    def get_index(self):
+        Product = get_model('catalogue', 'Product')
+        return connections[self.using].get_unified_index().get_index(Product)
+
+    def get_backend(self):
+        return connections[self.using].get_backend()
+
+    def get_queryset(self, since=None):
+        """
+        Return the products to index; only those which have been updated, or
+        whose stockrecords (or children's) have, since the passed date if
+        one is given.
+        """
+        queryset = self.get_index().index_queryset(using=self.using)
+        if since is not None:
+            queryset = queryset.filter(
+                Q(date_updated__gte=since)
+                | Q(stockrecords__date_updated__gte=since)
+                | Q(children__date_updated__gte=since)
+                | Q(children__stockrecords__date_updated__gte=since))
+            queryset = queryset.distinct()
+        return queryset
+
+    def get_batches(self, since=None):
+        """
+        Return the lists of the ids of the products to index in each batch
+        """
+        ids = list(self.get_queryset(since).order_by('pk').values_list(
+            'pk', flat=True))
+        return [ids[offset:offset + self.batch_size]
+                for offset in range(0, len(ids), self.batch_size)]
+
+    def index_batch(self, ids, category_tree=None):
+        """
+        Index the products with the passed ids, and return their number
+        """
+        index = self.get_index()
+        products = list(index.index_queryset(using=self.using).filter(
+            pk__in=ids).order_by('pk'))
+        index.begin_batch(products, category_tree)
+        try:
+            self.get_backend().update(index, products)
+        finally:
+            index.end_batch()
+        return len(products)
+
+    def update(self, since=None, workers=0):
+        """
+        Index all products, or those changed since the passed date, and
+        return the number of products indexed.
+
+        :param workers: The number of processes indexing the batches; they
+                        are indexed by the current process if it is lower
+                        than 2.
+        """
+        batches = self.get_batches(since)
+        if not batches:
+            return 0
+        if workers < 2:
+            # Each batch takes its own snapshot of the category tree, so
+            # categories created or moved while indexing are picked up
+            count = sum(self.index_batch(ids) for ids in batches)
+        else:
+            # The database connections can't be shared with the child
+            # processes
+            db_connections.close_all()
+            pool = multiprocessing.Pool(workers)
+            try:
+                count = sum(pool.map(
+                    index_batch, [(self.using, ids) for ids in batches]))
+            finally:
+                pool.close()
+                pool.join()
+        if settings.OSCAR_SEARCH_RESULTS_CACHE_ENABLED:
+            search_results_cache.invalidate()
+        return count
+
+
+def index_batch(args):
+    # Entry point of the worker processes used by ProductIndexer.update
+    using, ids = args
+    return ProductIndexer(using).index_batch(ids)
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from oscar.core.loading import get_class, get_model
+
+Product = get_model('catalogue', 'Product')
+StockRecord = get_model('partner', 'StockRecord')
+search_results_cache = get_class('search.cache', 'search_results_cache')
+
+
+def invalidate_search_results(product_ids, all_pages=False):
+    # Drop the data straight away so the current process doesn't use stale
+    # data, and again after the commit in case another process cached the
+    # old data in the meantime.
+    def invalidate():
+        search_results_cache.invalidate_objects(Product, product_ids)
+        if all_pages:
+            search_results_cache.invalidate()
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_search_results_for_product(sender, instance, **kwargs):
+    if settings.OSCAR_SEARCH_RESULTS_CACHE_ENABLED:
+        invalidate_search_results(
+            [pk for pk in (instance.pk, instance.parent_id) if pk],
+            all_pages=True)
+
+
+@receiver(post_save, sender=StockRecord)
+@receiver(post_delete, sender=StockRecord)
+def invalidate_search_results_for_stockrecord(sender, instance, **kwargs):
+    if not settings.OSCAR_SEARCH_RESULTS_CACHE_ENABLED:
+        return
+    product_ids = [instance.product_id]
+    parent_id = Product.objects.filter(
+        pk=instance.product_id).values_list('parent_id', flat=True).first()
+    if parent_id:
+        product_ids.append(parent_id)
+    invalidate_search_results(product_ids)
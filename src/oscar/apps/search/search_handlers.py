@@ -1,12 +1,42 @@
+from django.conf import settings
 from django.core.paginator import InvalidPage, Paginator
+from django.utils.six.moves.urllib.parse import urlsplit
+from django.utils.translation import get_language
 from django.utils.translation import ugettext_lazy as _
 from haystack import connections
+from haystack.models import SearchResult
 
 from oscar.core.loading import get_class
 
 from . import facets
 
 FacetMunger = get_class('search.facets', 'FacetMunger')
+search_results_cache = get_class('search.cache', 'search_results_cache')
+
+
+class CachedSearchResults(object):
+    """
+    Stands in for the search queryset when paginating a page of results
+    taken from the search results cache.
+    """
+
+    def __init__(self, count, offset, results):
+        self._count = count
+        self.offset = offset
+        self.results = results
+
+    def count(self):
+        return self._count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, k):
+        if not isinstance(k, slice):
+            return self.results[k - self.offset]
+        start = (k.start or 0) - self.offset
+        stop = None if k.stop is None else k.stop - self.offset
+        return self.results[max(start, 0):stop]
 
 
 class SearchHandler(object):
@@ -39,6 +69,9 @@ class SearchHandler(object):
     paginate_by = None
     paginator_class = Paginator
     page_kwarg = 'page'
+    #: The request parameters which don't change the results, and are left out
+    #: of the key of the search results cache (e.g. tracking parameters)
+    cache_ignored_params = ()
 
     def __init__(self, request_data, full_path):
         self.full_path = full_path
@@ -49,10 +82,24 @@ class SearchHandler(object):
         self.search_form = self.get_search_form(
             request_data, search_queryset)
         self.results = self.get_search_results(self.search_form)
-        # If below raises an UnicodeDecodeError, you're running pysolr < 3.2
-        # with Solr 4.
-        self.paginator, self.page = self.paginate_queryset(
-            self.results, request_data)
+        self.cache_key = self.cached_page = None
+        if settings.OSCAR_SEARCH_RESULTS_CACHE_ENABLED:
+            self.cache_key = search_results_cache.get_page_key(
+                self.get_cache_params(request_data))
+            self.cached_page = search_results_cache.get_page(self.cache_key)
+        if self.cached_page is not None:
+            count, offset, results, __ = self.cached_page
+            self.paginator, self.page = self.paginate_queryset(
+                CachedSearchResults(count, offset, [
+                    SearchResult(*result) for result in results]),
+                request_data)
+        else:
+            # If below raises an UnicodeDecodeError, you're running
+            # pysolr < 3.2 with Solr 4.
+            self.paginator, self.page = self.paginate_queryset(
+                self.results, request_data)
+            if self.cache_key is not None:
+                self.cache_page()
 
     # Search related methods
 
@@ -85,6 +132,47 @@ class SearchHandler(object):
             sqs = sqs.models(*self.model_whitelist)
         return sqs
 
+    # Caching related methods
+
+    def get_cache_params(self, request_data):
+        """
+        Return the parameters identifying the page of results in the search
+        results cache. The path of the URL identifies the page being browsed
+        (e.g. a category), and the query is normalised so that trivially
+        different queries share their results.
+        """
+        query = ' '.join(request_data.get('q', '').lower().split())
+        # Any other parameter (e.g. 'sort_by', or the fields of custom forms)
+        # can change the results, so they are all part of the key
+        known_params = set(['q', 'selected_facets', self.page_kwarg])
+        known_params.update(self.cache_ignored_params)
+        other_params = tuple(sorted(
+            (name, tuple(request_data.getlist(name)))
+            for name in request_data if name not in known_params))
+        return (
+            '%s.%s' % (self.__module__, self.__class__.__name__),
+            urlsplit(self.full_path).path,
+            get_language(),
+            query,
+            tuple(sorted(request_data.getlist('selected_facets'))),
+            other_params,
+            request_data.get(self.page_kwarg, '1'),
+            self.paginate_by,
+        )
+
+    def cache_page(self):
+        """
+        Store the identifiers of the current page of results, their total
+        number and the facet counts in the search results cache
+        """
+        results = [
+            (result.app_label, result.model_name, result.pk, result.score)
+            for result in self.page.object_list]
+        offset = (self.page.number - 1) * self.paginator.per_page
+        search_results_cache.set_page(self.cache_key, (
+            self.paginator.count, offset, results,
+            self.results.facet_counts()))
+
     # Pagination related methods
 
     def paginate_queryset(self, queryset, request_data):
@@ -140,7 +228,8 @@ class SearchHandler(object):
             ui = connections[search_backend_alias].get_unified_index()
             index = ui.get_index(model)
             queryset = index.read_queryset(using=search_backend_alias)
-            loaded_objects[model] = queryset.in_bulk(models_pks[model])
+            loaded_objects[model] = self.load_objects(
+                model, queryset, models_pks[model])
 
         for result in paginated_results:
             model_objects = loaded_objects.get(result.model, {})
@@ -155,6 +244,22 @@ class SearchHandler(object):
 
         return objects
 
+    def load_objects(self, model, queryset, pks):
+        """
+        Return a dict of the instances of the model with the passed pks,
+        using the search results cache if it's enabled
+        """
+        if not settings.OSCAR_SEARCH_RESULTS_CACHE_ENABLED:
+            return queryset.in_bulk(pks)
+        pks = [int(pk) for pk in pks]
+        objects = search_results_cache.get_objects(model, pks)
+        missing = [pk for pk in pks if pk not in objects]
+        if missing:
+            loaded = queryset.in_bulk(missing)
+            search_results_cache.set_objects(model, loaded)
+            objects.update(loaded)
+        return objects
+
     def get_paginated_objects(self):
         """
         Return a paginated list of Django model instances. The call is cached.
@@ -166,11 +271,16 @@ class SearchHandler(object):
             self._objects = self.bulk_fetch_results(paginated_results)
         return self._objects
 
+    def get_facet_counts(self):
+        if self.cached_page is not None:
+            return self.cached_page[3]
+        return self.results.facet_counts()
+
     def get_facet_munger(self):
         return FacetMunger(
             self.full_path,
             self.search_form.selected_multi_facets,
-            self.results.facet_counts())
+            self.get_facet_counts())
 
     def get_search_context_data(self, context_object_name=None):
         """
@@ -1,10 +1,12 @@
 from haystack import indexes
 
-from oscar.core.loading import get_class, get_model
+from oscar.core.loading import get_class, get_classes, get_model
 
 # Load default strategy (without a user/request)
 is_solr_supported = get_class('search.features', 'is_solr_supported')
 Selector = get_class('partner.strategy', 'Selector')
+CategoryTree, category_tree_cache = get_classes(
+    'catalogue.cache', ['CategoryTree', 'category_tree_cache'])
 
 
 class ProductIndex(indexes.SearchIndex, indexes.Indexable):
@@ -32,12 +34,17 @@ class ProductIndex(indexes.SearchIndex, indexes.Indexable):
 
     _strategy = None
 
+    # Data loaded for a whole batch of products, see begin_batch
+    _purchase_info = None
+    _category_tree = None
+
     def get_model(self):
         return get_model('catalogue', 'Product')
 
     def index_queryset(self, using=None):
         # Only index browsable products (not each individual child product)
-        return self.get_model().browsable.order_by('-date_updated')
+        return self.get_model().browsable.with_profile('index').order_by(
+            '-date_updated')
 
     def read_queryset(self, using=None):
         return self.get_model().browsable.base_queryset()
@@ -48,7 +55,13 @@ class ProductIndex(indexes.SearchIndex, indexes.Indexable):
     def prepare_category(self, obj):
         categories = obj.categories.all()
         if len(categories) > 0:
-            return [category.full_name for category in categories]
+            tree = self.get_category_tree()
+            # Categories created or moved since the snapshot was taken aren't
+            # known to it
+            return [tree.get_full_name(category)
+                    if tree is not None and tree.contains(category)
+                    else category.full_name
+                    for category in categories]
 
     def prepare_rating(self, obj):
         if obj.rating is not None:
@@ -63,26 +76,57 @@ class ProductIndex(indexes.SearchIndex, indexes.Indexable):
             self._strategy = Selector().strategy()
         return self._strategy
 
-    def prepare_price(self, obj):
-        strategy = self.get_strategy()
-        result = None
-        if obj.is_parent:
-            result = strategy.fetch_for_parent(obj)
-        elif obj.has_stockrecords:
-            result = strategy.fetch_for_product(obj)
+    def begin_batch(self, products, category_tree=None):
+        """
+        Load the data needed to prepare the passed products at once: their
+        purchase info, using a single strategy call, and a snapshot of the
+        category tree (unless one is passed). Call ``end_batch`` once they
+        have been prepared.
+        """
+        infos = self.get_strategy().fetch_for_products(products)
+        self._purchase_info = dict(
+            (product.pk, info) for product, info in zip(products, infos))
+        self._category_tree = (
+            category_tree or category_tree_cache.get_tree()
+            or CategoryTree(get_model('catalogue', 'Category').get_tree()))
+
+    def end_batch(self):
+        self._purchase_info = None
+        self._category_tree = None
+
+    def get_category_tree(self):
+        if self._category_tree is not None:
+            return self._category_tree
+        return category_tree_cache.get_tree()
+
+    def get_purchase_info(self, obj):
+        """
+        Return the purchase info of the product, or ``None`` for products
+        without a stockrecord
+        """
+        if self._purchase_info is not None and obj.pk in self._purchase_info:
+            info = self._purchase_info[obj.pk]
+        elif obj.is_parent:
+            info = self.get_strategy().fetch_for_parent(obj)
+        else:
+            info = self.get_strategy().fetch_for_product(obj)
+        if not obj.is_parent and info.stockrecord is None:
+            return None
+        return info
 
+    def prepare_price(self, obj):
+        result = self.get_purchase_info(obj)
         if result:
             if result.price.is_tax_known:
                 return result.price.incl_tax
             return result.price.excl_tax
 
     def prepare_num_in_stock(self, obj):
-        strategy = self.get_strategy()
         if obj.is_parent:
             # Don't return a stock level for parent products
             return None
-        elif obj.has_stockrecords:
-            result = strategy.fetch_for_product(obj)
+        result = self.get_purchase_info(obj)
+        if result:
             return result.stockrecord.net_stock_level
 
     def prepare(self, obj):
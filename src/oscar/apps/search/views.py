@@ -5,9 +5,10 @@ from oscar.core.loading import get_class, get_model
 
 Product = get_model('catalogue', 'Product')
 FacetMunger = get_class('search.facets', 'FacetMunger')
+ProductListMixin = get_class('catalogue.views', 'ProductListMixin')
 
 
-class FacetedSearchView(views.FacetedSearchView):
+class FacetedSearchView(ProductListMixin, views.FacetedSearchView):
     """
     A modified version of Haystack's FacetedSearchView
 
@@ -62,6 +63,21 @@ class FacetedSearchView(views.FacetedSearchView):
 
         return extra
 
+    def build_page(self):
+        paginator, page = super(FacetedSearchView, self).build_page()
+        # Load the products of the page (and the objects needed to render
+        # them) in bulk, rather than once per search result
+        results = [result for result in page.object_list
+                   if result is not None and result.model is Product]
+        products = Product.objects.with_profile('listing').in_bulk(
+            [int(result.pk) for result in results])
+        for result in results:
+            product = products.get(int(result.pk))
+            if product is not None:
+                result._object = product
+        self.prefetch_products(products.values())
+        return paginator, page
+
     def get_results(self):
         # We're only interested in products (there might be other content types
         # in the Solr index).
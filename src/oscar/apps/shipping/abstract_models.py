@@ -10,6 +10,8 @@ from oscar.core import loading, prices
 from oscar.models.fields import AutoSlugField
 
 Scale = loading.get_class('shipping.scales', 'Scale')
+WeightBandTable, weight_bands_cache = loading.get_classes(
+    'shipping.cache', ['WeightBandTable', 'weight_bands_cache'])
 
 
 @python_2_unicode_compatible
@@ -119,9 +121,30 @@ class AbstractWeightBased(AbstractBase):
         # Note, when weighing the basket, we don't check whether the item
         # requires shipping or not.  It is assumed that if something has a
         # weight, then it requires shipping.
-        scale = Scale(attribute_code=self.weight_attribute,
-                      default_weight=self.default_weight)
-        weight = scale.weigh_basket(basket)
+        weight = self.get_scale().weigh_basket(basket)
+        return self.calculate_for_weight(basket, weight)
+
+    @classmethod
+    def calculate_many(cls, basket, methods):
+        """
+        Calculate the charges of several weight-based methods for a basket,
+        and return them in the same order.
+
+        The bands of the methods are loaded in a single query, and the basket
+        is only weighed once for methods sharing the same weight attribute
+        and default weight.
+        """
+        cls.load_band_tables(methods)
+        weights = {}
+        charges = []
+        for method in methods:
+            key = (method.weight_attribute, method.default_weight)
+            if key not in weights:
+                weights[key] = method.get_scale().weigh_basket(basket)
+            charges.append(method.calculate_for_weight(basket, weights[key]))
+        return charges
+
+    def calculate_for_weight(self, basket, weight):
         charge = self.get_charge(weight)
 
         # Zero tax is assumed...
@@ -130,6 +153,10 @@ class AbstractWeightBased(AbstractBase):
             excl_tax=charge,
             incl_tax=charge)
 
+    def get_scale(self):
+        return Scale(attribute_code=self.weight_attribute,
+                     default_weight=self.default_weight)
+
     def get_charge(self, weight):
         """
         Calculates shipping charges for a given weight.
@@ -149,17 +176,31 @@ class AbstractWeightBased(AbstractBase):
         is NP-hard and solving it is left as an exercise to the reader.
         """
         weight = D(weight)  # weight really should be stored as a decimal
-        if not self.bands.exists():
-            return D('0.00')
-
-        top_band = self.top_band
-        if weight < top_band.upper_limit:
-            band = self.get_band_for_weight(weight)
-            return band.charge
-        else:
-            quotient, remaining_weight = divmod(weight, top_band.upper_limit)
-            remainder_band = self.get_band_for_weight(remaining_weight)
-            return quotient * top_band.charge + remainder_band.charge
+        return self.get_band_table().get_charge(weight)
+
+    def get_band_table(self):
+        """
+        Return the bands of the method as a ``WeightBandTable``. It's loaded
+        once per instance (which, like any model instance, shouldn't outlive
+        a request), and dropped when one of its bands is saved or deleted
+        through it.
+        """
+        if '_band_table' not in self.__dict__:
+            self.load_band_tables([self])
+        return self._band_table
+
+    @classmethod
+    def load_band_tables(cls, methods):
+        """
+        Load the band tables of the passed methods which haven't been loaded
+        yet, in a single query
+        """
+        methods = [method for method in methods
+                   if '_band_table' not in method.__dict__]
+        tables = weight_bands_cache.get_tables(
+            list(set(method.pk for method in methods if method.pk)))
+        for method in methods:
+            method._band_table = tables.get(method.pk) or WeightBandTable([])
 
     def get_band_for_weight(self, weight):
         """
@@ -204,11 +245,7 @@ class AbstractWeightBand(models.Model):
 
     @property
     def weight_from(self):
-        lower_bands = self.method.bands.filter(
-            upper_limit__lt=self.upper_limit).order_by('-upper_limit')
-        if not lower_bands:
-            return D('0.000')
-        return lower_bands[0].upper_limit
+        return self.method.get_band_table().get_weight_from(self.upper_limit)
 
     @property
     def weight_to(self):
@@ -223,3 +260,13 @@ class AbstractWeightBand(models.Model):
 
     def __str__(self):
         return _('Charge for weights up to %s kg') % (self.upper_limit,)
+
+    def save(self, *args, **kwargs):
+        super(AbstractWeightBand, self).save(*args, **kwargs)
+        self.method.__dict__.pop('_band_table', None)
+
+    def delete(self, *args, **kwargs):
+        method = self.method
+        result = super(AbstractWeightBand, self).delete(*args, **kwargs)
+        method.__dict__.pop('_band_table', None)
+        return result
@@ -0,0 +1,166 @@
+from bisect import bisect_left
+from decimal import Decimal as D
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.crypto import get_random_string
+
+from oscar.core.loading import get_model
+
+
+class WeightBandTable(object):
+    """
+    The weight bands of a weight-based shipping method, as a list of
+    (upper limit, charge) tuples sorted by upper limit, which is searched
+    with bisect rather than queried.
+    """
+
+    def __init__(self, bands):
+        self.bands = sorted(bands)
+        self.upper_limits = [upper_limit for upper_limit, __ in self.bands]
+
+    def __len__(self):
+        return len(self.bands)
+
+    def get_band_for_weight(self, weight):
+        """
+        Return the (upper limit, charge) of the closest matching band for a
+        given weight, or ``None``
+        """
+        index = bisect_left(self.upper_limits, weight)
+        if index < len(self.bands):
+            return self.bands[index]
+        return None
+
+    def get_weight_from(self, upper_limit):
+        """
+        Return the lower limit of the band with the passed upper limit
+        """
+        index = bisect_left(self.upper_limits, upper_limit)
+        if index == 0:
+            return D('0.000')
+        return self.upper_limits[index - 1]
+
+    def get_charge(self, weight):
+        # See AbstractWeightBased.get_charge
+        if not self.bands:
+            return D('0.00')
+        top_upper_limit, top_charge = self.bands[-1]
+        if weight < top_upper_limit:
+            return self.get_band_for_weight(weight)[1]
+        quotient, remaining_weight = divmod(weight, top_upper_limit)
+        return quotient * top_charge + self.get_band_for_weight(
+            remaining_weight)[1]
+
+
+class WeightBandsCache(object):
+    """
+    Loads the weight band tables of weight-based shipping methods, and keeps
+    them in Django's cache if ``OSCAR_WEIGHT_BANDS_CACHE_ENABLED`` is set.
+
+    The table of a method is dropped whenever one of its bands is saved or
+    deleted (see ``shipping.receivers``).
+    """
+    version_key = 'oscar_weight_bands_version'
+    table_key = 'oscar_weight_bands_%s_%s'
+
+    def get_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            version = self.invalidate_all()
+        return version
+
+    def invalidate_all(self):
+        version = get_random_string(12)
+        cache.set(self.version_key, version, None)
+        return version
+
+    def invalidate(self, method_id):
+        cache.delete(self.table_key % (self.get_version(), method_id))
+
+    def get_tables(self, method_ids):
+        """
+        Return a dict of the band tables of the methods with the passed ids,
+        loading those which aren't cached in a single query
+        """
+        enabled = settings.OSCAR_WEIGHT_BANDS_CACHE_ENABLED
+        bands = {}
+        if enabled:
+            version = self.get_version()
+            keys = dict((self.table_key % (version, method_id), method_id)
+                        for method_id in method_ids)
+            bands = dict((keys[key], value)
+                         for key, value in cache.get_many(list(keys)).items())
+        missing = [method_id for method_id in method_ids
+                   if method_id not in bands]
+        if missing:
+            WeightBand = get_model('shipping', 'WeightBand')
+            loaded = dict((method_id, []) for method_id in missing)
+            rows = WeightBand.objects.filter(method_id__in=missing).values_list(
+                'method_id', 'upper_limit', 'charge')
+            for method_id, upper_limit, charge in rows:
+                loaded[method_id].append((upper_limit, charge))
+            if enabled:
+                cache.set_many(
+                    dict((self.table_key % (version, method_id), value)
+                         for method_id, value in loaded.items()),
+                    settings.OSCAR_WEIGHT_BANDS_CACHE_TIMEOUT)
+            bands.update(loaded)
+        return dict((method_id, WeightBandTable(value))
+                    for method_id, value in bands.items())
+
+
+weight_bands_cache = WeightBandsCache()
+
+
+class ProductWeightsCache(object):
+    """
+    Stores the weights of products (the values of their weight attribute, or
+    ``None`` if they don't have one) in Django's cache.
+
+    The weight of a product is dropped when one of its attribute values is
+    saved or deleted, and those of all products when an attribute changes
+    (see ``shipping.receivers``).
+    """
+    version_key = 'oscar_product_weights_version'
+    weight_key = 'oscar_product_weight_%s_%s_%s'
+
+    def get_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            version = self.invalidate_all()
+        return version
+
+    def invalidate_all(self):
+        version = get_random_string(12)
+        cache.set(self.version_key, version, None)
+        return version
+
+    def invalidate(self, attribute_code, product_id):
+        cache.delete(
+            self.weight_key % (self.get_version(), attribute_code, product_id))
+
+    def get_many(self, attribute_code, product_ids):
+        """
+        Return a dict of the stored weights, keyed by product id
+        """
+        version = self.get_version()
+        keys = dict(
+            (self.weight_key % (version, attribute_code, product_id),
+             product_id)
+            for product_id in product_ids)
+        # The weights are wrapped in tuples, as the cache doesn't tell
+        # stored None values from missing ones
+        return dict((keys[key], value[0])
+                    for key, value in cache.get_many(list(keys)).items())
+
+    def set_many(self, attribute_code, weights):
+        version = self.get_version()
+        cache.set_many(
+            dict((self.weight_key % (version, attribute_code, product_id),
+                  (weight,))
+                 for product_id, weight in weights.items()),
+            settings.OSCAR_PRODUCT_WEIGHTS_CACHE_TIMEOUT)
+
+
+product_weights_cache = ProductWeightsCache()
@@ -96,6 +96,55 @@ class FixedPrice(Base):
             incl_tax=self.charge_incl_tax)
 
 
+class QuotedMethod(Base):
+    """
+    Wrapper class that returns the charge of an existing shipping method
+    from the shipping quotes of the session, and only calculates it if it
+    hasn't been quoted yet.
+    """
+
+    def __init__(self, method, quotes):
+        self.method = method
+        self.quotes = quotes
+
+    # Forwarded properties
+
+    @property
+    def code(self):
+        return self.method.code
+
+    @property
+    def name(self):
+        return self.method.name
+
+    @property
+    def description(self):
+        return self.method.description
+
+    @property
+    def is_discounted(self):
+        return self.method.is_discounted
+
+    def __getattr__(self, name):
+        # Forward the other attributes (e.g. the fields of shipping method
+        # models) to the wrapped method
+        if name.startswith('_') or name in ('method', 'quotes'):
+            raise AttributeError(name)
+        return getattr(self.method, name)
+
+    def calculate(self, basket):
+        if basket is not self.quotes.basket:
+            return self.method.calculate(basket)
+        charge = self.quotes.get(self.code)
+        if charge is None:
+            charge = self.method.calculate(basket)
+            self.quotes.set(self.code, charge)
+        return charge
+
+    def discount(self, basket):
+        return self.method.discount(basket)
+
+
 class OfferDiscount(Base):
     """
     Wrapper class that applies a discount to an existing shipping
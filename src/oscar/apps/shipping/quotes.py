@@ -0,0 +1,107 @@
+import hashlib
+import time
+from decimal import Decimal as D
+
+from django.conf import settings
+
+from oscar.core import prices
+
+
+class ShippingQuotes(object):
+    """
+    The charges of the shipping methods for a basket and shipping address,
+    kept in the session so they are calculated once per checkout rather than
+    on every page (and several times per page).
+
+    The quotes are stored by a fingerprint of the basket and the address, so
+    they aren't used once either changes, and are discarded when they are
+    older than ``OSCAR_SHIPPING_QUOTES_TIMEOUT`` seconds. The quotes of a few
+    fingerprints are kept, as the same page can quote the charges both
+    without an address and with the default address of the customer.
+    """
+    session_key = 'shipping_quotes'
+    max_fingerprints = 4
+
+    def __init__(self, request, basket, shipping_addr=None):
+        self.request = request
+        self.basket = basket
+        self.fingerprint = self.get_fingerprint(basket, shipping_addr)
+        self.quotes = self.load()
+
+    def get_fingerprint(self, basket, shipping_addr):
+        lines = [(line.id, line.product_id, line.stockrecord_id,
+                  line.quantity) + self.get_price_signature(line)
+                 for line in basket.all_lines()]
+        totals = (basket.total_excl_tax,
+                  basket.total_incl_tax if basket.is_tax_known else None)
+        parts = (basket.id, basket.owner_id, basket.currency, lines, totals,
+                 self.get_address_signature(shipping_addr))
+        return hashlib.sha1(repr(parts).encode('utf8')).hexdigest()
+
+    def get_price_signature(self, line):
+        price = line.purchase_info.price
+        incl_tax = price.incl_tax if price.is_tax_known else None
+        return (price.currency, price.excl_tax, incl_tax)
+
+    def get_address_signature(self, shipping_addr):
+        if shipping_addr is None:
+            return None
+        return [(field.attname, getattr(shipping_addr, field.attname))
+                for field in shipping_addr._meta.concrete_fields
+                if not field.primary_key]
+
+    def get_stored_quotes(self):
+        """
+        Return a dict of the unexpired quotes stored in the session, by
+        fingerprint
+        """
+        data = self.request.session.get(self.session_key) or {}
+        now = time.time()
+        return dict(
+            (fingerprint, entry) for fingerprint, entry in data.items()
+            if isinstance(entry, dict) and entry.get('expires', 0) >= now)
+
+    def load(self):
+        entry = self.get_stored_quotes().get(self.fingerprint)
+        if entry is None:
+            return {}
+        return entry['quotes']
+
+    def save(self):
+        stored = self.get_stored_quotes()
+        stored.pop(self.fingerprint, None)
+        # Keep the most recent quotes of other fingerprints
+        fingerprints = sorted(
+            stored, key=lambda fingerprint: stored[fingerprint]['expires'],
+            reverse=True)[:self.max_fingerprints - 1]
+        data = dict((fingerprint, stored[fingerprint])
+                    for fingerprint in fingerprints)
+        data[self.fingerprint] = {
+            'expires': time.time() + settings.OSCAR_SHIPPING_QUOTES_TIMEOUT,
+            'quotes': self.quotes,
+        }
+        self.request.session[self.session_key] = data
+
+    def __contains__(self, code):
+        return code in self.quotes
+
+    def get(self, code):
+        """
+        Return the quoted charge of the method with the passed code, or
+        ``None``
+        """
+        if code not in self.quotes:
+            return None
+        currency, excl_tax, incl_tax = self.quotes[code]
+        return prices.Price(
+            currency=currency, excl_tax=D(excl_tax),
+            incl_tax=D(incl_tax) if incl_tax is not None else None)
+
+    def set(self, code, charge):
+        # The charges are stored as strings, so the quotes can be serialised
+        # by any session serialiser
+        incl_tax = charge.incl_tax if charge.is_tax_known else None
+        self.quotes[code] = (
+            charge.currency, str(charge.excl_tax),
+            str(incl_tax) if incl_tax is not None else None)
+        self.save()
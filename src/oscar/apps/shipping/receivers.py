@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from oscar.core.loading import get_classes, get_model
+
+product_weights_cache, weight_bands_cache = get_classes(
+    'shipping.cache', ['product_weights_cache', 'weight_bands_cache'])
+WeightBand = get_model('shipping', 'WeightBand')
+ProductAttribute = get_model('catalogue', 'ProductAttribute')
+ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
+
+
+@receiver(post_save, sender=WeightBand)
+@receiver(post_delete, sender=WeightBand)
+def invalidate_weight_bands(sender, instance, **kwargs):
+    # Drop the bands straight away so the current process doesn't use stale
+    # data, and again after the commit in case another process cached the
+    # old data in the meantime.
+    method_id = instance.method_id
+
+    def invalidate():
+        weight_bands_cache.invalidate(method_id)
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=ProductAttributeValue)
+@receiver(post_delete, sender=ProductAttributeValue)
+def invalidate_product_weight(sender, instance, **kwargs):
+    if not settings.OSCAR_PRODUCT_WEIGHTS_CACHE_ENABLED:
+        return
+    attribute_code = instance.attribute.code
+    product_id = instance.product_id
+
+    def invalidate():
+        product_weights_cache.invalidate(attribute_code, product_id)
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=ProductAttribute)
+@receiver(post_delete, sender=ProductAttribute)
+def invalidate_all_product_weights(**kwargs):
+    if settings.OSCAR_PRODUCT_WEIGHTS_CACHE_ENABLED:
+        product_weights_cache.invalidate_all()
+        transaction.on_commit(product_weights_cache.invalidate_all)
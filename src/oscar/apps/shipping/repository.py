@@ -1,14 +1,16 @@
 from decimal import Decimal as D
 
+from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.utils.translation import ugettext_lazy as _
 
-from oscar.core.loading import get_classes
+from oscar.core.loading import get_class, get_classes
 
-(Free, NoShippingRequired,
+(Free, NoShippingRequired, QuotedMethod,
  TaxExclusiveOfferDiscount, TaxInclusiveOfferDiscount) \
-    = get_classes('shipping.methods', ['Free', 'NoShippingRequired',
+    = get_classes('shipping.methods', ['Free', 'NoShippingRequired', 'QuotedMethod',
                                        'TaxExclusiveOfferDiscount', 'TaxInclusiveOfferDiscount'])
+ShippingQuotes = get_class('shipping.quotes', 'ShippingQuotes')
 
 
 class Repository(object):
@@ -36,6 +38,13 @@ class Repository(object):
 
         methods = self.get_available_shipping_methods(
             basket=basket, shipping_addr=shipping_addr, **kwargs)
+        request = kwargs.get('request')
+        if (settings.OSCAR_SHIPPING_QUOTES_ENABLED
+                and getattr(request, 'session', None) is not None):
+            methods = self.quote_shipping_methods(
+                basket, methods, shipping_addr, request)
+        else:
+            self.load_weight_bands(methods)
         if basket.has_shipping_discounts:
             methods = self.apply_shipping_offers(basket, methods)
         return methods
@@ -65,6 +74,27 @@ class Repository(object):
         """
         return self.methods
 
+    def quote_shipping_methods(self, basket, methods, shipping_addr, request):
+        """
+        Wrap the passed methods so their charges are taken from the shipping
+        quotes stored in the session, which are kept until the basket or the
+        shipping address changes
+        """
+        quotes = ShippingQuotes(request, basket, shipping_addr)
+        self.load_weight_bands(
+            [method for method in methods if method.code not in quotes])
+        return [QuotedMethod(method, quotes) for method in methods]
+
+    def load_weight_bands(self, methods):
+        """
+        Load the bands of all weight-based methods in a single query, rather
+        than one for each method when its charge is calculated
+        """
+        weight_based = [method for method in methods
+                        if hasattr(method, 'load_band_tables')]
+        if weight_based:
+            weight_based[0].load_band_tables(weight_based)
+
     def apply_shipping_offers(self, basket, methods):
         """
         Apply shipping offers to the passed set of methods
@@ -1,6 +1,10 @@
 from decimal import Decimal as D
 
-from django.core.exceptions import ObjectDoesNotExist
+from django.conf import settings
+
+from oscar.core.loading import get_class, get_model
+
+product_weights_cache = get_class('shipping.cache', 'product_weights_cache')
 
 
 class Scale(object):
@@ -12,17 +16,82 @@ class Scale(object):
         self.default_weight = default_weight
 
     def weigh_product(self, product):
-        weight = None
-        try:
-            weight = product.attribute_values.get(
-                attribute__code=self.attribute).value
-        except ObjectDoesNotExist:
-            if product.parent:
-                try:
-                    weight = product.parent.attribute_values.get(
-                        attribute__code=self.attribute).value
-                except ObjectDoesNotExist:
-                    pass
+        return self.weigh_products([product])[0]
+
+    def weigh_products(self, products):
+        """
+        Return the weights of the passed products, loading the weight
+        attribute of all of them (and their parents) in a single query
+        """
+        weights = self.load_weights(products)
+        return [self.get_weight(product, weights) for product in products]
+
+    def weigh_lines(self, basket):
+        """
+        Return a list of (line, weight) tuples for the lines of the basket,
+        where the weight takes the quantity of the line into account.
+
+        The weights of the products are kept on the basket, so weighing it
+        again (e.g. for other shipping methods using the same attribute)
+        doesn't query the database.
+        """
+        lines = list(basket.all_lines())
+        weights = basket.__dict__.setdefault(
+            '_product_weights', {}).setdefault(self.attribute, {})
+        products = [line.product for line in lines]
+        missing = [product for product in products
+                   if product.pk not in weights
+                   or (product.parent_id and product.parent_id not in weights)]
+        if missing:
+            weights.update(self.load_weights(missing))
+        return [(line, self.get_weight(line.product, weights) * line.quantity)
+                for line in lines]
+
+    def weigh_basket(self, basket):
+        weight = D('0.0')
+        for __, line_weight in self.weigh_lines(basket):
+            weight += line_weight
+        return weight
+
+    def load_weights(self, products):
+        """
+        Return a dict of the values of the weight attribute of the passed
+        products and their parents (or ``None`` for those without one), keyed
+        by product id
+        """
+        product_ids = set()
+        for product in products:
+            product_ids.add(product.pk)
+            if product.parent_id:
+                product_ids.add(product.parent_id)
+        enabled = settings.OSCAR_PRODUCT_WEIGHTS_CACHE_ENABLED
+        weights = {}
+        if enabled:
+            weights = product_weights_cache.get_many(
+                self.attribute, product_ids)
+        missing = product_ids.difference(weights)
+        if missing:
+            ProductAttributeValue = get_model(
+                'catalogue', 'ProductAttributeValue')
+            loaded = dict.fromkeys(missing)
+            values = ProductAttributeValue.objects.filter(
+                attribute__code=self.attribute,
+                product_id__in=missing).select_related('attribute')
+            for value in values:
+                loaded[value.product_id] = value.value
+            if enabled:
+                product_weights_cache.set_many(self.attribute, loaded)
+            weights.update(loaded)
+        return weights
+
+    def get_weight(self, product, weights):
+        """
+        Return the weight of a product from the passed weights, falling back
+        to the weight of its parent and then the default weight
+        """
+        weight = weights.get(product.pk)
+        if weight is None and product.parent_id:
+            weight = weights.get(product.parent_id)
 
         if weight is None:
             if self.default_weight is None:
@@ -32,9 +101,3 @@ class Scale(object):
             weight = self.default_weight
 
         return D(weight) if weight is not None else D('0.0')
-
-    def weigh_basket(self, basket):
-        weight = D('0.0')
-        for line in basket.lines.all():
-            weight += self.weigh_product(line.product) * line.quantity
-        return weight
@@ -1,6 +1,6 @@
 from django.urls import reverse_lazy
 
-from oscar.core.loading import feature_hidden
+from oscar.core.loading import feature_hidden, get_class, get_module_name
 from oscar.views.decorators import permissions_required
 
 
@@ -12,6 +12,94 @@ except ImportError:
     from django.urls.resolvers import RegexURLPattern as URLPattern
 
 
+class LazyView(object):
+    """
+    A reference to a view class loaded with ``get_class``, which is only
+    resolved (and its module imported) when the view is first dispatched or
+    one of its attributes is used.
+
+    Applications use it for their views so that loading the URLconf doesn't
+    import all the views, forms and tables of Oscar::
+
+        class CatalogueApplication(Application):
+            detail_view = LazyView('catalogue.views', 'ProductDetailView')
+
+    The view functions returned by ``as_view`` resolve the view class on their
+    first call. Attributes set on the view function by decorators of the view
+    class (such as ``csrf_exempt``) are therefore only available once it has
+    been resolved; assign the class itself to load such views eagerly.
+    """
+
+    def __init__(self, module_label, classname, module_prefix='oscar.apps'):
+        self.module_label = module_label
+        self.classname = classname
+        self.module_prefix = module_prefix
+        self._view_class = None
+        # Set up front, like LazyViewFunction does, so introspecting the view
+        # doesn't resolve it
+        self.__name__ = classname
+        self.__module__ = get_module_name(module_label, module_prefix)
+
+    def resolve(self):
+        if self._view_class is None:
+            self._view_class = get_class(
+                self.module_label, self.classname, self.module_prefix)
+            # The class may come from another module, e.g. if the local
+            # module doesn't override it
+            self.__module__ = self._view_class.__module__
+        return self._view_class
+
+    def as_view(self, **initkwargs):
+        return LazyViewFunction(self, initkwargs)
+
+    def __call__(self, *args, **kwargs):
+        # Instantiates the view class, like Haystack's search_view_factory
+        # does
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __repr__(self):
+        return '<LazyView: %s.%s.%s>' % (
+            self.module_prefix, self.module_label, self.classname)
+
+
+class LazyViewFunction(object):
+    """
+    The view function of a ``LazyView``; it creates the actual view function
+    with ``as_view`` on its first call.
+
+    The name and module of the view are set up front, as Django's URL
+    resolver reads them when it's populated.
+    """
+
+    def __init__(self, lazy_view, initkwargs):
+        self.lazy_view = lazy_view
+        self.initkwargs = initkwargs
+        self.view = None
+        self.__name__ = self.__qualname__ = lazy_view.classname
+        self.__module__ = lazy_view.__module__
+        self.__doc__ = None
+
+    def get_view(self):
+        if self.view is None:
+            self.view = self.lazy_view.resolve().as_view(**self.initkwargs)
+        return self.view
+
+    def __call__(self, request, *args, **kwargs):
+        return self.get_view()(request, *args, **kwargs)
+
+    def __getattr__(self, name):
+        # Special attributes are looked up by e.g. functools.wraps, which
+        # shouldn't resolve the view
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.get_view(), name)
+
+
 class Application(object):
     """
     Base application class.
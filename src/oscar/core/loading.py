@@ -1,18 +1,26 @@
+import logging
+import pkgutil
 import sys
 import traceback
 import warnings
+from collections import defaultdict
 from importlib import import_module
+from timeit import default_timer
 
 from django.apps import apps
 from django.apps.config import MODELS_MODULE_NAME
 from django.conf import settings
 from django.core.exceptions import AppRegistryNotReady
+from django.core.signals import setting_changed
+from django.utils import six
 from django.utils.lru_cache import lru_cache
 from django.utils.module_loading import import_string
 
 from oscar.core.exceptions import (
     AppNotFoundError, ClassNotFoundError, ModuleNotFoundError)
 
+logger = logging.getLogger('oscar.loading')
+
 # To preserve backwards compatibility of loading classes which moved
 # from one Oscar module to another, we look into the dictionary below
 # for the moved items during loading.
@@ -64,9 +72,150 @@ def get_class_loader():
     return import_string(settings.OSCAR_DYNAMIC_CLASS_LOADER)
 
 
+class ClassRegistry(object):
+    """
+    Memoises the classes resolved by the class loader, and records the time
+    spent resolving them per module label.
+
+    Classes are only memoised once the app registry is ready, and not while
+    the local module overriding the Oscar one is being imported: it might
+    only be partially imported because of a circular import, in which case
+    the loader falls back to the Oscar class. Classes which have moved to
+    another module aren't memoised either, so that each use of their old
+    location keeps raising a deprecation warning.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.classes = {}
+        self.load_times = defaultdict(float)
+        self.load_counts = defaultdict(int)
+
+    def get_classes(self, module_label, classnames, module_prefix):
+        keys = [(module_prefix, module_label, classname)
+                for classname in classnames]
+        try:
+            return [self.classes[key] for key in keys]
+        except KeyError:
+            pass
+        start = default_timer()
+        klasses = get_class_loader()(module_label, classnames, module_prefix)
+        self.load_times[module_label] += default_timer() - start
+        self.load_counts[module_label] += 1
+        oscar_module_label = "%s.%s" % (module_prefix, module_label)
+        if (apps.ready and oscar_module_label not in MOVED_ITEMS
+                and not _is_local_module_importing(module_label,
+                                                   module_prefix)):
+            self.classes.update(zip(keys, klasses))
+        return klasses
+
+    def get_load_times(self):
+        """
+        Return a list of (module label, seconds, number of loads) tuples, most
+        expensive first. The times of a label include those of the classes
+        loaded by the modules it imported.
+        """
+        return sorted(
+            ((label, seconds, self.load_counts[label])
+             for label, seconds in self.load_times.items()),
+            key=lambda item: item[1], reverse=True)
+
+
+class_registry = ClassRegistry()
+
+
 def get_classes(module_label, classnames, module_prefix='oscar.apps'):
-    class_loader = get_class_loader()
-    return class_loader(module_label, classnames, module_prefix)
+    return class_registry.get_classes(module_label, classnames, module_prefix)
+
+
+def prewarm_classes(exclude=('migrations', 'tests', 'management')):
+    """
+    Import all the modules of the installed Oscar apps, so the classes they
+    load are resolved and memoised up front rather than on the first
+    requests. Call it once the app registry is ready, e.g. at the end of
+    your WSGI module, to warm up each worker process.
+
+    Returns the names of the modules imported.
+    """
+    imported = []
+    for app_config in apps.get_app_configs():
+        if not _is_oscar_app(app_config):
+            continue
+        package = app_config.module
+        if not hasattr(package, '__path__'):
+            continue
+        for __, name, __ in pkgutil.walk_packages(
+                package.__path__, package.__name__ + '.',
+                onerror=lambda name: None):
+            if set(name.split('.')).intersection(exclude):
+                continue
+            try:
+                import_module(name)
+            except Exception:
+                # Eg a module needing an optional dependency
+                logger.exception("Unable to import %s", name)
+                continue
+            imported.append(name)
+    return imported
+
+
+def _is_local_module_importing(module_label, module_prefix):
+    """
+    Test whether the local module overriding the Oscar module with the
+    passed label is being imported
+    """
+    local_module_label = _get_local_module_label(module_label, module_prefix)
+    if local_module_label is None:
+        return False
+    module = sys.modules.get(local_module_label)
+    if module is None:
+        return False
+    if six.PY2:
+        # Python 2 doesn't flag modules being imported, but holds the import
+        # lock while importing any module
+        import imp
+        return imp.lock_held()
+    return getattr(getattr(module, '__spec__', None), '_initializing', False)
+
+
+def _get_local_module_label(module_label, module_prefix):
+    # The label of the local module overriding the Oscar module with the
+    # passed label, or None if the app isn't forked
+    try:
+        installed_apps_entry, app_name = _find_installed_apps_entry(
+            module_label)
+    except AppNotFoundError:
+        return None
+    if installed_apps_entry.startswith('%s.' % module_prefix):
+        return None
+    return installed_apps_entry + module_label.replace(app_name, '', 1)
+
+
+def get_module_name(module_label, module_prefix='oscar.apps'):
+    """
+    Return the name of the module the classes with the passed module label
+    are loaded from: the local module overriding the Oscar module if there is
+    one, else the Oscar module. The modules aren't imported, but the packages
+    of the apps are.
+    """
+    local_module_label = _get_local_module_label(module_label, module_prefix)
+    if local_module_label is not None:
+        try:
+            if pkgutil.find_loader(local_module_label) is not None:
+                return local_module_label
+        except ImportError:
+            pass
+    return '%s.%s' % (module_prefix, module_label)
+
+
+def _is_oscar_app(app_config):
+    # Oscar's apps and forks of them; forks keep the labels of Oscar's apps
+    if app_config.name.startswith('oscar.'):
+        return True
+    return _import_module(
+        'oscar.apps.%s' % app_config.name.rsplit('.', 1)[-1], []) is not None
 
 
 def default_class_loader(module_label, classnames, module_prefix):
@@ -220,6 +369,7 @@ def _pluck_classes(modules, classnames):
     return klasses
 
 
+@lru_cache(maxsize=None)
 def _get_installed_apps_entry(app_name):
     """
     Given an app name (e.g. 'catalogue'), walk through INSTALLED_APPS
@@ -282,6 +432,9 @@ def feature_hidden(feature_name):
             feature_name in settings.OSCAR_HIDDEN_FEATURES)
 
 
+_models = {}
+
+
 def get_model(app_label, model_name):
     """
     Fetches a Django model using the app registry.
@@ -291,9 +444,19 @@ def get_model(app_label, model_name):
     All other methods to access models might raise an exception about the
     registry not being ready yet.
     Raises LookupError if model isn't found.
+
+    Models are memoised once the registry is ready, as this is called in
+    some frequently used methods.
     """
     try:
-        return apps.get_model(app_label, model_name)
+        return _models[(app_label, model_name)]
+    except KeyError:
+        pass
+    try:
+        model = apps.get_model(app_label, model_name)
+        if apps.ready:
+            _models[(app_label, model_name)] = model
+        return model
     except AppRegistryNotReady:
         if apps.apps_ready and not apps.models_ready:
             # If this function is called while `apps.populate()` is
@@ -326,3 +489,20 @@ def is_model_registered(app_label, model_name):
         return False
     else:
         return True
+
+
+def clear_caches(**kwargs):
+    """
+    Clear the memoised classes and models, e.g. when the installed apps
+    change in tests.
+    """
+    if kwargs.get('setting') not in (
+            None, 'INSTALLED_APPS', 'OSCAR_DYNAMIC_CLASS_LOADER'):
+        return
+    get_class_loader.cache_clear()
+    _get_installed_apps_entry.cache_clear()
+    class_registry.clear()
+    _models.clear()
+
+
+setting_changed.connect(clear_caches)
@@ -15,6 +15,8 @@ OSCAR_BASKET_COOKIE_LIFETIME = 7 * 24 * 60 * 60
 OSCAR_BASKET_COOKIE_OPEN = 'oscar_open_basket'
 OSCAR_BASKET_COOKIE_SECURE = False
 OSCAR_MAX_BASKET_QUANTITY_THRESHOLD = 10000
+OSCAR_BASKET_SUMMARY_CACHE_ENABLED = False
+OSCAR_BASKET_SUMMARY_CACHE_TIMEOUT = 60 * 60
 
 # Recently-viewed products
 OSCAR_RECENTLY_VIEWED_COOKIE_LIFETIME = 7 * 24 * 60 * 60
@@ -54,6 +56,44 @@ OSCAR_DASHBOARD_ITEMS_PER_PAGE = 20
 # Checkout
 OSCAR_ALLOW_ANON_CHECKOUT = False
 
+# Order placement
+OSCAR_ORDER_BULK_PLACEMENT = False
+OSCAR_ORDER_NUMBER_FORMAT = '%d'
+OSCAR_ORDER_NUMBER_START = 100000
+OSCAR_ORDER_NUMBER_BLOCK_SIZE = 20
+
+# Catalogue
+OSCAR_CATEGORY_TREE_CACHE_ENABLED = False
+OSCAR_CATEGORY_TREE_CACHE_TIMEOUT = 60 * 60
+OSCAR_PRODUCT_ATTRIBUTES_CACHE_ENABLED = False
+OSCAR_PRODUCT_ATTRIBUTES_CACHE_TIMEOUT = 60 * 60
+
+# Partner
+OSCAR_PURCHASE_INFO_CACHE_ENABLED = False
+OSCAR_PURCHASE_INFO_CACHE_SIZE = 1000
+OSCAR_CHILDREN_STOCK_CACHE_ENABLED = False
+OSCAR_CHILDREN_STOCK_CACHE_TIMEOUT = 60 * 60
+
+# Offers
+OSCAR_OFFER_CACHE_ENABLED = False
+OSCAR_OFFER_CACHE_TIMEOUT = 60 * 60
+OSCAR_RANGE_INDEX_ENABLED = False
+OSCAR_OFFER_INCREMENTAL_APPLICATION = False
+OSCAR_OFFER_APPLICATION_SNAPSHOTS = False
+
+# Shipping
+OSCAR_WEIGHT_BANDS_CACHE_ENABLED = False
+OSCAR_WEIGHT_BANDS_CACHE_TIMEOUT = 60 * 60
+OSCAR_PRODUCT_WEIGHTS_CACHE_ENABLED = False
+OSCAR_PRODUCT_WEIGHTS_CACHE_TIMEOUT = 60 * 60
+OSCAR_SHIPPING_QUOTES_ENABLED = False
+OSCAR_SHIPPING_QUOTES_TIMEOUT = 15 * 60
+
+# Analytics
+OSCAR_ANALYTICS_BUFFERED = False
+OSCAR_ANALYTICS_FLUSH_SIZE = 500
+OSCAR_ANALYTICS_FLUSH_INTERVAL = 60
+
 # Promotions
 OSCAR_PROMOTION_POSITIONS = (('page', 'Page'),
                              ('right', 'Right-hand sidebar'),
@@ -73,6 +113,8 @@ OSCAR_ACCOUNTS_REDIRECT_URL = 'customer:profile-view'
 # run periodically, e.g. as a cron job. In this case eager alerts should be
 # disabled.
 OSCAR_EAGER_ALERTS = True
+OSCAR_PRODUCT_ALERTS_BATCH_SIZE = 500
+OSCAR_PRODUCT_ALERTS_CONCURRENCY = 1
 
 # Registration
 OSCAR_SEND_REGISTRATION_EMAIL = True
@@ -253,3 +295,6 @@ OSCAR_SEARCH_FACETS = {
 
 OSCAR_PROMOTIONS_ENABLED = True
 OSCAR_PRODUCT_SEARCH_HANDLER = None
+OSCAR_SEARCH_RESULTS_CACHE_ENABLED = False
+OSCAR_SEARCH_RESULTS_CACHE_TIMEOUT = 60
+OSCAR_PRODUCT_FACETS_ENABLED = False
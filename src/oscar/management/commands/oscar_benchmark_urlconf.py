@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a new interpreter for each measurement, as the modules imported by
+# the URLconf are only imported once per process.
+SCRIPT = """
+import json
+import sys
+from timeit import default_timer
+
+start = default_timer()
+import django
+django.setup()
+setup = default_timer()
+modules = set(sys.modules)
+
+from django.urls import get_resolver
+resolver = get_resolver()
+resolver.url_patterns
+imported = default_timer()
+resolver.reverse_dict
+populated = default_timer()
+
+new_modules = set(sys.modules) - modules
+print(json.dumps({
+    'setup': setup - start,
+    'import': imported - setup,
+    'populate': populated - imported,
+    'modules': len(new_modules),
+    'views': len([name for name in new_modules if name.endswith('.views')]),
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = """Measure the time taken to set up Django and to import and
+              populate the URLconf in a new process, as done when a worker
+              starts."""
+
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help="The number of processes to start")
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        runs = []
+        for __ in range(options['repeat']):
+            try:
+                output = subprocess.check_output(
+                    [sys.executable, '-c', SCRIPT], env=env)
+            except subprocess.CalledProcessError as e:
+                raise CommandError(
+                    "The benchmark failed with exit code %s" % e.returncode)
+            runs.append(json.loads(output.decode('utf-8').splitlines()[-1]))
+
+        for key, title in [('setup', 'Django setup'),
+                           ('import', 'URLconf import'),
+                           ('populate', 'URL resolver population')]:
+            times = sorted(run[key] for run in runs)
+            self.stdout.write('%-24s min %8.1fms  median %8.1fms\n' % (
+                title, times[0] * 1000, times[len(times) // 2] * 1000))
+        self.stdout.write(
+            'Modules imported by the URLconf: %d, of which %d views modules\n'
+            % (runs[-1]['modules'], runs[-1]['views']))
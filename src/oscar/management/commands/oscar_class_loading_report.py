@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from django.core.management.base import BaseCommand
+
+from oscar.core.loading import class_registry, prewarm_classes
+
+
+class Command(BaseCommand):
+    help = """Report the time spent loading classes with get_class and
+              get_classes, per module label, after importing all the modules
+              of Oscar's apps."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=30,
+            help="The number of module labels to report")
+        parser.add_argument(
+            '--no-prewarm', action='store_false', dest='prewarm',
+            help="Only report the classes loaded so far")
+
+    def handle(self, *args, **options):
+        if options['prewarm']:
+            modules = prewarm_classes()
+            self.stdout.write('Imported %d modules\n' % len(modules))
+        load_times = class_registry.get_load_times()
+        self.stdout.write(
+            'Loaded classes from %d module labels; the times include the '
+            'classes loaded by the modules they imported\n' % len(load_times))
+        self.stdout.write('%10s  %5s  %s\n' % ('ms', 'loads', 'module label'))
+        for label, seconds, count in load_times[:options['limit']]:
+            self.stdout.write(
+                '%10.2f  %5d  %s\n' % (seconds * 1000, count, label))
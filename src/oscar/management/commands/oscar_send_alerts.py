@@ -16,10 +16,23 @@ class Command(BaseCommand):
     help = _("Check for products that are back in "
              "stock and send out alerts")
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            help="The number of alerts of a product to send together")
+        parser.add_argument(
+            '--concurrency', type=int,
+            help="The number of threads sending the emails")
+
     def handle(self, **options):
         """
         Check all products with active product alerts for
         availability and send out email alerts when a product is
         available to buy.
         """
-        utils.send_alerts()
+        stats = utils.send_alerts(batch_size=options['batch_size'],
+                                  concurrency=options['concurrency'])
+        self.stdout.write(
+            "Sent alerts for %(products)d products: %(alerts)d alerts closed, "
+            "%(notifications)d notifications and %(messages)d messages sent, "
+            "%(failed)d messages failed in %(seconds).1fs\n" % stats)
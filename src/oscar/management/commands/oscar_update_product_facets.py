@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from django.core.management.base import BaseCommand
+
+from oscar.core.loading import get_class, get_model
+
+product_facets = get_class('catalogue.facets', 'product_facets')
+Product = get_model('catalogue', 'Product')
+
+
+class Command(BaseCommand):
+    help = """Recompute the facet values of all browsable products, used to
+              facet product lists without a search backend."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="The number of products updated at once")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        ids = list(Product.browsable.order_by('pk').values_list(
+            'pk', flat=True))
+        for offset in range(0, len(ids), batch_size):
+            products = Product.objects.filter(
+                pk__in=ids[offset:offset + batch_size]).prefetch_related(
+                'categories', 'children')
+            product_facets.update_products(products)
+        self.stdout.write(
+            'Successfully updated the facets of %s products\n' % len(ids))
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from haystack.constants import DEFAULT_ALIAS
+
+from oscar.core.loading import get_class
+
+ProductIndexer = get_class('search.indexing', 'ProductIndexer')
+
+
+class Command(BaseCommand):
+    help = """Update the search index of products in batches, optionally
+              using several processes and only for the products changed
+              in the last hours."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--age', type=int, default=None,
+            help="Only index the products (or stockrecords) updated in the "
+                 "last AGE hours")
+        parser.add_argument(
+            '--workers', type=int, default=0,
+            help="The number of processes indexing the products")
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help="The number of products indexed at once")
+        parser.add_argument(
+            '--using', default=DEFAULT_ALIAS,
+            help="The Haystack connection to update")
+
+    def handle(self, *args, **options):
+        since = None
+        if options['age'] is not None:
+            since = timezone.now() - timedelta(hours=options['age'])
+        indexer = ProductIndexer(
+            using=options['using'], batch_size=options['batch_size'])
+        count = indexer.update(since=since, workers=options['workers'])
+        self.stdout.write('Successfully indexed %s products\n' % count)
@@ -1,9 +1,10 @@
 from django import template
 
-from oscar.core.loading import get_model
+from oscar.core.loading import get_class, get_model
 
 register = template.Library()
 Category = get_model('catalogue', 'category')
+category_tree_cache = get_class('catalogue.cache', 'category_tree_cache')
 
 
 @register.simple_tag(name="category_tree")
@@ -16,17 +17,33 @@ def get_annotated_list(depth=None, parent=None):
     # 'depth' is the backwards-compatible name for the template tag,
     # 'max_depth' is the better variable name.
     max_depth = depth
+    if parent and max_depth is not None:
+        max_depth += parent.get_depth()
 
-    annotated_categories = []
+    # Use the cached snapshot of the tree if possible; the annotated list is
+    # then only computed once per tree version.
+    tree = category_tree_cache.get_tree()
+    if tree is not None and (not parent or tree.contains(parent)):
+        if parent:
+            key = (depth, parent.pk)
+            categories = tree.get_descendants(parent)
+        else:
+            key = (depth, None)
+            categories = tree.categories
+        return tree.get_annotated_list(
+            key, lambda: annotate_categories(categories, max_depth))
 
-    start_depth, prev_depth = (None, None)
     if parent:
         categories = parent.get_descendants()
-        if max_depth is not None:
-            max_depth += parent.get_depth()
     else:
         categories = Category.get_tree()
+    return annotate_categories(categories, max_depth)
+
 
+def annotate_categories(categories, max_depth=None):
+    annotated_categories = []
+
+    start_depth, prev_depth = (None, None)
     info = {}
     for node in categories:
         node_depth = node.get_depth()
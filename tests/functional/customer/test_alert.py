@@ -10,9 +10,10 @@ from django.test import TestCase
 from oscar.utils.deprecation import RemovedInOscar20Warning
 
 from oscar.apps.customer.alerts.utils import (
-    send_alert_confirmation, send_product_alerts)
+    ProductAlertSender, send_alert_confirmation, send_product_alerts)
 from oscar.apps.customer.forms import ProductAlertForm
 from oscar.apps.customer.models import ProductAlert
+from oscar.apps.partner.strategy import Default
 from oscar.test.factories import (
     create_product, create_stockrecord, ProductAlertFactory, UserFactory)
 
@@ -229,6 +230,50 @@ class TestHurryMode(TestCase):
             mail.outbox[0].body)
 
 
+class TestProductAlertSender(TestCase):
+
+    def setUp(self):
+        self.product = create_product()
+        create_stockrecord(self.product, num_in_stock=10)
+        for i in range(3):
+            # Alerts of anonymous customers are unconfirmed when created
+            ProductAlert.objects.create(
+                email='customer%d@example.com' % i,
+                product=self.product).confirm()
+        ProductAlert.objects.create(user=UserFactory(), product=self.product)
+
+    def test_sends_the_alerts_in_batches(self):
+        sender = ProductAlertSender(batch_size=2)
+        sender.send_product_alerts(self.product)
+        self.assertEqual(4, len(mail.outbox))
+        self.assertEqual(4, sender.stats['alerts'])
+        self.assertEqual(4, sender.stats['messages'])
+        self.assertEqual(1, sender.stats['notifications'])
+        self.assertFalse(ProductAlert.objects.filter(
+            status=ProductAlert.ACTIVE).exists())
+        self.assertFalse(ProductAlert.objects.filter(
+            date_closed__isnull=True).exists())
+
+    def test_checks_the_availability_once_per_strategy(self):
+        strategy = Default()
+        sender = ProductAlertSender()
+        sender.selector = mock.Mock()
+        sender.selector.strategy.return_value = strategy
+        with mock.patch.object(strategy, 'fetch_for_product',
+                               wraps=strategy.fetch_for_product) as fetch:
+            sender.send_product_alerts(self.product)
+        self.assertEqual(4, sender.selector.strategy.call_count)
+        self.assertEqual(1, fetch.call_count)
+
+    @mock.patch('oscar.apps.customer.utils.Dispatcher.dispatch_user_messages')
+    def test_sends_the_emails_from_several_threads(self, mock_dispatch):
+        sender = ProductAlertSender(concurrency=2)
+        sender.send_product_alerts(self.product)
+        self.assertEqual(3, len(mail.outbox))
+        self.assertEqual(1, mock_dispatch.call_count)
+        self.assertEqual(4, sender.stats['messages'])
+
+
 class TestAlertMessageSending(TestCase):
 
     def setUp(self):
@@ -0,0 +1,96 @@
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from oscar.apps.analytics.buffers import AnalyticsBuffer
+from oscar.apps.analytics.models import (
+    ProductRecord, UserProductView, UserRecord, UserSearch)
+from oscar.test import factories
+
+
+class TestAnalyticsBuffer(TestCase):
+
+    def setUp(self):
+        self.buffer = AnalyticsBuffer()
+        self.user = factories.UserFactory()
+        self.product = factories.create_product()
+
+    def test_writes_events_immediately_by_default(self):
+        self.buffer.add_product_view(self.product, self.user)
+        self.assertEqual(1, ProductRecord.objects.get().num_views)
+        self.assertEqual(1, UserRecord.objects.get().num_product_views)
+        self.assertEqual(1, UserProductView.objects.count())
+
+    def test_increments_existing_records(self):
+        self.buffer.add_basket_addition(self.product, self.user)
+        self.buffer.add_basket_addition(self.product, self.user)
+        self.assertEqual(
+            2, ProductRecord.objects.get().num_basket_additions)
+        self.assertEqual(2, UserRecord.objects.get().num_basket_additions)
+
+    def test_records_orders(self):
+        order = factories.create_order(user=self.user)
+        self.buffer.add_order(order, self.user)
+        # The order has already been recorded once by the receivers
+        record = UserRecord.objects.get()
+        self.assertEqual(2, record.num_orders)
+        self.assertEqual(2, record.num_order_lines)
+        self.assertEqual(order.total_incl_tax * 2, record.total_spent)
+        self.assertEqual(order.date_placed, record.date_last_order)
+        self.assertEqual(
+            2, ProductRecord.objects.get(
+                product=order.lines.get().product).num_purchases)
+
+    def test_ignores_anonymous_users(self):
+        self.buffer.add_search('shirt', None)
+        self.buffer.add_product_view(self.product, None)
+        self.assertEqual(0, UserSearch.objects.count())
+        self.assertEqual(0, UserRecord.objects.count())
+        self.assertEqual(1, ProductRecord.objects.get().num_views)
+
+    @override_settings(OSCAR_ANALYTICS_BUFFERED=True,
+                       OSCAR_ANALYTICS_FLUSH_SIZE=10,
+                       OSCAR_ANALYTICS_FLUSH_INTERVAL=60)
+    def test_aggregates_buffered_events(self):
+        other_product = factories.create_product()
+        ProductRecord.objects.create(product=self.product, num_views=5)
+        with self.assertNumQueries(0):
+            for i in range(3):
+                self.buffer.add_product_view(self.product, self.user)
+            self.buffer.add_product_view(other_product, self.user)
+            self.buffer.add_search('shirt', self.user)
+        self.buffer.flush()
+        self.assertEqual(8, ProductRecord.objects.get(
+            product=self.product).num_views)
+        self.assertEqual(1, ProductRecord.objects.get(
+            product=other_product).num_views)
+        self.assertEqual(4, UserRecord.objects.get().num_product_views)
+        self.assertEqual(4, UserProductView.objects.count())
+        self.assertEqual(1, UserSearch.objects.count())
+
+    @override_settings(OSCAR_ANALYTICS_BUFFERED=True,
+                       OSCAR_ANALYTICS_FLUSH_SIZE=2,
+                       OSCAR_ANALYTICS_FLUSH_INTERVAL=60)
+    def test_flushes_when_buffer_is_full(self):
+        self.buffer.add_product_view(self.product)
+        self.assertEqual(0, ProductRecord.objects.count())
+        self.buffer.add_basket_addition(self.product)
+        record = ProductRecord.objects.get()
+        self.assertEqual(1, record.num_views)
+        self.assertEqual(1, record.num_basket_additions)
+
+
+@override_settings(OSCAR_ANALYTICS_BUFFERED=True,
+                   OSCAR_ANALYTICS_FLUSH_SIZE=10,
+                   OSCAR_ANALYTICS_FLUSH_INTERVAL=60)
+class TestAnalyticsBufferWithDeletedObjects(TransactionTestCase):
+
+    def test_drops_the_counts_of_deleted_products_only(self):
+        analytics_buffer = AnalyticsBuffer()
+        product = factories.create_product()
+        deleted_product = factories.create_product()
+        analytics_buffer.add_product_view(product)
+        analytics_buffer.add_product_view(deleted_product)
+        deleted_product.delete()
+        analytics_buffer.flush()
+        self.assertEqual(1, ProductRecord.objects.get(
+            product=product).num_views)
+        self.assertEqual(1, ProductRecord.objects.count())
@@ -1,9 +1,15 @@
+from decimal import Decimal as D
+
+from django.core.cache import cache
 from django.http import HttpResponse
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.test.client import RequestFactory
 from django.contrib.auth.models import AnonymousUser
 
 from oscar.apps.basket import middleware
+from oscar.apps.basket.models import Basket
+from oscar.test import factories
+from oscar.test.basket import add_product
 
 
 class TestBasketMiddleware(TestCase):
@@ -37,3 +43,52 @@ class TestBasketMiddleware(TestCase):
 
         self.assertEqual(None, cookie_basket)
         self.assertIn("oscar_open_basket", request.cookies_to_delete)
+
+
+@override_settings(OSCAR_BASKET_SUMMARY_CACHE_ENABLED=True)
+class TestBasketSummary(TestCase):
+
+    @staticmethod
+    def get_response_for_test(request):
+        return HttpResponse()
+
+    def setUp(self):
+        cache.clear()
+        self.middleware = middleware.BasketMiddleware(
+            self.get_response_for_test)
+        self.user = factories.UserFactory()
+
+    def get_request(self, user=None):
+        request = RequestFactory().get('/')
+        request.user = user or AnonymousUser()
+        self.middleware(request)
+        return request
+
+    def test_is_empty_for_anonymous_users_without_basket(self):
+        request = self.get_request()
+        with self.assertNumQueries(0):
+            self.assertTrue(request.basket_summary.is_empty)
+
+    def test_does_not_create_baskets_for_users(self):
+        request = self.get_request(self.user)
+        self.assertTrue(request.basket_summary.is_empty)
+        self.assertFalse(Basket.objects.exists())
+        request = self.get_request(self.user)
+        with self.assertNumQueries(0):
+            self.assertTrue(request.basket_summary.is_empty)
+
+    def test_is_cached_until_basket_changes(self):
+        basket = Basket.open.create(owner=self.user)
+        add_product(basket, D('10.00'), 2)
+        summary = self.get_request(self.user).basket_summary
+        self.assertEqual(2, summary.num_items)
+        self.assertEqual(D('20.00'), summary.total_excl_tax)
+
+        request = self.get_request(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(2, request.basket_summary.num_items)
+
+        add_product(basket, D('5.00'))
+        summary = self.get_request(self.user).basket_summary
+        self.assertEqual(3, summary.num_items)
+        self.assertEqual(2, summary.num_lines)
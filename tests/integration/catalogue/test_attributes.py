@@ -1,10 +1,14 @@
 from datetime import datetime, date
 import six
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import SimpleUploadedFile
 
+from oscar.apps.catalogue.cache import product_attributes_cache
+from oscar.apps.catalogue.models import Product
+from oscar.apps.catalogue.product_attributes import ProductAttributesContainer
 from oscar.test import factories
 
 
@@ -158,3 +162,97 @@ class TestFileAttributes(TestCase):
     def test_validate_file_values(self):
         file_field = SimpleUploadedFile('test_file.txt', b'Test')
         self.assertIsNone(self.attr.validate_value(file_field))
+
+
+class TestLoadingAttributesInBulk(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        for colour, size in [('red', 'S'), ('blue', 'M'), ('green', 'L')]:
+            factories.create_product(
+                attributes={'colour': colour, 'size': size})
+        self.products = list(Product.objects.order_by('pk'))
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_loads_attributes_with_a_single_query(self):
+        with self.assertNumQueries(1):
+            ProductAttributesContainer.load_for_products(self.products)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                ['red', 'blue', 'green'],
+                [product.attr.colour for product in self.products])
+            self.assertEqual('M', self.products[1].attr.size)
+            self.assertEqual(
+                {'colour: red', 'size: S'},
+                set(self.products[0].attribute_summary.split(', ')))
+
+    def test_ignores_products_with_loaded_attributes(self):
+        self.products[0].attr.initiate_attributes()
+        ProductAttributesContainer.load_for_products(self.products)
+        self.assertEqual('red', self.products[0].attr.colour)
+        self.assertFalse(self.products[0].attr.values_prefetched())
+
+    @override_settings(OSCAR_PRODUCT_ATTRIBUTES_CACHE_ENABLED=True)
+    def test_uses_cached_attributes(self):
+        ProductAttributesContainer.load_for_products(self.products)
+        products = list(Product.objects.order_by('pk'))
+        with self.assertNumQueries(0):
+            ProductAttributesContainer.load_for_products(products)
+            self.assertEqual('blue', products[1].attr.colour)
+            self.assertEqual(
+                {'colour: green', 'size: L'},
+                set(products[2].attribute_summary.split(', ')))
+
+    @override_settings(OSCAR_PRODUCT_ATTRIBUTES_CACHE_ENABLED=True)
+    def test_drops_cached_attributes_when_a_value_changes(self):
+        ProductAttributesContainer.load_for_products(self.products)
+        product = self.products[0]
+        product.attr.colour = 'yellow'
+        product.save()
+        products = list(Product.objects.order_by('pk'))
+        ProductAttributesContainer.load_for_products(products)
+        self.assertEqual('yellow', products[0].attr.colour)
+        self.assertEqual('blue', products[1].attr.colour)
+
+    @override_settings(OSCAR_PRODUCT_ATTRIBUTES_CACHE_ENABLED=True)
+    def test_caches_the_ids_of_options(self):
+        product = self.products[0]
+        group = factories.AttributeOptionGroupFactory()
+        option = factories.AttributeOptionFactory(group=group, option='Cotton')
+        factories.ProductAttributeFactory(
+            code='fabric', name='Fabric', type='option', option_group=group,
+            product_class=product.product_class)
+        product.attr.fabric = option
+        product.attr.save()
+        ProductAttributesContainer.load_for_products(
+            list(Product.objects.order_by('pk')))
+        data = product_attributes_cache.get_many([product])[product.pk]
+        self.assertIn(('fabric', 'option', option.pk), data['values'])
+
+        products = list(Product.objects.order_by('pk'))
+        with self.assertNumQueries(1):
+            ProductAttributesContainer.load_for_products(products)
+        self.assertEqual(option, products[0].attr.fabric)
+
+    @override_settings(OSCAR_PRODUCT_ATTRIBUTES_CACHE_ENABLED=True)
+    def test_loads_the_multi_options_with_the_options(self):
+        product = self.products[0]
+        group = factories.AttributeOptionGroupFactory()
+        options = [
+            factories.AttributeOptionFactory(group=group, option=option)
+            for option in ['Cotton', 'Wool']]
+        factories.ProductAttributeFactory(
+            code='fabrics', name='Fabrics', type='multi_option',
+            option_group=group, product_class=product.product_class)
+        product.attr.fabrics = options
+        product.attr.save()
+        ProductAttributesContainer.load_for_products(
+            list(Product.objects.order_by('pk')))
+
+        products = list(Product.objects.order_by('pk'))
+        with self.assertNumQueries(1):
+            ProductAttributesContainer.load_for_products(products)
+            self.assertEqual(options, list(products[0].attr.fabrics))
+            self.assertEqual(2, products[0].attr.fabrics.count())
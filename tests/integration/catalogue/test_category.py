@@ -259,3 +259,43 @@ class TestCategoryTemplateTags(TestCase):
         actual_categories = self.get_category_names(depth=1, parent=parent)
         expected_categories = {'Horror', 'Comedy'}
         self.assertEqual(expected_categories, actual_categories)
+
+
+@override_settings(OSCAR_CATEGORY_TREE_CACHE_ENABLED=True)
+class TestCategoryTemplateTagsWithTreeCache(TestCategoryTemplateTags):
+
+    def setUp(self):
+        cache.clear()
+        super(TestCategoryTemplateTagsWithTreeCache, self).setUp()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_uses_snapshot_after_first_lookup(self):
+        get_annotated_list()
+        gothic = Category.objects.get(name="Gothic")
+        with self.assertNumQueries(0):
+            get_annotated_list()
+            self.assertEqual(
+                'Books > Fiction > Horror > Gothic', gothic.full_name)
+            self.assertEqual(
+                '/catalogue/category/books/fiction/horror/gothic_{}/'.format(
+                    gothic.pk),
+                gothic.get_absolute_url())
+            self.assertFalse(gothic.has_children())
+
+    def test_rebuilds_snapshot_when_category_is_saved(self):
+        get_annotated_list()
+        create_from_breadcrumbs('Books > Fiction > Crime')
+        self.assertIn('Crime', self.get_category_names())
+
+    def test_rebuilds_snapshot_when_category_is_moved(self):
+        get_annotated_list()
+        horror = Category.objects.get(name="Horror")
+        horror.move(Category.objects.get(name="Programming"))
+        teen = Category.objects.get(name="Teen")
+        self.assertEqual(
+            'Books > Non-fiction > Horror > Teen',
+            teen.full_name)
+        parent = Category.objects.get(name="Fiction")
+        self.assertEqual({'Comedy'}, self.get_category_names(parent=parent))
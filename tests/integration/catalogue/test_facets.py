@@ -0,0 +1,107 @@
+from decimal import Decimal as D
+
+import mock
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+
+from oscar.apps.catalogue.facets import product_facets
+from oscar.apps.catalogue.models import Product, ProductFacetValue
+from oscar.apps.catalogue.search_handlers import SimpleProductSearchHandler
+from oscar.test import factories
+
+
+@override_settings(OSCAR_PRODUCT_FACETS_ENABLED=True)
+class TestProductFacets(TestCase):
+
+    def setUp(self):
+        self.book = factories.create_product(
+            title='Book', product_class='Books', price=D('12.00'))
+        self.cheap_shirt = factories.create_product(
+            title='Cheap shirt', product_class='Clothes', price=D('15.00'))
+        self.shirt = factories.create_product(
+            title='Shirt', product_class='Clothes', price=D('45.00'))
+        product_facets.update_products(Product.objects.all())
+        # The updates scheduled so far would only run after a commit
+        product_facets.get_pending_product_ids().clear()
+
+    def search(self, query_string):
+        return SimpleProductSearchHandler(
+            QueryDict(query_string), '/catalogue/?%s' % query_string)
+
+    def test_stores_the_facet_values_of_products(self):
+        values = ProductFacetValue.objects.filter(product=self.shirt)
+        self.assertEqual(
+            [('price', '45.00', D('45.00')), ('product_class', 'Clothes', None)],
+            sorted(values.values_list('field', 'value', 'number')))
+
+    def test_counts_the_facet_values(self):
+        counts = product_facets.get_facet_counts(Product.objects.all())
+        self.assertEqual(
+            [('Clothes', 2), ('Books', 1)], counts['fields']['product_class'])
+        self.assertEqual(2, counts['queries']['price_exact:[0 TO 20]'])
+        self.assertEqual(1, counts['queries']['price_exact:[40 TO 60]'])
+        self.assertEqual(0, counts['queries']['price_exact:[60 TO *]'])
+
+    def test_filters_products_by_selected_facets(self):
+        handler = self.search(
+            'selected_facets=product_class_exact:Clothes'
+            '&selected_facets=price_exact:[0 TO 20]')
+        self.assertEqual([self.cheap_shirt], list(handler.object_list))
+
+    def test_selected_values_of_a_field_are_alternatives(self):
+        handler = self.search(
+            'selected_facets=price_exact:[0 TO 20]'
+            '&selected_facets=price_exact:[40 TO 60]')
+        self.assertEqual(3, handler.object_list.count())
+
+    def test_ignores_unknown_facets(self):
+        handler = self.search('selected_facets=upc_exact:1234')
+        self.assertEqual(3, handler.object_list.count())
+
+    def test_adds_facets_to_the_context(self):
+        handler = self.search('selected_facets=product_class_exact:Books')
+        context = handler.get_search_context_data('products')
+        self.assertTrue(context['has_facets'])
+        self.assertEqual(
+            ['product_class_exact:Books'], context['selected_facets'])
+        results = context['facet_data']['product_class']['results']
+        self.assertEqual(['Books'], [result['name'] for result in results])
+        self.assertTrue(results[0]['selected'])
+
+    def test_updates_the_facet_values_once_per_transaction(self):
+        callbacks = []
+        with mock.patch('django.db.transaction.on_commit', callbacks.append):
+            stockrecord = self.book.stockrecords.get()
+            stockrecord.price_excl_tax = D('50.00')
+            stockrecord.save()
+            self.book.save()
+        with mock.patch.object(
+                product_facets, 'update_product_ids',
+                wraps=product_facets.update_product_ids) as update:
+            for callback in callbacks:
+                callback()
+        update.assert_called_once_with({self.book.pk})
+        self.assertEqual(
+            ['50.00'], list(self.book.facet_values.filter(
+                field='price').values_list('value', flat=True)))
+
+    def test_updates_the_products_of_a_rolled_back_transaction_again(self):
+        with mock.patch('django.db.transaction.on_commit'):
+            # The callbacks of the rolled back transaction are dropped
+            self.book.save()
+        callbacks = []
+        with mock.patch('django.db.transaction.on_commit', callbacks.append):
+            self.book.save()
+        with mock.patch.object(product_facets, 'update_product_ids') as update:
+            for callback in callbacks:
+                callback()
+        update.assert_called_once_with({self.book.pk})
+
+
+class TestProductFacetsDisabled(TestCase):
+
+    def test_doesnt_add_facets_to_the_context(self):
+        factories.create_product()
+        handler = SimpleProductSearchHandler(QueryDict(''), '/catalogue/')
+        context = handler.get_search_context_data('products')
+        self.assertNotIn('facet_data', context)
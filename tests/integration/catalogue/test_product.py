@@ -1,4 +1,6 @@
 # coding=utf-8
+from decimal import Decimal as D
+
 from django.db import IntegrityError
 from django.test import TestCase
 from django.core.exceptions import ValidationError
@@ -7,6 +9,7 @@ from oscar.apps.catalogue.models import (Product, ProductClass,
                                          ProductAttribute,
                                          AttributeOption,
                                          ProductRecommendation)
+from oscar.apps.partner.strategy import Selector
 from oscar.test import factories
 
 
@@ -176,3 +179,31 @@ class ProductRecommendationTests(ProductTests):
             secondary_products[1], secondary_products[4]
         ]
         self.assertEqual(self.primary_product.sorted_recommended_products, recommended_products)
+
+
+class TestProductPrefetchProfiles(TestCase):
+
+    def setUp(self):
+        self.product = factories.create_product(price=D('10.00'))
+        factories.create_stockrecord(self.product, price_excl_tax=D('12.00'))
+        factories.create_product_image(
+            product=self.product, caption='Second', display_order=2)
+        factories.create_product_image(
+            product=self.product, caption='First', display_order=1)
+        self.other_product = factories.create_product()
+
+    def test_listing_profile_loads_primary_image_and_first_stockrecord(self):
+        products = list(Product.browsable.with_profile('listing').order_by('pk'))
+        strategy = Selector().strategy()
+        first_stockrecord = self.product.stockrecords.order_by('pk')[0]
+        with self.assertNumQueries(0):
+            self.assertEqual('First', products[0].primary_image().caption)
+            self.assertTrue(products[1].primary_image()['is_missing'])
+            self.assertEqual(
+                first_stockrecord, strategy.select_stockrecord(products[0]))
+            self.assertIsNone(strategy.select_stockrecord(products[1]))
+            self.assertFalse(products[0].has_options)
+
+    def test_rejects_unknown_profiles(self):
+        with self.assertRaises(ValueError):
+            Product.objects.with_profile('unknown')
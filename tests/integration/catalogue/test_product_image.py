@@ -6,6 +6,7 @@ from django.contrib.staticfiles.testing import StaticLiveServerTestCase
 from django.test import TestCase, override_settings
 
 from oscar.apps.catalogue.abstract_models import MissingProductImage
+from oscar.apps.catalogue.models import Product
 from oscar.test import factories
 
 
@@ -40,6 +41,69 @@ class TestProductImages(TestCase):
         self.assertEquals(product_image.caption, 'Parent Product Image')
 
 
+class TestDenormalisedPrimaryImage(TestCase):
+
+    def setUp(self):
+        self.parent = factories.ProductFactory(structure='parent')
+        self.variant = factories.create_product(parent=self.parent)
+        self.standalone = factories.create_product()
+
+    def reload(self, product):
+        return Product.objects.get(pk=product.pk)
+
+    def test_is_updated_when_images_change(self):
+        # The factory ignores a display order of 0
+        second = factories.create_product_image(
+            product=self.standalone, display_order=2)
+        self.assertEqual(
+            second, self.reload(self.standalone).cached_primary_image)
+        first = factories.create_product_image(
+            product=self.standalone, display_order=1)
+        self.assertEqual(
+            first, self.reload(self.standalone).cached_primary_image)
+        first.delete()
+        self.assertEqual(
+            second, self.reload(self.standalone).cached_primary_image)
+
+    def test_variants_fall_back_to_parent_image(self):
+        image = factories.create_product_image(product=self.parent)
+        self.assertEqual(image, self.reload(self.variant).cached_primary_image)
+        own_image = factories.create_product_image(product=self.variant)
+        self.assertEqual(
+            own_image, self.reload(self.variant).cached_primary_image)
+
+    def test_is_not_recalculated_when_products_are_saved(self):
+        with mock.patch.object(Product, 'update_primary_image') as update:
+            self.standalone.title = 'New title'
+            self.standalone.save()
+            self.variant.save()
+        self.assertFalse(update.called)
+
+    def test_new_variants_use_the_parent_image(self):
+        image = factories.create_product_image(product=self.parent)
+        variant = factories.create_product(parent=self.parent)
+        self.assertEqual(image, self.reload(variant).cached_primary_image)
+
+    def test_is_recalculated_when_variants_move_to_another_parent(self):
+        factories.create_product_image(product=self.parent)
+        other_parent = factories.ProductFactory(structure='parent')
+        image = factories.create_product_image(product=other_parent)
+        variant = self.reload(self.variant)
+        variant.parent = other_parent
+        variant.save()
+        self.assertEqual(image, self.reload(variant).cached_primary_image)
+
+    def test_loads_primary_images_in_bulk(self):
+        parent_image = factories.create_product_image(product=self.parent)
+        products = list(Product.objects.order_by('pk'))
+        with self.assertNumQueries(1):
+            Product.load_primary_images(products)
+        with self.assertNumQueries(0):
+            images = [product.primary_image() for product in products]
+        self.assertEqual([parent_image, parent_image], images[:2])
+        self.assertTrue(images[2]['is_missing'])
+
+
 class TestMissingProductImage(StaticLiveServerTestCase):
 
     TEMP_MEDIA_ROOT = tempfile.mkdtemp()
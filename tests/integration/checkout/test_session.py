@@ -1,9 +1,17 @@
+from decimal import Decimal as D
+
+from django.contrib.auth.models import AnonymousUser
 from django.test import TestCase
 from django.test.client import RequestFactory
 from django.contrib.sessions.middleware import SessionMiddleware
 import mock
 
+from oscar.apps.basket.models import Basket
+from oscar.apps.checkout.session import CheckoutSessionMixin
 from oscar.apps.checkout.utils import CheckoutSessionData
+from oscar.apps.partner.strategy import Default
+from oscar.apps.shipping import methods
+from oscar.test import factories
 
 
 class TestCheckoutSession(TestCase):
@@ -41,3 +49,49 @@ class TestCheckoutSession(TestCase):
         address.id = 1
         self.session_data.bill_to_user_address(address)
         self.assertEqual(1, self.session_data.billing_user_address_id())
+
+
+class TestCheckoutEvaluation(TestCase):
+
+    def setUp(self):
+        request = RequestFactory().get('/')
+        SessionMiddleware().process_request(request)
+        request.user = AnonymousUser()
+        request.basket = factories.create_basket()
+        request.strategy = request.basket.strategy
+        self.view = CheckoutSessionMixin()
+        self.view.request = request
+        self.view.checkout_session = CheckoutSessionData(request)
+        self.method = methods.FixedPrice(D('5.00'), D('5.00'))
+        self.view.get_shipping_address = mock.Mock(return_value=None)
+        self.view.get_shipping_method = mock.Mock(return_value=self.method)
+
+    def test_calculates_the_shipping_method_once(self):
+        self.view.run_condition('skip_unless_payment_is_required',
+                                self.view.request)
+        submission = self.view.build_submission()
+        self.assertEqual(1, self.view.get_shipping_method.call_count)
+        self.assertEqual(self.method, submission['shipping_method'])
+        self.assertEqual(D('5.00'), submission['shipping_charge'].excl_tax)
+
+    def test_reuses_the_purchase_info_of_the_basket_lines(self):
+        strategy = mock.Mock(wraps=Default())
+        basket = Basket.objects.get(pk=self.view.request.basket.pk)
+        basket.strategy = self.view.request.strategy = strategy
+        self.view.request.basket = basket
+        self.view.check_basket_is_valid(self.view.request)
+        for line in basket.all_lines():
+            line.purchase_info
+        self.assertEqual(1, strategy.fetch_for_line.call_count)
+
+    def test_records_the_time_taken_by_conditions(self):
+        self.view.run_condition('check_basket_is_valid', self.view.request)
+        timings = self.view.get_checkout_evaluation().timings
+        self.assertEqual(['check_basket_is_valid'],
+                         [name for name, __ in timings])
+
+    def test_uses_the_request_passed_to_the_condition(self):
+        view = CheckoutSessionMixin()
+        view.check_basket_is_valid(self.view.request)
+        self.assertIs(self.view.request,
+                      view.get_checkout_evaluation(self.view.request).request)
@@ -1,13 +1,14 @@
 from os.path import dirname
 import sys
 
+import mock
 from django.test import override_settings, TestCase
 from django.conf import settings
 
 import oscar
 from oscar.core.loading import (
     get_model, AppNotFoundError, get_classes, get_class, get_class_loader,
-    ClassNotFoundError)
+    ClassNotFoundError, class_registry, prewarm_classes)
 from oscar.test.factories import create_product, WishListFactory, UserFactory
 from tests import temporary_python_path
 from tests._site.loader import DummyClass
@@ -258,3 +259,57 @@ class OverriddenClassLoadingTestCase(TestCase):
 
         # Clear lru cache for the class loader again
         get_class_loader.cache_clear()
+
+
+class TestClassRegistry(TestCase):
+
+    def test_memoises_loaded_classes(self):
+        Product = get_class('catalogue.models', 'Product')
+        key = ('oscar.apps', 'catalogue.models', 'Product')
+        self.assertIs(Product, class_registry.classes[key])
+        self.assertIs(Product, get_class('catalogue.models', 'Product'))
+
+    def test_records_load_times(self):
+        with override_settings(OSCAR_DYNAMIC_CLASS_LOADER=settings.OSCAR_DYNAMIC_CLASS_LOADER):
+            get_class('shipping.repository', 'Repository')
+            labels = [label for label, __, __ in class_registry.get_load_times()]
+        self.assertEqual(['shipping.repository'], labels)
+
+    def test_is_cleared_when_installed_apps_change(self):
+        get_class('shipping.methods', 'Free')
+        installed_apps = list(settings.INSTALLED_APPS)
+        installed_apps[installed_apps.index('oscar.apps.shipping')] = 'tests._site.shipping'
+        with override_settings(INSTALLED_APPS=installed_apps):
+            (Free,) = get_classes('shipping.methods', ('Free',))
+            self.assertEqual('tests._site.shipping.methods', Free.__module__)
+        Free = get_class('shipping.methods', 'Free')
+        self.assertEqual('oscar.apps.shipping.methods', Free.__module__)
+
+    def test_doesnt_memoise_moved_classes(self):
+        get_class('basket.forms', 'BaseBasketLineFormSet')
+        key = ('oscar.apps', 'basket.forms', 'BaseBasketLineFormSet')
+        self.assertNotIn(key, class_registry.classes)
+
+    def test_prewarms_the_modules_of_oscar_apps(self):
+        modules = prewarm_classes()
+        self.assertIn('oscar.apps.catalogue.views', modules)
+        self.assertNotIn('oscar.apps.catalogue.migrations', modules)
+
+    def test_doesnt_memoise_classes_while_the_local_module_is_imported(self):
+        installed_apps = list(settings.INSTALLED_APPS)
+        installed_apps[installed_apps.index('oscar.apps.shipping')] = 'tests._site.shipping'
+        with override_settings(INSTALLED_APPS=installed_apps):
+            with mock.patch('oscar.core.loading._is_local_module_importing',
+                            return_value=True):
+                get_class('shipping.methods', 'Free')
+            key = ('oscar.apps', 'shipping.methods', 'Free')
+            self.assertNotIn(key, class_registry.classes)
+
+    def test_prewarm_skips_modules_that_cant_be_imported(self):
+        def import_module(name):
+            if name == 'oscar.apps.catalogue.views':
+                raise ImportError(name)
+        with mock.patch('oscar.core.loading.import_module', side_effect=import_module):
+            modules = prewarm_classes()
+        self.assertNotIn('oscar.apps.catalogue.views', modules)
+        self.assertIn('oscar.apps.catalogue.models', modules)
@@ -1,7 +1,7 @@
 from decimal import Decimal as D
 
-from django.test import TestCase
-from mock import Mock
+from django.test import TestCase, override_settings
+from mock import Mock, patch
 
 from oscar.apps.offer import models
 from oscar.apps.offer.results import OfferApplications
@@ -11,6 +11,7 @@ from oscar.test.factories import (
     ConditionalOfferFactory)
 
 from oscar.test.basket import add_product
+from oscar.test import factories
 
 
 class TestOfferApplicator(TestCase):
@@ -86,3 +87,122 @@ class TestOfferApplicationsWrapper(TestCase):
 
     def test_aggregates_results_from_same_offer(self):
         self.assertEqual(1, len(list(self.applications)))
+
+
+class TestIncrementalOfferApplication(TestCase):
+
+    def setUp(self):
+        self.basket = factories.create_basket(empty=True)
+        self.product_a = factories.create_product(price=D('10.00'))
+        self.product_b = factories.create_product(price=D('20.00'))
+        range_a = models.Range.objects.create(name="A")
+        range_a.add_product(self.product_a)
+        range_b = models.Range.objects.create(name="B")
+        range_b.add_product(self.product_b)
+        self.offer_a = factories.create_offer(
+            name="A", range=range_a, priority=2)
+        self.offer_b = factories.create_offer(
+            name="B", range=range_b, priority=1)
+        self.offer_all = factories.create_offer(name="All", priority=0)
+        self.offers = [self.offer_a, self.offer_b, self.offer_all]
+
+        self.basket.add_product(self.product_a, 2)
+        self.basket.add_product(self.product_b, 3)
+        self.applicator = Applicator()
+        self.applicator.apply_offers_incrementally(self.basket, self.offers)
+
+    def get_results(self, basket):
+        lines = [(line.product_id, line.discount_value,
+                  line.quantity_with_discount) for line in basket.all_lines()]
+        applications = [(a['offer'].id, a['freq'], a['discount'])
+                        for a in basket.offer_applications]
+        return lines, applications
+
+    def assert_equal_to_full_application(self):
+        basket = type(self.basket).objects.get(pk=self.basket.pk)
+        basket.strategy = self.basket.strategy
+        self.applicator.apply_offers(basket, self.offers)
+        self.assertEqual(self.get_results(basket),
+                         self.get_results(self.basket))
+
+    def get_evaluated_offers(self):
+        self.basket.reset_offer_applications()
+        with patch.object(Applicator, 'apply_offer',
+                          autospec=True,
+                          side_effect=Applicator.apply_offer) as apply_offer:
+            self.applicator.apply_offers_incrementally(
+                self.basket, self.offers)
+        return [call[0][2] for call in apply_offer.call_args_list]
+
+    def test_first_pass_equals_full_application(self):
+        self.assert_equal_to_full_application()
+
+    def test_replays_all_offers_when_basket_is_unchanged(self):
+        self.assertEqual([], self.get_evaluated_offers())
+        self.assert_equal_to_full_application()
+
+    def test_only_reevaluates_offers_affected_by_a_quantity_change(self):
+        self.basket.add_product(self.product_b, 1)
+        self.assertEqual([self.offer_b, self.offer_all],
+                         self.get_evaluated_offers())
+        self.assert_equal_to_full_application()
+
+    def test_reevaluates_offers_when_a_line_is_removed(self):
+        self.basket.lines.filter(product=self.product_a).delete()
+        self.assertEqual([self.offer_a, self.offer_all],
+                         self.get_evaluated_offers())
+        self.assert_equal_to_full_application()
+
+    def test_reevaluates_offers_when_a_line_is_added(self):
+        product = factories.create_product(price=D('5.00'))
+        self.basket.add_product(product, 1)
+        self.assertEqual([self.offer_all], self.get_evaluated_offers())
+        self.assert_equal_to_full_application()
+
+    def test_evaluates_remaining_offers_when_priorities_change(self):
+        self.offers = [self.offer_b, self.offer_a, self.offer_all]
+        self.assertEqual(self.offers, self.get_evaluated_offers())
+        self.assert_equal_to_full_application()
+
+
+@override_settings(OSCAR_OFFER_APPLICATION_SNAPSHOTS=True)
+class TestOfferApplicationSnapshots(TestCase):
+
+    def setUp(self):
+        self.basket = factories.create_basket(empty=True)
+        self.product = factories.create_product(price=D('10.00'))
+        self.basket.add_product(self.product, 2)
+        factories.create_offer(name="All")
+        Applicator().apply(self.basket)
+
+    def reload_basket(self):
+        basket = type(self.basket).objects.get(pk=self.basket.pk)
+        basket.strategy = self.basket.strategy
+        return basket
+
+    def test_restores_results_for_an_unchanged_basket(self):
+        basket = self.reload_basket()
+        with patch.object(Applicator, 'apply_offers') as apply_offers:
+            Applicator().apply(basket)
+        self.assertFalse(apply_offers.called)
+        self.assertEqual(self.basket.total_incl_tax, basket.total_incl_tax)
+        self.assertEqual(self.basket.total_discount, basket.total_discount)
+        self.assertEqual(
+            [(a['offer'].id, a['freq'], a['discount'])
+             for a in self.basket.offer_applications],
+            [(a['offer'].id, a['freq'], a['discount'])
+             for a in basket.offer_applications])
+
+    def test_applies_offers_when_basket_has_changed(self):
+        basket = self.reload_basket()
+        basket.add_product(self.product, 1)
+        with patch.object(Applicator, 'apply_offers') as apply_offers:
+            Applicator().apply(basket)
+        self.assertTrue(apply_offers.called)
+
+    def test_applies_offers_when_offers_have_changed(self):
+        factories.create_offer(name="Another", priority=1)
+        basket = self.reload_basket()
+        with patch.object(Applicator, 'apply_offers') as apply_offers:
+            Applicator().apply(basket)
+        self.assertTrue(apply_offers.called)
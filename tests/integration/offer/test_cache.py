@@ -0,0 +1,74 @@
+import datetime
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from oscar.apps.offer import models
+from oscar.apps.offer.cache import SiteOfferCache
+from oscar.apps.offer.utils import Applicator
+from oscar.test import factories
+
+
+@override_settings(OSCAR_OFFER_CACHE_ENABLED=True)
+class TestSiteOfferCache(TestCase):
+
+    def setUp(self):
+        self.cache = SiteOfferCache()
+        self.cache.invalidate()
+
+    def test_returns_active_site_offers(self):
+        factories.create_offer(name="A")
+        factories.create_offer(name="B", offer_type="Voucher")
+        factories.create_offer(
+            name="C", status=models.ConditionalOffer.SUSPENDED)
+        offers = self.cache.get_offers()
+        self.assertEqual(["A"], [offer.name for offer in offers])
+
+    def test_honours_start_and_end_dates_without_reloading(self):
+        now = timezone.now()
+        factories.create_offer(
+            name="A", start=now + datetime.timedelta(days=1))
+        self.assertEqual([], self.cache.get_offers())
+        with self.assertNumQueries(0):
+            offers = self.cache.get_offers(
+                test_date=now + datetime.timedelta(days=2))
+        self.assertEqual(["A"], [offer.name for offer in offers])
+
+    def test_loads_proxies_and_ranges_once(self):
+        factories.create_offer(name="A")
+        self.cache.get_offers()
+        with self.assertNumQueries(0):
+            offer = self.cache.get_offers()[0]
+            self.assertIsInstance(
+                offer.condition.proxy(), models.CountCondition)
+            self.assertIsInstance(
+                offer.benefit.proxy(), models.PercentageDiscountBenefit)
+            self.assertTrue(offer.condition.range.includes_all_products)
+
+    def test_hands_out_copies_of_the_offers(self):
+        factories.create_offer(name="A")
+        first = self.cache.get_offers()[0]
+        first.record_usage({'freq': 1, 'discount': 10})
+        first.condition.range.invalidate_cached_ids()
+        with self.assertNumQueries(0):
+            second = self.cache.get_offers()[0]
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.condition.range, second.condition.range)
+        self.assertIs(second.condition.range, second.benefit.range)
+        self.assertEqual(0, second.num_applications)
+
+    def test_reloads_offers_when_invalidated(self):
+        factories.create_offer(name="A")
+        self.cache.get_offers()
+        factories.create_offer(name="B", priority=1)
+        self.assertEqual(1, len(self.cache.get_offers()))
+        self.cache.invalidate()
+        offers = self.cache.get_offers()
+        self.assertEqual(["B", "A"], [offer.name for offer in offers])
+
+    def test_is_used_by_applicator(self):
+        factories.create_offer(name="A")
+        Applicator().get_site_offers()
+        with self.assertNumQueries(0):
+            offers = Applicator().get_site_offers()
+        self.assertEqual(["A"], [offer.name for offer in offers])
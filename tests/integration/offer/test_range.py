@@ -1,6 +1,8 @@
-from django.test import TestCase
+import mock
+from django.test import TestCase, override_settings
 
 from oscar.apps.offer import models
+from oscar.apps.offer.cache import range_product_index, site_offer_cache
 from oscar.apps.catalogue import models as catalogue_models
 from oscar.test.factories import create_product
 
@@ -215,6 +217,68 @@ class TestPartialRange(TestCase):
         self.assertTrue(self.range.is_reorderable)
 
 
+@override_settings(OSCAR_RANGE_INDEX_ENABLED=True)
+class TestPartialRangeWithProductIndex(TestPartialRange):
+
+    def test_contains_product_does_not_query_once_indexed(self):
+        category = catalogue_models.Category.add_root(name="root")
+        product = create_product()
+        catalogue_models.ProductCategory.objects.create(
+            product=product, category=category)
+        self.range.included_categories.add(category)
+        self.range.add_product(self.parent)
+        self.assertTrue(self.range.contains_product(product))
+
+        fresh_range = models.Range.objects.get(pk=self.range.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(fresh_range.contains_product(product))
+            self.assertTrue(fresh_range.contains_product(self.child))
+            self.assertEqual(fresh_range.num_products(), 3)
+
+    def test_index_is_rebuilt_when_categories_change(self):
+        category = catalogue_models.Category.add_root(name="root")
+        product = create_product()
+        self.range.included_categories.add(category)
+        self.assertFalse(self.range.contains_product(product))
+
+        catalogue_models.ProductCategory.objects.create(
+            product=product, category=category)
+        fresh_range = models.Range.objects.get(pk=self.range.pk)
+        self.assertTrue(fresh_range.contains_product(product))
+
+    def test_index_is_rebuilt_when_the_product_class_changes(self):
+        product = create_product()
+        other_class = catalogue_models.ProductClass.objects.create(name='Other')
+        self.range.classes.add(other_class)
+        self.assertFalse(self.range.contains_product(product))
+
+        product.product_class = other_class
+        product.save()
+        fresh_range = models.Range.objects.get(pk=self.range.pk)
+        self.assertTrue(fresh_range.contains_product(product))
+
+    def test_index_is_kept_when_products_are_edited(self):
+        product = create_product()
+        self.range.add_product(product)
+        self.range.contains_product(product)
+
+        with mock.patch.object(range_product_index, 'invalidate_range') as invalidate_range, \
+                mock.patch.object(site_offer_cache, 'invalidate') as invalidate:
+            product.title = 'New title'
+            product.save()
+        self.assertFalse(invalidate_range.called)
+        self.assertFalse(invalidate.called)
+
+
+class TestPartialRangeWithoutProductIndex(TestCase):
+
+    def test_doesnt_look_up_ranges_when_products_change(self):
+        with mock.patch('oscar.apps.offer.signals.get_product_range_ids') as get_range_ids:
+            product = create_product()
+            product.save()
+        self.assertFalse(get_range_ids.called)
+
+
 class TestRangeModel(TestCase):
 
     def test_ensures_unique_slugs_are_used(self):
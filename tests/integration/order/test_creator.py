@@ -2,7 +2,9 @@ from decimal import Decimal as D
 import threading
 import time
 
+import mock
 import pytest
+from django.db import IntegrityError, transaction
 from django.http import HttpRequest
 from django.test import TestCase, TransactionTestCase
 from django.test.utils import override_settings
@@ -12,7 +14,8 @@ from oscar.apps.catalogue.models import ProductClass, Product
 from oscar.apps.checkout import calculators
 from oscar.apps.offer.utils import Applicator
 from oscar.apps.order.models import Order
-from oscar.apps.order.utils import OrderCreator
+from oscar.apps.order.models import OrderNumberSequence
+from oscar.apps.order.utils import OrderCreator, SequenceOrderNumberGenerator
 from oscar.apps.shipping.methods import Free, FixedPrice
 from oscar.apps.shipping.repository import Repository
 from oscar.apps.voucher.models import Voucher
@@ -55,6 +58,60 @@ class TestOrderCreatorErrorCases(TestCase):
         place_order(self.creator, basket=self.basket, order_number='1234')
         with self.assertRaises(ValueError):
             place_order(self.creator, basket=self.basket, order_number='1234')
+        self.assertEqual(1, Order.objects.count())
+
+
+@override_settings(OSCAR_ORDER_NUMBER_FORMAT='WEB-%d',
+                   OSCAR_ORDER_NUMBER_START=1000,
+                   OSCAR_ORDER_NUMBER_BLOCK_SIZE=3)
+class TestSequenceOrderNumberGenerator(TransactionTestCase):
+
+    def setUp(self):
+        SequenceOrderNumberGenerator._blocks.clear()
+        self.generator = SequenceOrderNumberGenerator()
+        self.basket = factories.create_basket()
+
+    def test_generates_formatted_numbers_from_start(self):
+        numbers = [self.generator.order_number(self.basket)
+                   for i in range(4)]
+        self.assertEqual(
+            ['WEB-1000', 'WEB-1001', 'WEB-1002', 'WEB-1003'], numbers)
+
+    def test_reserves_numbers_in_blocks(self):
+        self.generator.order_number(self.basket)
+        with self.assertNumQueries(0):
+            self.generator.order_number(self.basket)
+            self.generator.order_number(self.basket)
+        self.assertEqual(
+            1002, OrderNumberSequence.objects.get(name='order').last_value)
+
+    def test_skips_blocks_reserved_by_other_processes(self):
+        self.generator.order_number(self.basket)
+        # Simulate another process reserving a block
+        OrderNumberSequence.objects.update(last_value=1005)
+        SequenceOrderNumberGenerator._blocks.clear()
+        self.assertEqual('WEB-1006', self.generator.order_number(self.basket))
+
+    def test_doesnt_keep_blocks_reserved_in_a_rolled_back_transaction(self):
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                self.generator.order_number(self.basket)
+                raise ValueError
+        self.assertEqual({}, SequenceOrderNumberGenerator._blocks)
+        self.assertEqual('WEB-1000', self.generator.order_number(self.basket))
+        self.assertEqual('WEB-1001', self.generator.order_number(self.basket))
+
+    def test_gives_up_when_the_counter_cant_be_created(self):
+        with mock.patch.object(OrderNumberSequence._default_manager.__class__,
+                               'create', side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                self.generator.order_number(self.basket)
+
+    def test_is_used_by_order_creator_when_forked(self):
+        with mock.patch('oscar.apps.order.utils.get_class',
+                        return_value=SequenceOrderNumberGenerator):
+            order = place_order(OrderCreator(), basket=self.basket)
+        self.assertEqual('WEB-1000', order.number)
 
 
 class TestSuccessfulOrderCreation(TestCase):
@@ -118,6 +175,42 @@ class TestSuccessfulOrderCreation(TestCase):
             self.assertTrue(partner_name == line.partner_name == partner.name)
 
 
+@override_settings(OSCAR_ORDER_BULK_PLACEMENT=True)
+class TestBulkOrderCreation(TestSuccessfulOrderCreation):
+
+    def test_creates_line_prices_and_allocates_stock(self):
+        products = [factories.create_product() for i in range(3)]
+        for product in products:
+            add_product(self.basket, D('12.00'), quantity=2, product=product)
+        order = place_order(
+            self.creator, basket=self.basket, order_number='1234')
+        self.assertEqual(3, order.lines.count())
+        self.assertEqual(3, order.line_prices.count())
+        for product in products:
+            stockrecord = product.stockrecords.get()
+            self.assertEqual(2, stockrecord.num_allocated)
+
+    def test_records_offer_name_on_discounts(self):
+        add_product(self.basket, D('12.00'))
+        offer = factories.create_offer(name="Offer")
+        Applicator().apply_offers(self.basket, [offer])
+        order = place_order(
+            self.creator, basket=self.basket, order_number='1234')
+        self.assertEqual("Offer", order.discounts.get().offer_name)
+
+    def test_places_orders_line_by_line_if_line_creation_is_overridden(self):
+        class CustomOrderCreator(OrderCreator):
+            def create_line_models(self, order, basket_line,
+                                   extra_line_fields=None):
+                return super(CustomOrderCreator, self).create_line_models(
+                    order, basket_line, {'status': 'Custom'})
+
+        add_product(self.basket, D('12.00'))
+        order = place_order(
+            CustomOrderCreator(), basket=self.basket, order_number='1234')
+        self.assertEqual('Custom', order.lines.get().status)
+
+
 class TestPlacingOrderForDigitalGoods(TestCase):
 
     def setUp(self):
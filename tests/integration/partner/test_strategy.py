@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from decimal import Decimal as D
 
 from oscar.apps.partner import strategy
@@ -118,6 +118,141 @@ class TestDefaultStrategyForParentProductWithOutOfStockVariant(TestCase):
         self.assertEqual(D('10.00'), self.info.price.incl_tax)
 
 
+class TestDefaultStrategyForParentProductWithSeveralPricedVariants(TestCase):
+
+    def setUp(self):
+        self.strategy = strategy.Default()
+        self.parent = factories.create_product(structure='parent')
+        for price in (D('12.00'), D('8.00'), D('10.00')):
+            factories.create_product(
+                parent=self.parent, price=price, num_in_stock=3)
+
+    def test_uses_cheapest_variant_price(self):
+        info = self.strategy.fetch_for_parent(self.parent)
+        self.assertEqual(D('8.00'), info.price.excl_tax)
+
+    def test_loads_variants_stockrecords_at_once(self):
+        parent = models.Product.objects.select_related(
+            'product_class').get(pk=self.parent.pk)
+        # One query for the children and one for their stockrecords
+        with self.assertNumQueries(2):
+            self.strategy.fetch_for_parent(parent)
+
+
+@override_settings(OSCAR_CHILDREN_STOCK_CACHE_ENABLED=True)
+class TestChildrenStockCache(TestCase):
+
+    def setUp(self):
+        self.strategy = strategy.Default()
+        self.parent = factories.create_product(structure='parent')
+        self.child = factories.create_product(
+            parent=self.parent, price=D('10.00'), num_in_stock=3)
+
+    def get_parent(self):
+        return models.Product.objects.select_related(
+            'product_class').get(pk=self.parent.pk)
+
+    def test_does_not_load_children_again(self):
+        self.strategy.fetch_for_parent(self.get_parent())
+        parent = self.get_parent()
+        with self.assertNumQueries(0):
+            info = self.strategy.fetch_for_parent(parent)
+        self.assertEqual(D('10.00'), info.price.excl_tax)
+
+    def test_is_invalidated_when_a_stockrecord_changes(self):
+        self.strategy.fetch_for_parent(self.get_parent())
+        stockrecord = self.child.stockrecords.get()
+        stockrecord.price_excl_tax = D('7.00')
+        stockrecord.save()
+        info = self.strategy.fetch_for_parent(self.get_parent())
+        self.assertEqual(D('7.00'), info.price.excl_tax)
+
+    def test_is_invalidated_when_a_child_is_added(self):
+        self.strategy.fetch_for_parent(self.get_parent())
+        factories.create_product(
+            parent=self.parent, price=D('6.00'), num_in_stock=3)
+        info = self.strategy.fetch_for_parent(self.get_parent())
+        self.assertEqual(D('6.00'), info.price.excl_tax)
+
+
+class TestFetchForProducts(TestCase):
+
+    def setUp(self):
+        self.strategy = strategy.Default()
+        self.parent = factories.create_product(structure='parent')
+        factories.create_product(
+            parent=self.parent, price=D('10.00'), num_in_stock=3)
+        self.product = factories.create_product(
+            price=D('5.00'), num_in_stock=2)
+
+    def test_returns_purchase_info_in_order(self):
+        products = list(models.Product.objects.filter(
+            pk__in=[self.product.pk, self.parent.pk]).order_by('-pk'))
+        infos = self.strategy.fetch_for_products(products)
+        self.assertEqual([D('5.00'), D('10.00')],
+                         [info.price.excl_tax for info in infos])
+        self.assertTrue(all(info.availability.is_available_to_buy
+                            for info in infos))
+
+    def test_loads_stockrecords_in_bulk(self):
+        products = list(models.Product.objects.filter(
+            pk__in=[self.product.pk, self.parent.pk]))
+        self.strategy.fetch_for_products(products)
+        with self.assertNumQueries(0):
+            for product in products:
+                if product.is_parent:
+                    self.strategy.fetch_for_parent(product)
+                else:
+                    self.strategy.fetch_for_product(product)
+
+    def test_reuses_the_prefetched_first_stockrecords(self):
+        products = list(models.Product.objects.filter(
+            pk=self.product.pk).select_related(
+                'product_class').prefetch_first_stockrecord())
+        with self.assertNumQueries(0):
+            self.strategy.prefetch_for_products(products)
+            info = self.strategy.fetch_for_product(products[0])
+        self.assertEqual(D('5.00'), info.price.excl_tax)
+
+
+@override_settings(OSCAR_PURCHASE_INFO_CACHE_ENABLED=True)
+class TestPurchaseInfoCache(TestCase):
+
+    def setUp(self):
+        self.strategy = strategy.Default()
+        self.product = factories.create_product(
+            price=D('5.00'), num_in_stock=2)
+
+    def test_returns_same_purchase_info_for_same_product(self):
+        info = self.strategy.fetch_for_product(self.product)
+        product = models.Product.objects.get(pk=self.product.pk)
+        with self.assertNumQueries(0):
+            self.assertIs(info, self.strategy.fetch_for_product(product))
+
+    def test_can_be_cleared(self):
+        info = self.strategy.fetch_for_product(self.product)
+        self.strategy.clear_purchase_info_cache()
+        self.assertIsNot(info, self.strategy.fetch_for_product(self.product))
+
+    def test_is_dropped_when_a_stockrecord_changes(self):
+        info = self.strategy.fetch_for_product(self.product)
+        self.product.stockrecords.get().allocate(1)
+        new_info = self.strategy.fetch_for_product(self.product)
+        self.assertIsNot(info, new_info)
+        self.assertEqual(1, new_info.availability.num_available)
+
+    @override_settings(OSCAR_PURCHASE_INFO_CACHE_SIZE=1)
+    def test_keeps_a_limited_number_of_entries(self):
+        info = self.strategy.fetch_for_product(self.product)
+        self.strategy.fetch_for_product(factories.create_product(price=D('1')))
+        self.assertIsNot(info, self.strategy.fetch_for_product(self.product))
+
+    def test_is_not_shared_between_strategies(self):
+        info = self.strategy.fetch_for_product(self.product)
+        self.assertIsNot(
+            info, strategy.Default().fetch_for_product(self.product))
+
+
 class TestFixedRateTax(TestCase):
 
     def test_pricing_policy_unavailable_if_no_price_excl_tax(self):
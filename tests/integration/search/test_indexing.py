@@ -0,0 +1,81 @@
+from datetime import timedelta
+from decimal import Decimal as D
+
+from django.test import TestCase
+from django.utils import timezone
+from haystack import connections
+
+from oscar.apps.catalogue.categories import create_from_breadcrumbs
+from oscar.apps.catalogue.models import Product
+from oscar.apps.search.indexing import ProductIndexer
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+StockRecord = get_model('partner', 'StockRecord')
+
+
+class TestProductIndexer(TestCase):
+
+    def setUp(self):
+        self.indexer = ProductIndexer(batch_size=2)
+        self.products = [
+            factories.create_product(price=D('10.00'), num_in_stock=i)
+            for i in range(3)]
+
+    def test_indexes_products_in_batches(self):
+        self.assertEqual(2, len(self.indexer.get_batches()))
+        self.assertEqual(3, self.indexer.update())
+
+    def test_only_indexes_recently_changed_products(self):
+        since = timezone.now() + timedelta(seconds=1)
+        Product.objects.update(date_updated=since - timedelta(days=1))
+        StockRecord.objects.update(date_updated=since - timedelta(days=1))
+        self.assertEqual(0, self.indexer.update(since=since))
+        stockrecord = self.products[1].stockrecords.get()
+        StockRecord.objects.filter(pk=stockrecord.pk).update(
+            date_updated=since)
+        self.assertEqual(1, self.indexer.update(since=since))
+
+
+class TestProductIndexBatches(TestCase):
+
+    def setUp(self):
+        self.index = connections['default'].get_unified_index().get_index(
+            Product)
+        category = create_from_breadcrumbs('Books > Fiction')
+        self.product = factories.create_product(
+            price=D('10.00'), num_in_stock=4)
+        factories.ProductCategoryFactory(
+            product=self.product, category=category)
+
+    def test_prepares_products_from_batch_data(self):
+        products = list(self.index.index_queryset().filter(
+            pk=self.product.pk))
+        self.index.begin_batch(products)
+        try:
+            with self.assertNumQueries(0):
+                self.assertEqual(
+                    ['Books > Fiction'],
+                    self.index.prepare_category(products[0]))
+                self.assertEqual(
+                    D('10.00'), self.index.prepare_price(products[0]))
+                self.assertEqual(
+                    4, self.index.prepare_num_in_stock(products[0]))
+        finally:
+            self.index.end_batch()
+
+    def test_prepares_categories_created_after_the_snapshot(self):
+        products = list(self.index.index_queryset().filter(
+            pk=self.product.pk))
+        self.index.begin_batch(products)
+        try:
+            category = create_from_breadcrumbs('Books > Poetry')
+            factories.ProductCategoryFactory(
+                product=self.product, category=category)
+            products = list(self.index.index_queryset().filter(
+                pk=self.product.pk))
+            self.assertEqual(
+                ['Books > Fiction', 'Books > Poetry'],
+                sorted(self.index.prepare_category(products[0])))
+        finally:
+            self.index.end_batch()
@@ -1,3 +1,4 @@
+import warnings
 from collections import OrderedDict
 
 from django.test import TestCase
@@ -5,6 +6,7 @@ from django.test.utils import override_settings
 from django.utils.translation import ugettext_lazy as _
 
 from oscar.apps.search import facets
+from oscar.utils.deprecation import RemovedInOscar20Warning
 
 FACET_COUNTS = {
     u'dates': {},
@@ -112,3 +114,45 @@ class TestFacetMunger(TestCase):
 
         self.assertEqual(datum['count'], 21)
         self.assertTrue(datum['selected'])
+
+    def test_builds_select_and_deselect_urls(self):
+        munger = facets.FacetMunger(
+            path='/search?q=test&page=2&selected_facets=category_exact%3AFiction',
+            selected_multi_facets={'category_exact': [u'Fiction']},
+            facet_counts=FACET_COUNTS)
+        results = munger.facet_data()['category']['results']
+        self.assertEqual('/search?q=test', results[0]['deselect_url'])
+        self.assertEqual(
+            '/search?q=test&selected_facets=category_exact%3AFiction'
+            '&selected_facets=category_exact%3AHorror',
+            results[1]['select_url'])
+
+    def test_truncates_facets_with_max_values(self):
+        search_facets = {
+            'fields': OrderedDict([
+                ('category', {'name': _('Category'), 'field': 'category',
+                              'max_values': 1}),
+            ]),
+            'queries': OrderedDict(),
+        }
+        munger = facets.FacetMunger(
+            path='/search?q=test',
+            selected_multi_facets={'category_exact': [u'Comedy']},
+            facet_counts=FACET_COUNTS)
+        with self.settings(OSCAR_SEARCH_FACETS=search_facets):
+            data = munger.facet_data()
+        self.assertEqual(
+            ['Fiction', 'Comedy'],
+            [datum['name'] for datum in data['category']['results']])
+        self.assertTrue(data['category']['truncated'])
+
+    def test_strip_pagination_is_deprecated(self):
+        munger = facets.FacetMunger(
+            path='/search?q=test&page=2',
+            selected_multi_facets={},
+            facet_counts=FACET_COUNTS)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            url = munger.strip_pagination(munger.base_url)
+        self.assertEqual('/search?q=test', url)
+        self.assertEqual(RemovedInOscar20Warning, caught[0].category)
@@ -0,0 +1,63 @@
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+
+from oscar.apps.catalogue.models import Product
+from oscar.apps.search.forms import SearchForm
+from oscar.apps.search.search_handlers import SearchHandler
+from oscar.test import factories
+
+
+class ProductSearchHandler(SearchHandler):
+    form_class = SearchForm
+    model_whitelist = [Product]
+    paginate_by = 2
+
+
+@override_settings(OSCAR_SEARCH_RESULTS_CACHE_ENABLED=True)
+class TestSearchResultsCache(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.products = [
+            factories.create_product(title='Shirt %d' % i) for i in range(3)]
+
+    def tearDown(self):
+        cache.clear()
+
+    def search(self, query_string):
+        return ProductSearchHandler(
+            QueryDict(query_string), '/search/?%s' % query_string)
+
+    def test_reuses_cached_page_of_results(self):
+        handler = self.search('q=shirt&page=2')
+        expected = handler.get_paginated_objects()
+        self.assertEqual(1, len(expected))
+        with self.assertNumQueries(0):
+            handler = self.search('q=%20SHIRT&page=2')
+            self.assertEqual(expected, handler.get_paginated_objects())
+            self.assertEqual(3, handler.paginator.count)
+            self.assertEqual(2, handler.page.number)
+
+    def test_distinguishes_pages(self):
+        # The simple backend used by the tests doesn't order or slice the
+        # results, so only the sizes of the pages are compared
+        self.assertEqual(2, len(self.search('q=shirt').get_paginated_objects()))
+        handler = self.search('q=shirt&page=2')
+        self.assertEqual(2, handler.page.number)
+        self.assertEqual(1, len(handler.get_paginated_objects()))
+
+    def test_distinguishes_other_parameters(self):
+        first = self.search('q=shirt&sort_by=title-asc')
+        second = self.search('q=shirt&sort_by=title-desc')
+        third = self.search('q=shirt&colour=red')
+        self.assertEqual(3, len(set(
+            [first.cache_key, second.cache_key, third.cache_key])))
+        self.assertEqual(
+            first.cache_key, self.search('sort_by=title-asc&q=shirt').cache_key)
+
+    def test_drops_pages_when_products_change(self):
+        self.search('q=shirt').get_paginated_objects()
+        factories.create_product(title='Another shirt')
+        handler = self.search('q=shirt')
+        self.assertEqual(4, handler.paginator.count)
@@ -1,6 +1,7 @@
 from decimal import Decimal as D
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
 from oscar.apps.offer.applicator import Applicator
 from oscar.apps.offer.models import Benefit
@@ -222,3 +223,75 @@ class WeightBasedMethodTests(TestCase):
         method = Repository().apply_shipping_offer(
             basket, self.standard, offer)
         self.assertEqual(D('0.00'), method.discount(basket))
+
+
+class TestWeightBandTables(TestCase):
+
+    def setUp(self):
+        self.standard = WeightBased.objects.create(name='Standard')
+        self.express = WeightBased.objects.create(
+            name='Express', default_weight=D('2.000'))
+        for upper_limit, charge in [(1, '4.00'), (2, '8.00'), (3, '12.00')]:
+            self.standard.bands.create(
+                upper_limit=upper_limit, charge=D(charge))
+        self.express.bands.create(upper_limit=10, charge=D('20.00'))
+        self.basket = factories.create_basket(empty=True)
+        self.basket.add_product(factories.create_product(price=D('5.00')))
+
+    def get_methods(self):
+        return list(WeightBased.objects.order_by('name'))
+
+    def test_calculates_charges_without_further_queries(self):
+        with self.assertNumQueries(1):
+            band_table = self.standard.get_band_table()
+        with self.assertNumQueries(0):
+            self.assertEqual(D('4.00'), self.standard.get_charge(D('0.5')))
+            self.assertEqual(D('12.00'), self.standard.get_charge(D('2.5')))
+            self.assertEqual(D('16.00'), self.standard.get_charge(4))
+            self.assertEqual(D('2.000'), band_table.get_weight_from(3))
+
+    def test_reloads_the_bands_when_one_is_added(self):
+        self.assertEqual(D('16.00'), self.standard.get_charge(4))
+        self.standard.bands.create(upper_limit=5, charge=D('15.00'))
+        self.assertEqual(D('15.00'), self.standard.get_charge(4))
+
+    def test_calculate_many_matches_calculate(self):
+        methods = self.get_methods()
+        expected = [method.calculate(self.basket) for method in methods]
+        self.assertEqual(
+            expected,
+            WeightBased.calculate_many(self.basket, self.get_methods()))
+
+    def test_calculate_many_loads_the_bands_of_all_methods_at_once(self):
+        methods = self.get_methods()
+        with self.assertNumQueries(1):
+            WeightBased.load_band_tables(methods)
+        with self.assertNumQueries(0):
+            for method in methods:
+                method.get_charge(1)
+
+
+@override_settings(OSCAR_WEIGHT_BANDS_CACHE_ENABLED=True)
+class TestWeightBandsCache(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.method = WeightBased.objects.create(name='Standard')
+        self.method.bands.create(upper_limit=1, charge=D('4.00'))
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_reuses_the_bands_across_instances(self):
+        self.method.get_band_table()
+        method = WeightBased.objects.get(pk=self.method.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(D('4.00'), method.get_charge(D('0.5')))
+
+    def test_drops_the_bands_when_one_changes(self):
+        self.method.get_band_table()
+        band = self.method.bands.get()
+        band.charge = D('5.00')
+        band.save()
+        method = WeightBased.objects.get(pk=self.method.pk)
+        self.assertEqual(D('5.00'), method.get_charge(D('0.5')))
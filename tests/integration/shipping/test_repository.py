@@ -1,7 +1,11 @@
-from django.test import TestCase
+from decimal import Decimal as D
+
+from django.test import RequestFactory, TestCase, override_settings
 import mock
 
+from oscar.apps.order.models import ShippingAddress
 from oscar.apps.shipping import repository, methods
+from oscar.test import factories
 
 
 class TestDefaultShippingRepository(TestCase):
@@ -42,3 +46,68 @@ class TestDefaultShippingRepository(TestCase):
             basket=basket)
 
         self.assertTrue(isinstance(method, methods.Free))
+
+
+class CountingMethod(methods.FixedPrice):
+    code = 'counting'
+
+    def __init__(self, *args, **kwargs):
+        super(CountingMethod, self).__init__(*args, **kwargs)
+        self.calculations = 0
+
+    def calculate(self, basket):
+        self.calculations += 1
+        return super(CountingMethod, self).calculate(basket)
+
+
+@override_settings(OSCAR_SHIPPING_QUOTES_ENABLED=True)
+class TestShippingQuotes(TestCase):
+
+    def setUp(self):
+        self.method = CountingMethod(D('5.00'), D('6.00'))
+        self.repo = repository.Repository()
+        self.repo.methods = [self.method]
+        self.basket = factories.create_basket()
+        self.request = RequestFactory().get('/')
+        self.request.session = {}
+
+    def get_charge(self, basket=None, shipping_addr=None):
+        method = self.repo.get_default_shipping_method(
+            basket or self.basket, shipping_addr=shipping_addr,
+            request=self.request)
+        return method.calculate(basket or self.basket)
+
+    def test_calculates_the_charge_once(self):
+        self.get_charge()
+        charge = self.get_charge()
+        self.assertEqual(1, self.method.calculations)
+        self.assertEqual(D('5.00'), charge.excl_tax)
+        self.assertEqual(D('6.00'), charge.incl_tax)
+
+    def test_calculates_the_charge_again_when_the_basket_changes(self):
+        self.get_charge()
+        self.basket.add_product(factories.create_product(price=D('10.00')))
+        self.get_charge()
+        self.assertEqual(2, self.method.calculations)
+
+    def test_calculates_the_charge_again_when_the_address_changes(self):
+        self.get_charge(shipping_addr=ShippingAddress(first_name='Alex'))
+        self.get_charge(shipping_addr=ShippingAddress(first_name='Alex'))
+        self.assertEqual(1, self.method.calculations)
+        self.get_charge(shipping_addr=ShippingAddress(first_name='Sam'))
+        self.assertEqual(2, self.method.calculations)
+
+    def test_keeps_the_quotes_with_and_without_an_address(self):
+        address = ShippingAddress(first_name='Alex')
+        self.get_charge()
+        self.get_charge(shipping_addr=address)
+        self.get_charge()
+        self.get_charge(shipping_addr=address)
+        self.assertEqual(2, self.method.calculations)
+        self.assertEqual(2, len(self.request.session['shipping_quotes']))
+
+    @override_settings(OSCAR_SHIPPING_QUOTES_ENABLED=False)
+    def test_calculates_the_charge_every_time_when_disabled(self):
+        self.get_charge()
+        self.get_charge()
+        self.assertEqual(2, self.method.calculations)
@@ -1,6 +1,7 @@
 from decimal import Decimal as D
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
 from oscar.apps.shipping.scales import Scale
 from oscar.apps.basket.models import Basket
@@ -71,3 +72,62 @@ class TestScales(TestCase):
 
         basket.add(product)
         self.assertEqual(D('0.9'), scale.weigh_basket(basket))
+
+
+class TestBulkWeighing(TestCase):
+
+    def setUp(self):
+        self.basket = factories.create_basket(empty=True)
+        self.parent = factories.create_product(
+            structure='parent', attributes={'weight': '3'})
+        self.child = factories.create_product(
+            parent=self.parent, price=D('5.00'))
+        self.product = factories.create_product(
+            attributes={'weight': '1'}, price=D('5.00'))
+        self.basket.add(self.child, quantity=2)
+        self.basket.add(self.product)
+
+    def test_weighs_products_with_a_single_query(self):
+        scale = Scale(attribute_code='weight')
+        with self.assertNumQueries(1):
+            weights = scale.weigh_products([self.child, self.product])
+        self.assertEqual([3, 1], weights)
+
+    def test_returns_the_weight_of_each_line(self):
+        scale = Scale(attribute_code='weight')
+        line_weights = [(line.product, weight)
+                        for line, weight in scale.weigh_lines(self.basket)]
+        self.assertEqual(
+            [(self.child, 3 * 2), (self.product, 1)], line_weights)
+
+    def test_reuses_the_weights_of_a_basket(self):
+        Scale(attribute_code='weight').weigh_basket(self.basket)
+        with self.assertNumQueries(0):
+            weight = Scale(
+                attribute_code='weight', default_weight=1).weigh_basket(
+                self.basket)
+        self.assertEqual(7, weight)
+
+
+@override_settings(OSCAR_PRODUCT_WEIGHTS_CACHE_ENABLED=True)
+class TestProductWeightsCache(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.product = factories.create_product(attributes={'weight': '1'})
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_reuses_cached_weights(self):
+        scale = Scale(attribute_code='weight')
+        scale.weigh_product(self.product)
+        with self.assertNumQueries(0):
+            self.assertEqual(1, scale.weigh_product(self.product))
+
+    def test_drops_the_weight_when_it_changes(self):
+        scale = Scale(attribute_code='weight')
+        scale.weigh_product(self.product)
+        self.product.attr.weight = '2'
+        self.product.attr.save()
+        self.assertEqual(2, scale.weigh_product(self.product))
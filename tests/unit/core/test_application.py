@@ -1,10 +1,14 @@
+import pickle
+
 import mock
 
 from django.conf.urls import url
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
 from django.views.generic import View
 
+from oscar.core.application import LazyView
 from tests._site.apps.myapp.app import application
+from tests._site.apps.myapp.views import TestView
 
 
 class ApplicationTestCase(TestCase):
@@ -35,3 +39,37 @@ class ApplicationTestCase(TestCase):
 
         application.get_url_decorator.assert_called_once_with(pattern)
         self.assertEqual(processed_patterns[0].callback, 'fake_callback')
+
+
+class LazyViewTestCase(TestCase):
+
+    @mock.patch('oscar.core.application.get_class')
+    def test_resolves_the_view_class_on_first_dispatch(self, mock_get_class):
+        mock_get_class.return_value = TestView
+        lazy_view = LazyView('myapp.views', 'TestView')
+        view = lazy_view.as_view()
+        pattern = url('^$', view, name='index')
+        self.assertEqual('TestView', view.__name__)
+        self.assertEqual('oscar.apps.myapp.views.TestView', pattern.lookup_str)
+        self.assertFalse(mock_get_class.called)
+
+        request = RequestFactory().get('/')
+        view(request)
+        view(request)
+        mock_get_class.assert_called_once_with(
+            'myapp.views', 'TestView', 'oscar.apps')
+
+    @mock.patch('oscar.core.application.get_class')
+    def test_proxies_the_attributes_of_the_view_class(self, mock_get_class):
+        mock_get_class.return_value = TestView
+        lazy_view = LazyView('myapp.views', 'TestView')
+        self.assertEqual(TestView.dispatch, lazy_view.dispatch)
+
+    @mock.patch('oscar.core.application.get_class')
+    def test_can_be_introspected_without_resolving(self, mock_get_class):
+        lazy_view = LazyView('myapp.views', 'TestView')
+        self.assertEqual('oscar.apps.myapp.views', lazy_view.__module__)
+        self.assertEqual('TestView', lazy_view.__name__)
+        copy = pickle.loads(pickle.dumps(lazy_view))
+        self.assertEqual('oscar.apps.myapp.views', copy.__module__)
+        self.assertFalse(mock_get_class.called)